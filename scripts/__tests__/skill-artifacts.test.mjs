@@ -0,0 +1,114 @@
+import { describe, it, expect, afterEach } from "vitest";
+import { appendFileSync, readFileSync, readdirSync, rmSync, statSync, utimesSync } from "fs";
+import { join } from "path";
+import { createSkillTree, expectSuccess, skillMarkdown } from "./skill-fixture.mjs";
+
+const SKILLS = ["a-skill", "b-skill", "c-skill"];
+const LEVEL1 = (skill) => `.claude/skills/${skill}/resources/Level1_basics.md`;
+
+/**
+ * 3 つのスキルを持つツリーと、その中の artifact キャッシュのディレクトリを作る。
+ */
+function createCachedTree() {
+  const files = {};
+  for (const skill of SKILLS) {
+    files[`.claude/skills/${skill}/SKILL.md`] = skillMarkdown(skill);
+  }
+  const tree = createSkillTree(files);
+  return { tree, cache: tree.path("artifacts") };
+}
+
+/**
+ * `levels` を artifact キャッシュ付きで実行し、キャッシュの集計行を返す。
+ */
+function runLevels(tree, cache, ...args) {
+  const stdout = expectSuccess(tree.run(["levels", "--artifact-cache", cache, ...args]));
+  return stdout.split("\n").find((line) => line.startsWith("artifact cache:"));
+}
+
+/**
+ * キャッシュ内の各 artifact のパスを、それを生成したスキル名ごとに返す。
+ */
+function artifactsBySkill(cache) {
+  const found = {};
+  for (const shard of readdirSync(cache)) {
+    for (const name of readdirSync(join(cache, shard))) {
+      const path = join(cache, shard, name);
+      const level1 = JSON.parse(readFileSync(path, "utf-8")).files["resources/Level1_basics.md"];
+      found[SKILLS.find((skill) => level1.includes(skill))] = path;
+    }
+  }
+  return found;
+}
+
+describe("artifact キャッシュ", () => {
+  let tree;
+
+  afterEach(() => {
+    tree?.remove();
+    tree = undefined;
+  });
+
+  it("入力が同じなら、消えたレベルファイルをキャッシュから復元する", () => {
+    // Given: キャッシュへ公開済みのツリー
+    let cache;
+    ({ tree, cache } = createCachedTree());
+    expect(runLevels(tree, cache)).toContain("0 hits, 3 misses, 3 published");
+    const rendered = tree.read(LEVEL1("a-skill"));
+
+    // When: a-skill のレベルファイルを消して、もう一度実行する
+    rmSync(tree.path(".claude/skills/a-skill/resources"), { recursive: true });
+    const summary = runLevels(tree, cache);
+
+    // Then: すべてヒットし、同じ内容が復元される
+    expect(summary).toContain("3 hits, 0 misses, 0 published");
+    expect(tree.read(LEVEL1("a-skill"))).toBe(rendered);
+  });
+
+  it("GENERATOR_SOURCES のどのファイルが変わってもキャッシュを使わない", () => {
+    // Given: キャッシュへ公開済みのツリーと、生成結果を左右するモジュールの一覧
+    let cache;
+    ({ tree, cache } = createCachedTree());
+    runLevels(tree, cache);
+    const sources = tree.python(`import json
+from skill_catalog import GENERATOR_SOURCES
+print(json.dumps([path.name for path in GENERATOR_SOURCES]))`);
+    expect(sources).toContain("update_skill_levels.py");
+
+    for (const source of sources) {
+      // When: モジュールを 1 つ書き換えて実行する
+      appendFileSync(tree.path(`scripts/${source}`), `\n# ${source} changed\n`);
+      const summary = runLevels(tree, cache);
+
+      // Then: すべてミスになり、新しいバージョンで公開し直す
+      expect(`${source}: ${summary}`).toContain(`${source}: artifact cache: 0 hits, 3 misses, 3 published`);
+    }
+
+    // When: 生成結果に関わらないモジュールだけを書き換えて実行する
+    appendFileSync(tree.path("scripts/skill_worker.py"), "\n# unrelated change\n");
+
+    // Then: キャッシュはそのまま使われる
+    expect(runLevels(tree, cache)).toContain("3 hits, 0 misses, 0 published");
+  });
+
+  it("サイズ上限を超えると、最も長く使われていない artifact から削除する", () => {
+    // Given: a → b → c の順に古い artifact と、その後にヒットした a-skill
+    let cache;
+    ({ tree, cache } = createCachedTree());
+    runLevels(tree, cache);
+    const paths = artifactsBySkill(cache);
+    const now = Date.now() / 1000;
+    SKILLS.forEach((skill, age) => utimesSync(paths[skill], now - 3600 + age * 60, now - 3600 + age * 60));
+    expect(runLevels(tree, cache, "--skill", "a-skill")).toContain("1 hits, 0 misses");
+    const total = SKILLS.reduce((sum, skill) => sum + statSync(paths[skill]).size, 0);
+
+    // When: 1 バイトだけ小さい上限で prune する
+    const limit = ["--artifact-cache-size", String(total - 1)];
+    const stdout = expectSuccess(tree.run(["cache", "--artifact-cache", cache, ...limit, "--prune"]));
+
+    // Then: 最近使われていない b-skill だけが削除され、次の実行では b-skill だけがミスになる
+    expect(stdout).toContain("evicted 1 artifacts");
+    expect(Object.keys(artifactsBySkill(cache)).sort()).toEqual(["a-skill", "c-skill"]);
+    expect(runLevels(tree, cache)).toContain("2 hits, 1 misses, 1 published");
+  });
+});
@@ -0,0 +1,73 @@
+import { describe, it, expect, afterAll } from "vitest";
+import { spawnSync } from "child_process";
+import { createSkillTree, requirementDoc, skillMarkdown } from "./skill-fixture.mjs";
+
+// skill_cli.py の 1 回の実行で import にかけてよい時間の上限（マイクロ秒）。手元計測は約 65ms。
+const IMPORT_BUDGET_US = 150_000;
+
+// 何も書き込まない実行では読み込まず、使う関数の中で import するモジュール。
+const DEFERRED_MODULES = ["subprocess", "tempfile", "difflib", "concurrent.futures"];
+
+/**
+ * `python3 -X importtime skill_cli.py ...` を実行し、終了コードと、トップレベルの import ごとの
+ * 累積時間（マイクロ秒）を返す。
+ */
+function cliImportTimes(tree, args) {
+  const result = spawnSync("python3", ["-X", "importtime", "skill_cli.py", ...args], {
+    cwd: tree.path("scripts"),
+    encoding: "utf-8",
+  });
+  const times = new Map();
+  let total = 0;
+  for (const line of result.stderr.split("\n")) {
+    const match = line.match(/^import time:\s+\d+ \|\s+(\d+) \|( *)(\S+)$/);
+    if (match) {
+      times.set(match[3], Number(match[1]));
+      if (!match[2]) {
+        total += Number(match[1]); // 入れ子の import は親の累積時間に含まれる
+      }
+    }
+  }
+  return { status: result.status, times, total };
+}
+
+describe("skill_cli.py の起動時間", () => {
+  const tree = createSkillTree({
+    ".claude/skills/a-skill/SKILL.md": skillMarkdown("a-skill"),
+    "docs/00-requirements/01-overview.md": requirementDoc("概要仕様", "システム全体の概要。"),
+  });
+  tree.writeMapping({ "docs/00-requirements/01-overview.md": ["a-skill"] });
+
+  afterAll(() => tree.remove());
+
+  for (const command of ["levels", "sync"]) {
+    it(`存在しないスキルを指定した ${command} の実行が予算内に収まる`, () => {
+      // Given: 生成物とバイトコードキャッシュがあり、直前に書いた索引の mtime も確定している
+      const noop = [command, "--skill", "no-such-skill"];
+      cliImportTimes(tree, [command]);
+      cliImportTimes(tree, noop);
+
+      // When: git フックのように、何も変わらない実行を計測する
+      const { status, times, total } = cliImportTimes(tree, noop);
+
+      // Then: import 時間の合計が予算内で、書き込みや差分表示用のモジュールは読み込まれていない
+      expect(status).toBe(0);
+      expect(times.has("skill_cli")).toBe(false); // 起動スクリプトはソースから実行される
+      expect(total).toBeLessThan(IMPORT_BUDGET_US);
+      for (const deferred of DEFERRED_MODULES) {
+        expect(times.has(deferred), `${deferred} is imported by a no-op ${command} run`).toBe(false);
+      }
+    });
+  }
+
+  it("--help は生成スクリプトを読み込まずに使い方を表示する", () => {
+    // When: --help を計測する
+    const { status, times } = cliImportTimes(tree, ["--help"]);
+
+    // Then: どのサブコマンドのモジュールも、argparse も読み込まれない
+    expect(status).toBe(0);
+    for (const module of ["update_skill_levels", "sync_requirements_to_skills", "argparse"]) {
+      expect(times.has(module), `${module} is imported by --help`).toBe(false);
+    }
+  });
+});
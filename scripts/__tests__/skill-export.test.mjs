@@ -0,0 +1,89 @@
+import { describe, it, expect, afterEach } from "vitest";
+import { spawn } from "child_process";
+import { createSkillTree, requirementDoc, skillMarkdown } from "./skill-fixture.mjs";
+
+const MANIFEST = ".claude/skills/skills-manifest.json";
+
+// 同じ manifest を読み込んだ 2 つの SkillExport が、それぞれ記録してから A → B の順に保存する。
+const INTERLEAVED_SAVES = `
+import json
+from skill_export import EXPORT_PATH, SkillExport, save_export
+
+first, second = SkillExport(), SkillExport()
+first.load(EXPORT_PATH)
+second.load(EXPORT_PATH)
+first.update("a-skill", {"summary": "from first", "files": {"resources/Level1_basics.md": [1, []]}})
+second.update("a-skill", {"requirements": ["docs/00-requirements/01.md"]})
+second.update("b-skill", {"summary": "from second"})
+second.remove("c-skill")
+save_export(first)
+save_export(second)
+print(json.dumps(json.loads(EXPORT_PATH.read_text())["skills"]))
+`;
+
+/**
+ * `skill_cli.py` を子プロセスとして起動し、終了を待つ。
+ */
+function runAsync(tree, args) {
+  return new Promise((resolve, reject) => {
+    const child = spawn("python3", ["skill_cli.py", ...args], { cwd: tree.path("scripts") });
+    let stderr = "";
+    child.stderr.on("data", (chunk) => (stderr += chunk));
+    child.on("error", reject);
+    child.on("exit", (code) => (code === 0 ? resolve() : reject(new Error(`exit ${code}: ${stderr}`))));
+  });
+}
+
+describe("skills-manifest.json の保存時マージ", () => {
+  let tree;
+
+  afterEach(() => {
+    tree?.remove();
+    tree = undefined;
+  });
+
+  it("先に保存された内容に、自分が記録したフィールドだけを重ねる", () => {
+    // Given: 3 つのスキルの記録を持つ manifest
+    tree = createSkillTree();
+    const existing = {
+      "a-skill": { summary: "old", files: { "resources/Level2_intermediate.md": [2, []] } },
+      "b-skill": { summary: "old" },
+      "c-skill": { summary: "old" },
+    };
+    tree.write(MANIFEST, JSON.stringify({ format: 1, skills: existing, docs: {}, doc_sizes: {}, tokenizer: null }));
+
+    // When: 同じ manifest を読み込んだ 2 つの書き手が、交互に記録して順に保存する
+    const skills = tree.python(INTERLEAVED_SAVES);
+
+    // Then: 両方の記録が残り、記録していないフィールドは先の保存のまま
+    expect(skills["a-skill"]).toEqual({
+      summary: "from first",
+      requirements: ["docs/00-requirements/01.md"],
+      files: { "resources/Level1_basics.md": [1, []], "resources/Level2_intermediate.md": [2, []] },
+    });
+    expect(skills["b-skill"]).toEqual({ summary: "from second" });
+    expect(skills["c-skill"]).toBeUndefined();
+  });
+
+  it("同時に実行した生成プロセスの記録をすべて残す", async () => {
+    // Given: 要求仕様に対応付けた 6 つのスキル
+    const names = Array.from({ length: 6 }, (_, index) => `skill-${index}`);
+    const files = { "docs/00-requirements/01-overview.md": requirementDoc("概要仕様", "システム全体の概要。") };
+    for (const name of names) {
+      files[`.claude/skills/${name}/SKILL.md`] = skillMarkdown(name);
+    }
+    tree = createSkillTree(files);
+    tree.writeMapping({ "docs/00-requirements/01-overview.md": names });
+
+    // When: スキルごとの levels と、全スキルの sync を同時に実行する
+    await Promise.all([...names.map((name) => runAsync(tree, ["levels", "--skill", name])), runAsync(tree, ["sync"])]);
+
+    // Then: manifest には全スキルの両方の生成結果が記録されている
+    const { skills } = JSON.parse(tree.read(MANIFEST));
+    expect(Object.keys(skills).sort()).toEqual(names);
+    for (const name of names) {
+      expect(skills[name].files["resources/Level1_basics.md"]).toBeDefined();
+      expect(skills[name].files["resources/requirements-index.md"]).toBeDefined();
+    }
+  });
+});
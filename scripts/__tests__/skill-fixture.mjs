@@ -0,0 +1,106 @@
+import { spawnSync } from "child_process";
+import { cpSync, existsSync, mkdirSync, mkdtempSync, readFileSync, readdirSync, rmSync, writeFileSync } from "fs";
+import { tmpdir } from "os";
+import { dirname, join } from "path";
+
+const scriptsDir = join(process.cwd(), "scripts");
+
+export const MAPPING_FILE = "docs/00-requirements/requirements-skill-map.json";
+
+/**
+ * 生成スクリプトが読む形の SKILL.md を返す。`eol` で改行コードを切り替える。
+ */
+export function skillMarkdown(name, { summary = `${name} の概要を説明する。`, eol = "\n" } = {}) {
+  const lines = [
+    "---",
+    `name: ${name}`,
+    "description: |",
+    `  ${name} の判断基準を整理するスキル。`,
+    "",
+    "  📚 リソース参照:",
+    "  - `resources/guide.md`: 手順の解説",
+    "",
+    `  Use proactively when working on ${name}.`,
+    "version: 1.0.0",
+    "---",
+    "",
+    `# ${name}`,
+    "",
+    "## 概要",
+    "",
+    summary,
+    "",
+    "## ワークフロー",
+    "",
+    "### Phase 1: 準備",
+    "",
+    "- 前提を確認する",
+    "",
+  ];
+  return lines.join(eol);
+}
+
+/**
+ * 要求仕様ドキュメント（タイトルと要約行を持つ Markdown）を返す。
+ */
+export function requirementDoc(title, summary) {
+  return `# ${title}\n\n> ${summary}\n\n本文。\n`;
+}
+
+/**
+ * scripts/*.py を一時ディレクトリへコピーし、`files`（リポジトリ相対パス → 内容）を配置した
+ * 作業ツリーを作る。生成スクリプトは自身の位置からリポジトリルートを決めるため、
+ * 実リポジトリの .claude や .cache には触れない。
+ */
+export function createSkillTree(files = {}) {
+  const root = mkdtempSync(join(tmpdir(), "skill-tree-"));
+  const treeScripts = join(root, "scripts");
+  mkdirSync(treeScripts);
+  for (const name of readdirSync(scriptsDir)) {
+    if (name.endsWith(".py")) {
+      cpSync(join(scriptsDir, name), join(treeScripts, name));
+    }
+  }
+  const tree = {
+    root,
+    path: (rel) => join(root, rel),
+    exists: (rel) => existsSync(join(root, rel)),
+    read: (rel) => readFileSync(join(root, rel), "utf-8"),
+    readBytes: (rel) => readFileSync(join(root, rel)),
+    write(rel, content) {
+      mkdirSync(dirname(join(root, rel)), { recursive: true });
+      writeFileSync(join(root, rel), content);
+    },
+    writeMapping(mapping) {
+      const requirements = Object.entries(mapping).map(([file, skills]) => ({ file, skills }));
+      tree.write(MAPPING_FILE, JSON.stringify({ requirements }));
+    },
+    /** `skill_cli.py` のサブコマンドを実行する。 */
+    run(args, options = {}) {
+      return spawnSync("python3", ["skill_cli.py", ...args], { cwd: treeScripts, encoding: "utf-8", ...options });
+    },
+    /** scripts を import パスにして Python コードを実行し、stdout の JSON を返す。 */
+    python(code, options = {}) {
+      const result = spawnSync("python3", ["-c", code], { cwd: treeScripts, encoding: "utf-8", ...options });
+      if (result.status !== 0) {
+        throw new Error(`python3 failed: ${result.stderr}`);
+      }
+      return JSON.parse(result.stdout);
+    },
+    remove: () => rmSync(root, { recursive: true, force: true }),
+  };
+  for (const [rel, content] of Object.entries(files)) {
+    tree.write(rel, content);
+  }
+  return tree;
+}
+
+/**
+ * コマンドが成功したことを確かめ、stdout を返す。
+ */
+export function expectSuccess(result) {
+  if (result.status !== 0) {
+    throw new Error(`exit ${result.status}: ${result.stderr}`);
+  }
+  return result.stdout;
+}
@@ -0,0 +1,60 @@
+import { describe, it, expect, afterEach } from "vitest";
+import { createSkillTree, expectSuccess, requirementDoc, skillMarkdown } from "./skill-fixture.mjs";
+
+const SUMMARY = "CRLF で保存されたスキルの概要文。";
+
+describe("CRLF 改行の SKILL.md", () => {
+  let tree;
+
+  afterEach(() => {
+    tree?.remove();
+    tree = undefined;
+  });
+
+  it("sync は索引参照を追加し、levels は概要セクションを読み取る", () => {
+    // Given: CRLF で保存された SKILL.md と、それに対応付けた要求仕様
+    tree = createSkillTree({
+      ".claude/skills/crlf-skill/SKILL.md": skillMarkdown("crlf-skill", { summary: SUMMARY, eol: "\r\n" }),
+      "docs/00-requirements/01-overview.md": requirementDoc("概要仕様", "システム全体の概要。"),
+    });
+    tree.writeMapping({ "docs/00-requirements/01-overview.md": ["crlf-skill"] });
+
+    // When: sync と levels を順に実行する
+    expectSuccess(tree.run(["sync"]));
+    expectSuccess(tree.run(["levels"]));
+
+    // Then: description に索引参照が入り、Level1/Level2 にはフォールバックではなく概要が使われる
+    const skillMd = tree.read(".claude/skills/crlf-skill/SKILL.md");
+    expect(skillMd).toContain("`resources/requirements-index.md`");
+    expect(tree.read(".claude/skills/crlf-skill/resources/requirements-index.md")).toContain("概要仕様");
+    for (const level of ["Level1_basics.md", "Level2_intermediate.md"]) {
+      const content = tree.read(`.claude/skills/crlf-skill/resources/${level}`);
+      expect(content).toContain(SUMMARY);
+      expect(content).not.toContain("に関するベストプラクティスと判断基準を整理するスキル");
+    }
+  });
+
+  it("CRLF と LF の SKILL.md から同じレベルファイルを生成する", () => {
+    // Given: 改行コードだけが異なる 2 つのスキル
+    tree = createSkillTree({
+      ".claude/skills/same-skill/SKILL.md": skillMarkdown("same-skill", { summary: SUMMARY, eol: "\r\n" }),
+    });
+    const lf = createSkillTree({
+      ".claude/skills/same-skill/SKILL.md": skillMarkdown("same-skill", { summary: SUMMARY }),
+    });
+
+    try {
+      // When: それぞれで levels を実行する
+      expectSuccess(tree.run(["levels"]));
+      expectSuccess(lf.run(["levels"]));
+
+      // Then: 生成物は一致する
+      for (const level of ["Level1_basics.md", "Level2_intermediate.md", "Level3_advanced.md", "Level4_expert.md"]) {
+        const rel = `.claude/skills/same-skill/resources/${level}`;
+        expect(tree.read(rel)).toBe(lf.read(rel));
+      }
+    } finally {
+      lf.remove();
+    }
+  });
+});
@@ -0,0 +1,111 @@
+import { describe, it, expect, afterEach } from "vitest";
+import { utimesSync } from "fs";
+import { MAPPING_FILE, createSkillTree, expectSuccess, requirementDoc, skillMarkdown } from "./skill-fixture.mjs";
+
+const SNAPSHOT_FILE = ".cache/skills/requirements-skill-map.marshal";
+const DOC = "docs/00-requirements/01-overview.md";
+const INDEX = "resources/requirements-index.md";
+
+/**
+ * 2 つのスキルと 1 つの要求仕様を持つツリーを作る。
+ */
+function createMappedTree() {
+  return createSkillTree({
+    ".claude/skills/first-skill/SKILL.md": skillMarkdown("first-skill"),
+    ".claude/skills/other-skill/SKILL.md": skillMarkdown("other-skill"),
+    [DOC]: requirementDoc("概要仕様", "システム全体の概要。"),
+  });
+}
+
+describe("requirements-skill-map.json の検証", () => {
+  let tree;
+
+  afterEach(() => {
+    tree?.remove();
+    tree = undefined;
+  });
+
+  it("型の誤りをすべて JSON パス付きで報告し、何も書き込まない", () => {
+    // Given: file が数値、skills が文字列、要素がオブジェクトでない mapping
+    tree = createMappedTree();
+    tree.write(
+      MAPPING_FILE,
+      JSON.stringify({ requirements: [{ file: 1, skills: "first-skill" }, "oops", { file: DOC }] }),
+    );
+
+    // When: sync を実行する
+    const result = tree.run(["sync"]);
+
+    // Then: 終了コード 1 で、各エラーがパス付きで報告される
+    expect(result.status).toBe(1);
+    expect(result.stderr).toContain("4 schema error(s)");
+    expect(result.stderr).toContain("requirements[0].file: expected a non-empty string, got number");
+    expect(result.stderr).toContain("requirements[0].skills: expected an array, got string");
+    expect(result.stderr).toContain("requirements[1]: expected an object, got string");
+    expect(result.stderr).toContain('requirements[2]: missing "skills"');
+    expect(tree.exists(`.claude/skills/first-skill/${INDEX}`)).toBe(false);
+    expect(tree.exists(SNAPSHOT_FILE)).toBe(false);
+  });
+
+  it("スキルディレクトリ名として使えない名前を拒否する", () => {
+    // Given: ツリーの外を指す名前、空文字列、パス区切りを含む名前
+    tree = createMappedTree();
+    tree.writeMapping({ [DOC]: ["first-skill", "../outside", "", "a\\b"] });
+
+    // When: sync を実行する
+    const result = tree.run(["sync"]);
+
+    // Then: それぞれの位置が報告され、ツリーの外には書き込まない
+    expect(result.status).toBe(1);
+    expect(result.stderr).toContain("requirements[0].skills[1]: '../outside' is not a skill directory name");
+    expect(result.stderr).toContain("requirements[0].skills[2]: expected a non-empty string, got an empty string");
+    expect(result.stderr).toContain("requirements[0].skills[3]: 'a\\\\b' is not a skill directory name");
+    expect(tree.exists(`.claude/outside/${INDEX}`)).toBe(false);
+  });
+});
+
+describe("mapping のスナップショット", () => {
+  let tree;
+
+  afterEach(() => {
+    tree?.remove();
+    tree = undefined;
+  });
+
+  it("mapping が変わると古いスナップショットを使わない", () => {
+    // Given: 確定した（古い）mtime の mapping でスナップショットを作る
+    tree = createMappedTree();
+    tree.writeMapping({ [DOC]: ["first-skill"] });
+    const past = new Date(Date.now() - 60_000);
+    utimesSync(tree.path(MAPPING_FILE), past, past);
+    expectSuccess(tree.run(["sync"]));
+    expect(tree.exists(SNAPSHOT_FILE)).toBe(true);
+
+    // When: 同じ長さのまま対応先のスキルを変えて、もう一度 sync する
+    tree.writeMapping({ [DOC]: ["other-skill"] });
+    expectSuccess(tree.run(["sync"]));
+
+    // Then: 新しい mapping のスキルに索引が作られる
+    expect(tree.exists(`.claude/skills/other-skill/${INDEX}`)).toBe(true);
+  });
+
+  it("壊れたスナップショットは捨てて JSON から読み直す", () => {
+    // Given: 壊れた内容のスナップショット
+    tree = createMappedTree();
+    tree.writeMapping({ [DOC]: ["first-skill"] });
+    tree.write(SNAPSHOT_FILE, "not a marshal snapshot");
+
+    // When: sync を実行する
+    expectSuccess(tree.run(["sync"]));
+
+    // Then: JSON の mapping で同期され、スナップショットが作り直される
+    expect(tree.exists(`.claude/skills/first-skill/${INDEX}`)).toBe(true);
+    expect(tree.readBytes(SNAPSHOT_FILE).toString("latin1")).not.toBe("not a marshal snapshot");
+
+    // When: 作り直されたスナップショットで、もう一度 sync する
+    const again = expectSuccess(tree.run(["sync"]));
+
+    // Then: 同じ結果になり、何も書き換えない
+    expect(again).toContain("written 0");
+  });
+});
@@ -0,0 +1,107 @@
+import { describe, it, expect } from "vitest";
+import { spawnSync } from "child_process";
+import { join } from "path";
+
+const scriptsDir = join(process.cwd(), "scripts");
+
+const PARSE = `
+import json, sys
+from skill_markdown import parse_markdown
+from sync_requirements_to_skills import add_index_reference
+
+results = {}
+for name, text in json.load(sys.stdin).items():
+    document = parse_markdown(text.replace("\\r\\n", "\\n"))  # SKILL.md is read with universal newlines
+    results[name] = {
+        "name": document.frontmatter.field("name"),
+        "description": document.frontmatter.block("description"),
+        "summary": document.section("概要"),
+        "edited": add_index_reference(text),
+    }
+print(json.dumps(results, ensure_ascii=False))
+`;
+
+/**
+ * 各 SKILL.md テキストを parse_markdown と add_index_reference に通した結果を返す。
+ */
+function parseAll(cases) {
+  const result = spawnSync("python3", ["-c", PARSE], {
+    cwd: scriptsDir,
+    encoding: "utf-8",
+    input: JSON.stringify(cases),
+  });
+  if (result.status !== 0) {
+    throw new Error(`python3 failed: ${result.stderr}`);
+  }
+  return JSON.parse(result.stdout);
+}
+
+const DESCRIPTION = "description: |\n  説明。\n\n  Use proactively when needed.\n";
+const INDEX_LINE = "  - `resources/requirements-index.md`: 要求仕様の索引（docs/00-requirements と同期）";
+const EDITED_DESCRIPTION = `description: |\n  説明。\n\n  📚 リソース参照:\n${INDEX_LINE}\n\n  Use proactively when needed.\n`;
+
+// 期待値は正規表現ベースの旧実装（extract_frontmatter / extract_description / ensure_skill_description）の出力。
+describe("SKILL.md パーサーと索引参照の追加（旧実装との互換性）", () => {
+  it("LF と CRLF の SKILL.md を同じように解析し、LF で書き戻す", () => {
+    // Given: 改行コードだけが異なる SKILL.md
+    const lf = `---\nname: a\n${DESCRIPTION}version: 1\n---\n\n# a\n\n## 概要\n\n概要文。\n`;
+    const crlf = lf.replaceAll("\n", "\r\n");
+
+    // When: 解析する
+    const results = parseAll({ lf, crlf });
+
+    // Then: 同じ値が得られ、どちらも LF の同じテキストに編集される
+    expect(results.lf).toEqual(results.crlf);
+    expect(results.lf).toMatchObject({ name: "a", description: "  説明。", summary: "概要文。" });
+    expect(results.crlf.edited).toBe(`---\nname: a\n${EDITED_DESCRIPTION}version: 1\n---\n\n# a\n\n## 概要\n\n概要文。\n`);
+  });
+
+  it("フロントマターがない・空・折り返し記法の description は編集しない", () => {
+    // Given: 編集対象の `description: |` を持たない SKILL.md
+    const cases = {
+      missing: "# a\n\ndescription: |\n  本文中の行\n",
+      empty: `---\n---\n\n${DESCRIPTION}---\n`,
+      folded: "---\nname: a\ndescription: >\n  folded\n  Use proactively.\n---\n\n# a\n",
+    };
+
+    // When: 解析する
+    const results = parseAll(cases);
+
+    // Then: どれも索引参照を追加しない
+    expect(results.missing).toMatchObject({ name: "", description: "", edited: null });
+    expect(results.empty.edited).toBeNull();
+    expect(results.folded).toMatchObject({ name: "a", description: "", edited: null });
+  });
+
+  it("重複した description キーは最初の `description: |` を使う", () => {
+    // Given: 単一行の description の後にブロック形式の description が続く SKILL.md と、ブロックが 2 つある SKILL.md
+    const cases = {
+      scalarFirst: `---\nname: a\ndescription: short\n${DESCRIPTION}---\n\n# a\n`,
+      twoBlocks: `---\nname: a\n${DESCRIPTION}description: |\n  second\n---\n\n# a\n`,
+    };
+
+    // When: 解析する
+    const results = parseAll(cases);
+
+    // Then: 最初のブロックが読まれ、そこに索引参照が追加される
+    expect(results.scalarFirst.description).toBe("  説明。");
+    expect(results.scalarFirst.edited).toBe(`---\nname: a\ndescription: short\n${EDITED_DESCRIPTION}---\n\n# a\n`);
+    expect(results.twoBlocks.description).toBe("  説明。");
+    expect(results.twoBlocks.edited).toBe(`---\nname: a\n${EDITED_DESCRIPTION}description: |\n  second\n---\n\n# a\n`);
+  });
+
+  it("末尾に改行がない SKILL.md は改行を補って編集する", () => {
+    // Given: 閉じる `---` や本文の後に改行がない SKILL.md
+    const cases = {
+      closing: `---\nname: a\n${DESCRIPTION}---`,
+      body: `---\nname: a\n${DESCRIPTION}---\n# a`,
+    };
+
+    // When: 解析する
+    const results = parseAll(cases);
+
+    // Then: 旧実装と同じく末尾に改行が付く
+    expect(results.closing.edited).toBe(`---\nname: a\n${EDITED_DESCRIPTION}---\n`);
+    expect(results.body.edited).toBe(`---\nname: a\n${EDITED_DESCRIPTION}---\n# a\n`);
+  });
+});
@@ -0,0 +1,140 @@
+import { describe, it, expect, afterEach } from "vitest";
+import { spawnSync } from "child_process";
+import { join } from "path";
+import { createSkillTree, requirementDoc, skillMarkdown } from "./skill-fixture.mjs";
+
+const scriptsDir = join(process.cwd(), "scripts");
+
+/**
+ * ワーカーに JSON-RPC リクエストを 1 行ずつ送り、stdout の応答を id ごとに返す。
+ * `tree` を渡すとそのフィクスチャのツリーで実行する。
+ */
+function callWorker(requests, { tree, concurrency = 2 } = {}) {
+  const input = requests.map((request) => JSON.stringify(request)).join("\n") + "\n";
+  const result = spawnSync("python3", ["skill_cli.py", "worker", "--concurrency", String(concurrency)], {
+    cwd: tree ? tree.path("scripts") : scriptsDir,
+    encoding: "utf-8",
+    input,
+  });
+  if (result.status !== 0) {
+    throw new Error(`worker failed: ${result.stderr}`);
+  }
+  const messages = result.stdout
+    .split("\n")
+    .filter((line) => line)
+    .map((line) => JSON.parse(line));
+  return {
+    notifications: messages.filter((message) => !("id" in message)),
+    responses: new Map(messages.filter((message) => "id" in message).map((message) => [message.id, message])),
+  };
+}
+
+describe("スキル生成ワーカー（JSON-RPC）", () => {
+  it("ready 通知の後、各応答にレイテンシと並列度を付けて返す", () => {
+    // Given: list_skills と shutdown のリクエスト
+    const requests = [
+      { jsonrpc: "2.0", id: 1, method: "list_skills" },
+      { jsonrpc: "2.0", id: 2, method: "shutdown" },
+    ];
+
+    // When: ワーカーに送る
+    const { notifications, responses } = callWorker(requests);
+
+    // Then: ready 通知と、meta 付きの結果が返る
+    expect(notifications[0]).toMatchObject({ method: "ready", params: { concurrency: 2 } });
+    const listed = responses.get(1).result;
+    expect(Array.isArray(listed.skills)).toBe(true);
+    expect(listed.meta.elapsed_ms).toBeGreaterThanOrEqual(0);
+    expect(listed.meta.queued_ms).toBeGreaterThanOrEqual(0);
+    expect(listed.meta.concurrency.limit).toBe(2);
+    expect(responses.get(2).result.meta.concurrency.in_flight).toBe(0);
+  });
+
+  it("不正なリクエストには JSON-RPC のエラーコードで応答し、処理を続ける", () => {
+    // Given: 未知のメソッド、不正なスキル名、存在しないスキルを含むリクエスト
+    const requests = [
+      { jsonrpc: "2.0", id: 1, method: "unknown_method" },
+      { jsonrpc: "2.0", id: 2, method: "update_skill", params: { skill: "../outside" } },
+      { jsonrpc: "2.0", id: 3, method: "update_skill", params: { skill: "no-such-skill" } },
+      { jsonrpc: "2.0", id: 4, method: "list_skills" },
+    ];
+
+    // When: ワーカーに送る（入力終了で停止する）
+    const { responses } = callWorker(requests);
+
+    // Then: それぞれのエラーコードが返り、後続のリクエストも処理される
+    expect(responses.get(1).error.code).toBe(-32601);
+    expect(responses.get(2).error.code).toBe(-32602);
+    expect(responses.get(3).error.code).toBe(-32001);
+    expect(responses.get(3).error.data.meta.concurrency.limit).toBe(2);
+    expect(responses.get(4).result.skills).toBeDefined();
+  });
+
+  describe("フィクスチャのツリー", () => {
+    let tree;
+
+    afterEach(() => {
+      tree?.remove();
+      tree = undefined;
+    });
+
+    it("list_skills・update_skill・build_skill_index・flush を交互に送っても状態を失わない", () => {
+      // Given: 要求仕様に対応付けた 3 つのスキルと、それらへの要求を交互に並べたリクエスト
+      const skills = ["alpha-skill", "beta-skill", "gamma-skill"];
+      const files = {};
+      const mapping = {};
+      for (const [index, skill] of skills.entries()) {
+        const doc = `docs/00-requirements/0${index + 1}-${skill}.md`;
+        files[`.claude/skills/${skill}/SKILL.md`] = skillMarkdown(skill);
+        files[doc] = requirementDoc(`${skill} の仕様`, `${skill} の要約。`);
+        mapping[doc] = [skill];
+      }
+      tree = createSkillTree(files);
+      tree.writeMapping(mapping);
+      const requests = [];
+      for (let round = 0; round < 3; round++) {
+        for (const skill of skills) {
+          const id = requests.length;
+          requests.push(
+            { jsonrpc: "2.0", id: id + 1, method: "list_skills" },
+            { jsonrpc: "2.0", id: id + 2, method: "update_skill", params: { skill } },
+            { jsonrpc: "2.0", id: id + 3, method: "build_skill_index", params: { skill } },
+            { jsonrpc: "2.0", id: id + 4, method: "flush" },
+          );
+        }
+      }
+
+      // When: 並列度 4 のワーカーに送る（入力終了で保存して停止する）
+      const { responses } = callWorker(requests, { tree, concurrency: 4 });
+
+      // Then: すべて成功し、レベルファイル・カタログ・ドキュメントキャッシュが揃う
+      expect(responses.size).toBe(requests.length);
+      for (const request of requests) {
+        expect(responses.get(request.id).error).toBeUndefined();
+      }
+      for (const request of requests.filter((r) => r.method === "build_skill_index")) {
+        const { skill } = request.params;
+        expect(responses.get(request.id).result.content).toContain(`${skill} の仕様`);
+      }
+      const docCache = JSON.parse(tree.read(".cache/skills/requirement-docs.json"));
+      const catalog = JSON.parse(tree.read(".cache/skills/catalog.json"));
+      for (const skill of skills) {
+        expect(tree.exists(`.claude/skills/${skill}/resources/Level1_basics.md`)).toBe(true);
+        expect(catalog.skills[skill][0]).not.toBeNull(); // SKILL.md の解析結果が記録されている
+      }
+      expect(Object.keys(docCache.docs).sort()).toEqual(Object.keys(mapping).sort());
+
+      // Then: 次に起動したワーカーからも全スキルのレベルファイルが見え、キャッシュ済みの索引だけでは保存しない
+      const { responses: next } = callWorker(
+        [
+          { jsonrpc: "2.0", id: 1, method: "list_skills" },
+          { jsonrpc: "2.0", id: 2, method: "build_skill_index", params: { skill: "alpha-skill" } },
+          { jsonrpc: "2.0", id: 3, method: "flush" },
+        ],
+        { tree, concurrency: 1 },
+      );
+      expect(next.get(1).result.skills.map((skill) => skill.has_levels)).toEqual([true, true, true]);
+      expect(next.get(3).result.saved).toBe(false);
+    });
+  });
+});
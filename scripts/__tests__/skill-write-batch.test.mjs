@@ -0,0 +1,133 @@
+import { describe, it, expect, afterEach } from "vitest";
+import { spawnSync } from "child_process";
+import { readdirSync, statSync } from "fs";
+import { join, relative } from "path";
+import { createSkillTree, expectSuccess, requirementDoc, skillMarkdown } from "./skill-fixture.mjs";
+
+const scriptsDir = join(process.cwd(), "scripts");
+
+// a.md の置き換えと new.md の作成の後、計画後に現れたディレクトリ blocker を置き換えようとして失敗するバッチ。
+const FAILING_BATCH = `
+import json, os, shutil, tempfile
+from pathlib import Path
+from skill_io import WriteBatch
+
+root = Path(tempfile.mkdtemp())
+(root / "a.md").write_text("old a\\n")
+batch = WriteBatch()
+batch.add(root / "a.md", "new a\\n")
+batch.add(root / "new.md", "new file\\n")
+batch.add(root / "blocker", "cannot replace a directory\\n")
+(root / "blocker").mkdir()  # appears after the batch was planned
+(root / "blocker" / "keep.md").write_text("kept\\n")
+try:
+    batch.commit()
+    error = None
+except OSError as exc:
+    error = type(exc).__name__
+print(json.dumps({
+    "error": error,
+    "a": (root / "a.md").read_text(),
+    "files": sorted(os.listdir(root)),
+    "blocker": sorted(os.listdir(root / "blocker")),
+}))
+shutil.rmtree(root)
+`;
+
+// 計画後に親ディレクトリの位置へ通常ファイルが現れ、一時ファイルの書き出し中に失敗するバッチ。
+const UNSTAGEABLE_BATCH = `
+import json, os, shutil, tempfile
+from pathlib import Path
+from skill_io import WriteBatch
+
+root = Path(tempfile.mkdtemp())
+(root / "a.md").write_text("old a\\n")
+batch = WriteBatch()
+batch.add(root / "a.md", "new a\\n")
+batch.add(root / "not-a-dir" / "b.md", "b\\n")
+(root / "not-a-dir").write_text("file\\n")  # appears after the batch was planned
+try:
+    batch.commit()
+    error = None
+except OSError as exc:
+    error = type(exc).__name__
+print(json.dumps({"error": error, "a": (root / "a.md").read_text(), "files": sorted(os.listdir(root))}))
+shutil.rmtree(root)
+`;
+
+function runPython(code) {
+  const result = spawnSync("python3", ["-c", code], { cwd: scriptsDir, encoding: "utf-8" });
+  if (result.status !== 0) {
+    throw new Error(`python3 failed: ${result.stderr}`);
+  }
+  return JSON.parse(result.stdout);
+}
+
+/**
+ * `root` 配下（scripts を除く）の各ファイルのサイズと mtime を返す。
+ */
+function snapshotTree(root, dir = root, files = {}) {
+  for (const name of readdirSync(dir)) {
+    const path = join(dir, name);
+    const rel = relative(root, path);
+    if (rel === "scripts") {
+      continue;
+    }
+    const st = statSync(path);
+    files[rel] = st.isDirectory() ? "dir" : `${st.size}:${st.mtimeMs}`;
+    if (st.isDirectory()) {
+      snapshotTree(root, path, files);
+    }
+  }
+  return files;
+}
+
+describe("WriteBatch のコミット", () => {
+  it("置き換えの途中で失敗すると、置き換え済みのファイルを元に戻す", () => {
+    // Given / When: 3 件目の置き換えで失敗するバッチをコミットする
+    const result = runPython(FAILING_BATCH);
+
+    // Then: エラーが伝わり、a.md は元の内容に戻り、新規ファイルと一時ファイルは残らない
+    expect(result.error).not.toBeNull();
+    expect(result.a).toBe("old a\n");
+    expect(result.files).toEqual(["a.md", "blocker"]);
+    expect(result.blocker).toEqual(["keep.md"]);
+  });
+
+  it("一時ファイルの書き出しで失敗すると、どのファイルも置き換えない", () => {
+    // Given / When: 2 件目の親ディレクトリが通常ファイルで作れないバッチをコミットする
+    const result = runPython(UNSTAGEABLE_BATCH);
+
+    // Then: a.md はそのままで、1 件目の一時ファイルも片付けられている
+    expect(result.error).not.toBeNull();
+    expect(result.a).toBe("old a\n");
+    expect(result.files).toEqual(["a.md", "not-a-dir"]);
+  });
+});
+
+describe("sync --dry-run --diff", () => {
+  let tree;
+
+  afterEach(() => {
+    tree?.remove();
+    tree = undefined;
+  });
+
+  it("差分を表示するだけで、ディスクには書き込まない", () => {
+    // Given: 索引も SKILL.md の参照もまだないスキル
+    tree = createSkillTree({
+      ".claude/skills/dry-skill/SKILL.md": skillMarkdown("dry-skill"),
+      "docs/00-requirements/01-overview.md": requirementDoc("概要仕様", "システム全体の概要。"),
+    });
+    tree.writeMapping({ "docs/00-requirements/01-overview.md": ["dry-skill"] });
+    const before = snapshotTree(tree.root);
+
+    // When: --dry-run --diff で sync を実行する
+    const stdout = expectSuccess(tree.run(["sync", "--dry-run", "--diff"]));
+
+    // Then: 新規の索引と SKILL.md の変更が差分として表示され、ツリーは（キャッシュも含めて）変わらない
+    expect(stdout).toContain("+++ b/.claude/skills/dry-skill/resources/requirements-index.md");
+    expect(stdout).toContain("+  - `resources/requirements-index.md`");
+    expect(snapshotTree(tree.root)).toEqual(before);
+  });
+});
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Benchmark the skill generator pipelines on synthetic skill trees.
+
+Generates a `.claude/skills` tree and a requirement-doc corpus of configurable
+size in a temporary directory, times each stage of `update_skill_levels.py`
+and `sync_requirements_to_skills.py`, and prints machine-readable JSON.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from skill_catalog import SkillEntry
+from skill_io import WriteStats, write_text
+from skill_tree import scan_skills
+from sync_requirements_to_skills import (
+    DocRecord,
+    build_skill_index,
+    ensure_skill_description,
+    extract_title_and_summary,
+)
+from update_skill_levels import extract_topics, parse_skill, render_levels, write_levels
+
+FILLER = "この段落は合成ベンチマーク用のダミーテキストです。Progressive Disclosure を想定した説明が続きます。\n"
+
+
+def filler(size: int) -> str:
+    """Roughly `size` bytes of UTF-8 text."""
+    return FILLER * max(size // len(FILLER.encode("utf-8")), 1)
+
+
+def skill_markdown(name: str, resources: List[str], scripts: List[str]) -> str:
+    refs = [f"  - `resources/{res}`: {res} の用途" for res in resources[:3]]
+    refs += [f"  - `scripts/{script}`: {script} の用途" for script in scripts[:2]]
+    lines = [
+        "---",
+        f"name: {name}",
+        "description: |",
+        f"  {name} の判断基準とベストプラクティスを整理するスキル。",
+        "",
+        "  📖 参照書籍:",
+        "  - 『合成データ入門』（ベンチ太郎）: 計測の基本",
+        "",
+        "  📚 リソース参照:",
+        *refs,
+        "",
+        f"  Use proactively when working on {name}.",
+        "version: 1.0.0",
+        "---",
+        "",
+        f"# {name}",
+        "",
+        "## 概要",
+        "",
+        f"{name} の概要を説明する。",
+        "",
+        "## ワークフロー",
+        "",
+        "### Phase 1: 準備",
+        "",
+        "- 前提を確認する",
+        "",
+        "## ベストプラクティス",
+        "",
+        "### すべきこと",
+        "",
+        "- 目的を明確にする",
+        "- resources/Level1_basics.md を確認する",
+        "- 計測結果を記録する",
+        "",
+        "### 避けるべきこと",
+        "",
+        "- 根拠のない最適化",
+        "",
+        "## 変更履歴",
+        "",
+        "- 1.0.0: 初版",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def resource_markdown(title: str, size: int) -> str:
+    sections = [f"# {title}", "", "## 概要", "", FILLER]
+    for index in range(1, 4):
+        sections += [f"## {title} トピック {index}", "", f"### {title} 詳細 {index}", "", filler(size // 3)]
+    return "\n".join(sections)
+
+
+def generate_tree(root: Path, config: argparse.Namespace) -> Dict[str, List[str]]:
+    """Create skills and requirement docs under `root`; returns the doc -> skills mapping."""
+    rng = random.Random(config.seed)
+    skills_root = root / ".claude/skills"
+    names = [f"bench-skill-{index:05d}" for index in range(config.skills)]
+    for name in names:
+        skill_dir = skills_root / name
+        resources = [
+            f"{rng.choice(('pattern', 'reference', 'guide', 'troubleshooting'))}-{i}.md" for i in range(config.resources)
+        ]
+        scripts = [f"{rng.choice(('check', 'validate', 'generate', 'apply'))}-{name[-5:]}-{i}.mjs" for i in range(2)]
+        (skill_dir / "resources").mkdir(parents=True)
+        (skill_dir / "scripts").mkdir()
+        (skill_dir / "templates").mkdir()
+        for res in resources:
+            (skill_dir / "resources" / res).write_text(
+                resource_markdown(res[:-3], config.resource_kb * 1024), encoding="utf-8"
+            )
+        for script in scripts:
+            (skill_dir / "scripts" / script).write_text("// synthetic\n", encoding="utf-8")
+        (skill_dir / "templates" / "output-template.md").write_text("# Template\n", encoding="utf-8")
+        (skill_dir / "SKILL.md").write_text(skill_markdown(name, resources, scripts), encoding="utf-8")
+
+    docs_root = root / "docs/00-requirements"
+    docs_root.mkdir(parents=True)
+    mapping: Dict[str, List[str]] = {}
+    for index in range(config.docs):
+        rel = f"docs/00-requirements/{index:04d}-bench-requirement.md"
+        body = f"# 要求仕様 {index}\n\n> 合成要求仕様 {index} の目的と範囲。\n\n" + filler(config.doc_kb * 1024)
+        (root / rel).write_text(body, encoding="utf-8")
+        mapping[rel] = rng.sample(names, min(config.fanout, len(names)))
+    return mapping
+
+
+def time_stage(timings: Dict[str, List[float]], calls: Dict[str, int], stage: str, items: List, func: Callable) -> List:
+    results = []
+    start = time.perf_counter()
+    for item in items:
+        results.append(func(item))
+    timings.setdefault(stage, []).append(time.perf_counter() - start)
+    calls[stage] = len(items)
+    return results
+
+
+def run_once(root: Path, config: argparse.Namespace, timings: Dict[str, List[float]], calls: Dict[str, int]) -> None:
+    mapping = generate_tree(root, config)
+    skills = time_stage(timings, calls, "levels.scan", [root / ".claude/skills"], scan_skills)[0]
+    skill_dirs = [skill.path for skill in skills]
+    entries = [SkillEntry(skill) for skill in skills]
+
+    sources = time_stage(timings, calls, "levels.parse", entries, parse_skill)
+    pairs = list(zip(entries, sources))
+    topics = time_stage(timings, calls, "levels.topics", pairs, lambda pair: extract_topics(pair[0], pair[1].resources))
+    rendered = time_stage(
+        timings, calls, "levels.render", list(zip(sources, topics)), lambda pair: render_levels(pair[0], pair[1])
+    )
+    outputs = list(zip(skill_dirs, rendered))
+    time_stage(timings, calls, "levels.write", outputs, lambda pair: write_levels(pair[0], pair[1], WriteStats()))
+    time_stage(
+        timings, calls, "levels.write_unchanged", outputs, lambda pair: write_levels(pair[0], pair[1], WriteStats())
+    )
+
+    docs = sorted(mapping)
+    parsed = time_stage(timings, calls, "sync.doc_parse", docs, lambda rel: extract_title_and_summary(root / rel))
+    records = [DocRecord(rel, title, summary) for rel, (title, summary) in zip(docs, parsed)]
+    skill_docs: Dict[str, List[int]] = {}
+    for doc_id, rel in enumerate(docs):
+        for skill in mapping[rel]:
+            skill_docs.setdefault(skill, []).append(doc_id)
+    skills = sorted(skill_docs)
+    indexes = time_stage(
+        timings, calls, "sync.render", skills, lambda skill: build_skill_index(skill, skill_docs[skill], records)
+    )
+    index_paths = [root / ".claude/skills" / skill / "resources/requirements-index.md" for skill in skills]
+    time_stage(
+        timings, calls, "sync.write", list(zip(index_paths, indexes)), lambda pair: write_text(pair[0], pair[1])
+    )
+    time_stage(
+        timings,
+        calls,
+        "sync.describe",
+        skills,
+        lambda skill: ensure_skill_description(root / ".claude/skills" / skill / "SKILL.md"),
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the skill generator pipelines")
+    parser.add_argument("--skills", type=int, default=100, help="Number of synthetic skills")
+    parser.add_argument("--resources", type=int, default=5, help="Resource files per skill")
+    parser.add_argument("--resource-kb", type=int, default=8, help="Approximate size of each resource file (KiB)")
+    parser.add_argument("--docs", type=int, default=20, help="Number of requirement docs")
+    parser.add_argument("--doc-kb", type=int, default=32, help="Approximate size of each requirement doc (KiB)")
+    parser.add_argument("--fanout", type=int, default=8, help="Skills mapped to each requirement doc")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of timed runs (fresh tree each run)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the synthetic tree")
+    parser.add_argument("--output", type=Path, help="Write the JSON results to this file instead of stdout")
+    args = parser.parse_args()
+
+    timings: Dict[str, List[float]] = {}
+    calls: Dict[str, int] = {}
+    for _ in range(max(args.repeat, 1)):
+        with tempfile.TemporaryDirectory(prefix="skill-bench-") as tmp:
+            run_once(Path(tmp), args, timings, calls)
+
+    stages = {
+        stage: {
+            "calls": calls[stage],
+            "min_s": round(min(samples), 6),
+            "median_s": round(statistics.median(samples), 6),
+            "per_call_us": round(statistics.median(samples) / max(calls[stage], 1) * 1e6, 2),
+        }
+        for stage, samples in timings.items()
+    }
+    result = {
+        "benchmark": "skill-generators",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            key: getattr(args, key)
+            for key in ("skills", "resources", "resource_kb", "docs", "doc_kb", "fanout", "repeat", "seed")
+        },
+        "stages": stages,
+        "total_median_s": round(sum(stage["median_s"] for stage in stages.values()), 6),
+    }
+    content = json.dumps(result, indent=2, ensure_ascii=False) + "\n"
+    if args.output:
+        args.output.write_text(content, encoding="utf-8")
+    else:
+        sys.stdout.write(content)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
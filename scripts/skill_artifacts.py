@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache of generated skill files, shareable between machines.
+
+    python3 scripts/skill_cli.py cache [--artifact-cache DIR] [--prune]
+
+An artifact is what one generator step produces for one skill: the files it
+renders and the record it adds to skills-manifest.json. It is stored under the
+sha256 of everything the step reads plus the version of the code that renders
+it, so any checkout with the same inputs restores it instead of rendering
+again. The cache is a plain directory, local or shared between CI workers on a
+network mount, chosen with `--artifact-cache DIR` or the SKILL_ARTIFACT_CACHE
+environment variable. Artifacts are JSON, so interpreters of any version can
+share them, and are published atomically (temp file plus `os.replace`), so a
+concurrent reader never sees a partial one. A hit refreshes the artifact's
+mtime, and once the directory outgrows its size limit the least recently used
+artifacts are evicted.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Sequence
+
+from skill_export import SkillRecord
+from skill_io import atomic_write_bytes, map_io
+
+ARTIFACT_DIR_ENV = "SKILL_ARTIFACT_CACHE"
+ARTIFACT_SIZE_ENV = "SKILL_ARTIFACT_CACHE_SIZE"
+ARTIFACT_FORMAT = 1
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+SIZE_PATTERN = re.compile(r"(\d+)\s*([kmg]?)i?b?")
+SIZE_UNITS = {"": 1, "k": 1024, "m": 1024**2, "g": 1024**3}
+
+
+class Artifact(NamedTuple):
+    files: Dict[str, bytes]  # path in the skill directory -> content
+    record: SkillRecord  # the skill's fields in the exported manifest
+
+
+def parse_size(text: str) -> int:
+    """Bytes in "65536", "64K", "256M" or "2G"."""
+    match = SIZE_PATTERN.fullmatch(text.strip().lower())
+    if match is None:
+        raise ValueError(f"invalid cache size {text!r} (expected e.g. 512M or 2G)")
+    return int(match.group(1)) * SIZE_UNITS[match.group(2)]
+
+
+def artifact_key(kind: str, version: str, *inputs: str) -> str:
+    """Cache key of a `kind` artifact rendered by code at `version` from `inputs`."""
+    digest = hashlib.sha256(f"{kind}\0{ARTIFACT_FORMAT}\0{version}".encode("utf-8"))
+    for value in inputs:
+        digest.update(b"\0" + value.encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ArtifactStats:
+    __slots__ = ("hits", "misses", "published", "failed", "bytes_restored", "evicted", "bytes_evicted")
+
+    def __init__(self) -> None:
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def summary(self) -> str:
+        text = (
+            f"artifact cache: {self.hits} hits, {self.misses} misses, {self.published} published "
+            f"({self.bytes_restored} bytes restored, {self.evicted} evicted freeing {self.bytes_evicted} bytes)"
+        )
+        return f"{text}, {self.failed} failed to publish" if self.failed else text
+
+
+class ArtifactCache:
+    def __init__(self, root: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = root
+        self.max_bytes = max_bytes
+        self.stats = ArtifactStats()
+
+    def path(self, key: str) -> Path:
+        return self.root / key[:2] / key
+
+    def load(self, key: str) -> Artifact | None:
+        """The artifact stored under `key`, touched as recently used; None if it is missing or unreadable."""
+        import json
+
+        path = self.path(key)
+        try:
+            data = json.loads(path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        if not isinstance(data, dict) or data.get("format") != ARTIFACT_FORMAT:
+            return None
+        files, record = data.get("files"), data.get("record")
+        if not isinstance(files, dict) or not isinstance(record, dict):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass  # a read-only share still serves hits
+        return Artifact({name: text.encode("utf-8") for name, text in files.items()}, record)
+
+    def lookup(self, keys: Sequence[str], threads: int = 0) -> List[Artifact | None]:
+        """`load()` each key, on `threads` threads when it is above 0, counting hits and misses."""
+        found = map_io(self.load, keys, threads)
+        for artifact in found:
+            if artifact is None:
+                self.stats.misses += 1
+            else:
+                self.stats.hits += 1
+                self.stats.bytes_restored += sum(len(data) for data in artifact.files.values())
+        return found
+
+    def get(self, key: str) -> Artifact | None:
+        return self.lookup([key])[0]
+
+    def put(self, key: str, artifact: Artifact) -> None:
+        import json
+
+        content = {
+            "format": ARTIFACT_FORMAT,
+            "files": {name: data.decode("utf-8") for name, data in artifact.files.items()},
+            "record": artifact.record,
+        }
+        path = self.path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            atomic_write_bytes(path, json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+        except OSError:
+            self.stats.failed += 1  # the cache only saves work; the outputs are already written
+            return
+        self.stats.published += 1
+
+    def usage(self) -> List[tuple]:
+        """(mtime_ns, size, path) of every stored artifact; temp files of writers in progress are skipped."""
+        stored: List[tuple] = []
+        try:
+            shards = [entry.path for entry in os.scandir(self.root) if entry.is_dir() and len(entry.name) == 2]
+        except OSError:
+            return stored
+        for shard in shards:
+            try:
+                items = list(os.scandir(shard))
+            except OSError:
+                continue
+            for item in items:
+                if item.name.startswith("."):
+                    continue
+                try:
+                    st = item.stat()
+                except OSError:
+                    continue  # evicted by another process
+                stored.append((st.st_mtime_ns, st.st_size, item.path))
+        return stored
+
+    def evict(self, force: bool = False) -> None:
+        """Remove least recently used artifacts until the cache fits its size limit.
+
+        Only runs when this process published something (or with `force`), so
+        runs that are all hits never list the whole cache directory.
+        """
+        if not (self.stats.published or force):
+            return
+        stored = self.usage()
+        total = sum(size for _, size, _ in stored)
+        if total <= self.max_bytes:
+            return
+        stored.sort()
+        for _, size, path in stored:
+            if total <= self.max_bytes:
+                break
+            total -= size
+            try:
+                os.unlink(path)
+            except OSError:
+                continue  # another process evicted it first
+            self.stats.evicted += 1
+            self.stats.bytes_evicted += size
+
+
+def open_artifact_cache(directory: str | None = None, max_size: str | None = None) -> ArtifactCache | None:
+    """The cache in `directory` (default $SKILL_ARTIFACT_CACHE), or None when no directory is configured.
+
+    The size limit is `max_size`, else $SKILL_ARTIFACT_CACHE_SIZE, else 256M;
+    raises ValueError when it cannot be parsed.
+    """
+    directory = directory or os.environ.get(ARTIFACT_DIR_ENV)
+    if not directory:
+        return None
+    max_size = max_size or os.environ.get(ARTIFACT_SIZE_ENV)
+    return ArtifactCache(Path(directory), parse_size(max_size) if max_size else DEFAULT_MAX_BYTES)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Show or prune the shared artifact cache of generated skill files")
+    parser.add_argument("--artifact-cache", metavar="DIR", help=f"Cache directory (default: ${ARTIFACT_DIR_ENV})")
+    parser.add_argument(
+        "--artifact-cache-size", metavar="SIZE", help=f"Size limit, e.g. 512M (default: ${ARTIFACT_SIZE_ENV} or 256M)"
+    )
+    parser.add_argument("--prune", action="store_true", help="Evict least recently used artifacts down to the limit")
+    args = parser.parse_args()
+
+    try:
+        cache = open_artifact_cache(args.artifact_cache, args.artifact_cache_size)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    if cache is None:
+        print(f"no artifact cache configured; pass --artifact-cache or set {ARTIFACT_DIR_ENV}", file=sys.stderr)
+        return 1
+    if args.prune:
+        cache.evict(force=True)
+        print(f"evicted {cache.stats.evicted} artifacts ({cache.stats.bytes_evicted} bytes)")
+    stored = cache.usage()
+    print(f"{cache.root}: {len(stored)} artifacts, {sum(size for _, size, _ in stored)} of {cache.max_bytes} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
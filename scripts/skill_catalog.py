@@ -0,0 +1,292 @@
+"""
+Shared catalog of the skills tree, so each SKILL.md is read and parsed once.
+
+`SkillCatalog` scans the tree with skill_tree and keeps one `SkillEntry` per
+skill. An entry reads SKILL.md at most once, keeps its `MarkdownDocument`, and
+memoises values derived from SKILL.md and from each resource file, plus the
+size metrics of each resource and template, keyed on the file's mtime and size.
+Both generators take a catalog, and `sync_all.py` runs them in one process over
+the same catalog. `save()`/`load()` persist the memoised values, so later runs
+skip re-reading files that have not changed.
+The values are derived by update_skill_levels, so the persisted catalog is
+keyed on `generator_version()`, whichever generator saves it.
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Tuple, TypeVar
+
+from skill_io import read_text, trusted_mtime_ns, write_text
+from skill_markdown import MarkdownDocument, parse_markdown
+from skill_metrics import output_version, tokenizer_spec
+from skill_tree import FileMeta, SkillFiles, scan_skills
+
+ROOT = Path(__file__).resolve().parents[1]
+CATALOG_PATH = ROOT / ".cache/skills/catalog.json"
+CATALOG_FORMAT = 2
+# Modules whose code shapes the level generator's output (or the cached state behind it); editing any of
+# them invalidates the catalog, the level manifest and the artifacts rendered by update_skill_levels.
+GENERATOR_SOURCES = tuple(
+    Path(__file__).resolve().with_name(name)
+    for name in (
+        "update_skill_levels.py",
+        "skill_catalog.py",
+        "skill_export.py",
+        "skill_io.py",
+        "skill_markdown.py",
+        "skill_metrics.py",
+        "skill_templates.py",
+        "skill_tree.py",
+    )
+)
+
+T = TypeVar("T")
+Memo = List[object]  # [mtime_ns, size, value]; mtime_ns is 0 when it was too recent to trust
+
+
+_generator_version: Tuple[str, str] | None = None  # (tokenizer spec, version)
+
+
+def generator_version() -> str:
+    """Version of the code behind the level generator's output, hashed once per process and tokenizer."""
+    global _generator_version
+    spec = tokenizer_spec()
+    if _generator_version is None or _generator_version[0] != spec:
+        _generator_version = (spec, output_version(GENERATOR_SOURCES))
+    return _generator_version[1]
+
+
+def is_fresh(memo: Memo | None, meta: FileMeta | None) -> bool:
+    if memo is None or meta is None or not memo[0]:
+        return False
+    return memo[0] == meta.mtime_ns and memo[1] == meta.size
+
+
+def is_memo(value: object) -> bool:
+    return isinstance(value, list) and len(value) == 3 and isinstance(value[0], int) and isinstance(value[1], int)
+
+
+def make_memo(meta: FileMeta, value: object) -> Memo:
+    return [trusted_mtime_ns(meta.mtime_ns), meta.size, value]
+
+
+class SkillEntry:
+    __slots__ = ("files", "source", "topics", "sizes", "_data", "_doc")
+
+    def __init__(
+        self,
+        files: SkillFiles,
+        source: Memo | None = None,
+        topics: Dict[str, Memo] | None = None,
+        sizes: Dict[str, Memo] | None = None,
+    ) -> None:
+        self.files = files
+        self.source = source
+        self.topics = topics if topics is not None else {}
+        self.sizes = sizes if sizes is not None else {}  # "<subdir>/<name>" -> memo
+        self._data: bytes | None = None
+        self._doc: MarkdownDocument | None = None
+
+    # Entries travel to and from worker processes; the parsed document is rebuilt on demand.
+    def __getstate__(self) -> Tuple[object, ...]:
+        return self.files, self.source, self.topics, self.sizes, self._data
+
+    def __setstate__(self, state: Tuple[object, ...]) -> None:
+        self.files, self.source, self.topics, self.sizes, self._data = state
+        self._doc = None
+
+    def copy(self) -> SkillEntry:
+        """An entry with memo tables of its own, to fill in while this one stays readable elsewhere."""
+        entry = SkillEntry(self.files, self.source, dict(self.topics), dict(self.sizes))
+        entry._data = self._data
+        entry._doc = self._doc
+        return entry
+
+    @property
+    def name(self) -> str:
+        return self.files.name
+
+    def refresh(self, files: SkillFiles) -> None:
+        if files.skill_md != self.files.skill_md:
+            self._data = None
+            self._doc = None
+        self.files = files
+
+    def release(self) -> None:
+        """Drop the cached SKILL.md content and document; memoised values are kept."""
+        self._data = None
+        self._doc = None
+
+    def skill_md_bytes(self, keep: bool = True) -> bytes:
+        """SKILL.md as read from disk; with `keep=False` a fresh read is not cached on the entry."""
+        if self._data is not None:
+            return self._data
+        data = (self.files.path / "SKILL.md").read_bytes()
+        if keep:
+            self._data = data
+        return data
+
+    def skill_md_text(self) -> str:
+        """SKILL.md decoded with universal newlines, as `Path.read_text()` would return it."""
+        text = self.skill_md_bytes().decode("utf-8")
+        return text.replace("\r\n", "\n").replace("\r", "\n") if "\r" in text else text
+
+    def document(self) -> MarkdownDocument:
+        if self._doc is None:
+            self._doc = parse_markdown(self.skill_md_text())
+        return self._doc
+
+    def source_is_fresh(self) -> bool:
+        return is_fresh(self.source, self.files.skill_md)
+
+    def derived_source(self, build: Callable[[MarkdownDocument], T]) -> T:
+        """`build(document)` for SKILL.md, reused while its mtime and size are unchanged."""
+        meta = self.files.skill_md
+        if self.source_is_fresh():
+            return self.source[2]
+        value = build(self.document())
+        if meta is not None:
+            self.source = make_memo(meta, value)
+        return value
+
+    def resource_topics(self, name: str, extract: Callable[[Path], T]) -> T:
+        """`extract(path)` for resources/<name>, reused while the file is unchanged."""
+        meta = self.files.find("resources", name)
+        memo = self.topics.get(name)
+        if is_fresh(memo, meta):
+            return memo[2]
+        value = extract(self.files.path / "resources" / name)
+        if meta is not None:
+            self.topics[name] = make_memo(meta, value)
+        return value
+
+    def file_metrics(self, rel_path: str, measure: Callable[[Path], T]) -> T:
+        """`measure(path)` for the resource or template at `rel_path`, reused while the file is unchanged."""
+        sub, _, name = rel_path.partition("/")
+        meta = self.files.find(sub, name)
+        memo = self.sizes.get(rel_path)
+        if is_fresh(memo, meta):
+            return memo[2]
+        value = measure(self.files.path / rel_path)
+        if meta is not None and value is not None:
+            self.sizes[rel_path] = make_memo(meta, value)
+        return value
+
+    def record_write(self, rel_parts: Tuple[str, ...], data: bytes) -> None:
+        """Update the listing and cached content after a generator wrote a file of this skill."""
+        path = self.files.path.joinpath(*rel_parts)
+        try:
+            st = os.stat(path)
+        except OSError:
+            return
+        meta = FileMeta(rel_parts[-1], st.st_mtime_ns, st.st_size)
+        if rel_parts == ("SKILL.md",):
+            self.files = self.files._replace(skill_md=meta)
+            self._data = data
+            self._doc = None
+        elif len(rel_parts) == 2 and rel_parts[0] in self.files.dirs:
+            sub, name = rel_parts
+            metas = [existing for existing in self.files.dirs[sub] if existing.name != name]
+            metas.append(meta)
+            metas.sort()
+            self.files.dirs[sub] = metas
+
+
+class SkillCatalog:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.entries: Dict[str, SkillEntry] = {}
+        self._stored: Dict[str, Tuple[Memo | None, Dict[str, Memo], Dict[str, Memo]]] = {}
+
+    def scan(self, names: Iterable[str] | None = None) -> List[SkillEntry]:
+        """(Re)scan `names` (None = every skill) and return their entries sorted by name."""
+        names = None if names is None else sorted(set(names))
+        scanned = scan_skills(self.root, names)
+        found = {files.name for files in scanned}
+        for name in list(self.entries) if names is None else names:
+            if name not in found:
+                self.entries.pop(name, None)
+        result: List[SkillEntry] = []
+        for files in scanned:
+            entry = self.entries.get(files.name)
+            if entry is None:
+                source, topics, sizes = self._stored.pop(files.name, (None, None, None))
+                entry = self.entries[files.name] = SkillEntry(files, source, topics, sizes)
+            else:
+                entry.refresh(files)
+            result.append(entry)
+        if names is None:
+            self._stored.clear()  # whatever is left belongs to skills that no longer exist
+        return result
+
+    def get(self, name: str) -> SkillEntry | None:
+        entry = self.entries.get(name)
+        if entry is None:
+            scanned = self.scan([name])
+            entry = scanned[0] if scanned else None
+        return entry
+
+    def sorted_entries(self) -> List[SkillEntry]:
+        return [self.entries[name] for name in sorted(self.entries)]
+
+    def update(self, entry: SkillEntry) -> None:
+        """Adopt an entry that was filled in by a worker process."""
+        self.entries[entry.name] = entry
+
+    def record_writes(self, written: Iterable[Tuple[Path, bytes]]) -> None:
+        for path, data in written:
+            try:
+                parts = path.relative_to(self.root).parts
+            except ValueError:
+                continue
+            entry = self.entries.get(parts[0]) if parts else None
+            if entry is not None and len(parts) > 1:
+                entry.record_write(parts[1:], data)
+
+    def load(self, path: Path, version: str) -> None:
+        import json
+
+        try:
+            data = json.loads(read_text(path))
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("format") != CATALOG_FORMAT or data.get("version") != version:
+            return
+        skills = data.get("skills")
+        if not isinstance(skills, dict):
+            return
+        for name, stored in skills.items():
+            if not isinstance(stored, list) or len(stored) != 3:
+                continue
+            if not isinstance(stored[1], dict) or not isinstance(stored[2], dict):
+                continue
+            source, topics, sizes = stored
+            self._stored[name] = (
+                source if is_memo(source) else None,
+                {res: memo for res, memo in topics.items() if is_memo(memo)},
+                {rel_path: memo for rel_path, memo in sizes.items() if is_memo(memo)},
+            )
+
+    def save(self, path: Path, version: str) -> None:
+        import json
+
+        skills: Dict[str, List[object]] = {}
+        for name, entry in sorted(self.entries.items()):
+            resources = set(entry.files.names("resources"))
+            listed = {f"{sub}/{file}" for sub in ("resources", "templates") for file in entry.files.names(sub)}
+            skills[name] = [
+                entry.source,
+                {res: memo for res, memo in entry.topics.items() if res in resources},
+                {rel_path: memo for rel_path, memo in entry.sizes.items() if rel_path in listed},
+            ]
+        # Skills this run did not scan keep what was loaded for them.
+        for name, stored in self._stored.items():
+            skills.setdefault(name, list(stored))
+        content = json.dumps(
+            {"format": CATALOG_FORMAT, "version": version, "skills": skills},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_text(path, content + "\n")
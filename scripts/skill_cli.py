@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Fast-start entry point for the skill generators (git hooks and other frequent callers).
+
+    python3 scripts/skill_cli.py levels [update_skill_levels.py options]
+    python3 scripts/skill_cli.py sync [sync_requirements_to_skills.py options]
+    python3 scripts/skill_cli.py all [sync_all.py options]
+    python3 scripts/skill_cli.py query [skill_topics.py options] TERMS...
+    python3 scripts/skill_cli.py cache [skill_artifacts.py options]
+    python3 scripts/skill_cli.py worker [skill_worker.py options]
+
+Python compiles the script it is started with from source on every run, while
+imported modules load from cached bytecode. This stub stays small and imports
+only the module of the requested command, so a run skips compiling the large
+generator scripts and never loads the other command's modules.
+"""
+import sys
+
+COMMANDS = {
+    "levels": "update_skill_levels",
+    "sync": "sync_requirements_to_skills",
+    "all": "sync_all",
+    "query": "skill_topics",
+    "cache": "skill_artifacts",
+    "worker": "skill_worker",
+}
+
+
+def main() -> int:
+    if len(sys.argv) < 2 or sys.argv[1] not in COMMANDS:
+        wants_help = len(sys.argv) > 1 and sys.argv[1] in ("-h", "--help")
+        print(f"usage: skill_cli.py {{{','.join(COMMANDS)}}} [options]", file=sys.stdout if wants_help else sys.stderr)
+        return 0 if wants_help else 2
+    command = sys.argv.pop(1)
+    module = __import__(COMMANDS[command])
+    sys.argv[0] = f"skill_cli.py {command}"
+    return module.main()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,215 @@
+"""
+Consolidated, machine-readable manifest of the generated skill files.
+
+Both generators record what they produce for each skill into a `SkillExport`:
+the level generator its summary, topic keywords, classified scripts, templates,
+the size metrics of its resources and templates (see skill_metrics) and the
+layout of Level1-4, the requirement sync the requirement docs it lists (whose
+titles, summaries and size metrics are stored once, at the top level) and the
+layout of requirements-index.md. A layout is the file's size plus the
+byte offset of every heading, so consumers can seek straight to a section.
+`save()` writes the whole catalog as one compact JSON file, so consumers, Node
+or Python, load every skill with one read instead of walking and parsing the
+tree. When another process saved the file since it was loaded, `save()` merges
+into that copy only what this process recorded, so concurrent runs (say, a
+watcher and a one-off generator) keep each other's work; `save_export()` holds
+a lock in .cache/skills while it merges and writes.
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Set, Tuple
+
+from skill_io import file_lock, read_text, write_text
+
+if TYPE_CHECKING:
+    from skill_metrics import SizeCache
+
+ROOT = Path(__file__).resolve().parents[1]
+EXPORT_NAME = "skills-manifest.json"
+EXPORT_PATH = ROOT / ".claude/skills" / EXPORT_NAME
+EXPORT_LOCK_PATH = ROOT / ".cache/skills/skills-manifest.lock"
+EXPORT_FORMAT = 1
+
+SkillRecord = Dict[str, object]
+
+
+def file_layout(data: bytes) -> List[object]:
+    """[size, [[depth, title, offset], ...]] for the Markdown headings of a generated file."""
+    headings: List[List[object]] = []
+    offset = 0
+    for line in data.split(b"\n"):
+        if line.startswith(b"#"):
+            title = line.lstrip(b"#")
+            if title.startswith(b" "):
+                headings.append([len(line) - len(title), title.strip().decode("utf-8"), offset])
+        offset += len(line) + 1
+    return [len(data), headings]
+
+
+class SkillExport:
+    """Per-skill records keyed by skill name, plus the requirement docs they reference.
+
+    Each generator only updates the fields it owns, so a run that touches some
+    skills (or only one generator) keeps what earlier runs recorded for the rest.
+    `changed` collects the skills updated or removed since `load()`, so derived
+    indexes can be refreshed for just those skills. The fields and docs recorded
+    since the last save are tracked separately, for `save()` to merge.
+    """
+
+    def __init__(self) -> None:
+        self.skills: Dict[str, SkillRecord] = {}
+        self.docs: Dict[str, List[str]] = {}  # doc path -> [title, summary]
+        self.doc_sizes: Dict[str, List[object]] = {}  # doc path -> metrics
+        self.tokenizer: str | None = None  # the tokenizer the stored metrics were counted with
+        self.changed: Set[str] = set()
+        self.stamp: Tuple[int, int] | None = None  # mtime_ns and size of the file it was loaded from
+        # skill -> fields recorded since the last save (layouts as ("files", path)); None when the record is all ours
+        self._touched: Dict[str, Set[object] | None] = {}
+        self._touched_docs: Set[str] | None = set()  # None once the docs were replaced wholesale
+
+    def has(self, name: str, field: str) -> bool:
+        return field in self.skills.get(name, ())
+
+    def update(self, name: str, record: SkillRecord) -> None:
+        """Merge `record` into the skill's entry; "files" layouts are merged per file."""
+        self.changed.add(name)
+        entry = self.skills.setdefault(name, {})
+        touched = self._touched.setdefault(name, set())
+        for field, value in record.items():
+            if field == "files":
+                entry.setdefault("files", {}).update(value)
+                if touched is not None:
+                    touched.update(("files", path) for path in value)
+            else:
+                entry[field] = value
+                if touched is not None:
+                    touched.add(field)
+
+    def retain(self, names: Iterable[str]) -> None:
+        """Drop skills that are not in `names` (skills that no longer exist)."""
+        keep = set(names)
+        for name in [name for name in self.skills if name not in keep]:
+            self.remove(name)
+
+    def remove(self, name: str) -> None:
+        if self.skills.pop(name, None) is not None:
+            self.changed.add(name)
+            self._touched[name] = None
+
+    def update_docs(self, docs: Dict[str, List[str]], sizes: Dict[str, List[object]], replace: bool = False) -> None:
+        """Record requirement docs (path -> [title, summary]) and their metrics; `replace` drops every other doc."""
+        if replace:
+            self.docs = {}
+            self.doc_sizes = {}
+            self._touched_docs = None
+        elif self._touched_docs is not None:
+            self._touched_docs.update(docs)
+        self.docs.update(docs)
+        self.doc_sizes.update(sizes)
+
+    def stored_sizes(self) -> Iterator[object]:
+        for record in self.skills.values():
+            yield from record.get("sizes", {}).values()
+        yield from self.doc_sizes.values()
+
+    def seed_sizes(self, cache: SizeCache) -> None:
+        """Hand the stored metrics to `cache` if they were counted with its tokenizer, and adopt that tokenizer."""
+        if self.tokenizer == cache.spec:
+            cache.seed(self.stored_sizes())
+        self.tokenizer = cache.spec
+
+    def as_dict(self) -> Dict[str, object]:
+        return {
+            "format": EXPORT_FORMAT,
+            "skills": self.skills,
+            "docs": self.docs,
+            "doc_sizes": self.doc_sizes,
+            "tokenizer": self.tokenizer,
+        }
+
+    def load(self, path: Path) -> None:
+        import json
+
+        try:
+            st = os.stat(path)
+            data = json.loads(read_text(path))
+        except (OSError, ValueError):
+            return
+        if not isinstance(data, dict) or data.get("format") != EXPORT_FORMAT:
+            return
+        self.stamp = (st.st_mtime_ns, st.st_size)
+        skills, docs, doc_sizes = data.get("skills"), data.get("docs"), data.get("doc_sizes")
+        if isinstance(skills, dict):
+            self.skills = {name: record for name, record in skills.items() if isinstance(record, dict)}
+        if isinstance(docs, dict):
+            self.docs = docs
+        if isinstance(doc_sizes, dict):
+            self.doc_sizes = doc_sizes
+        tokenizer = data.get("tokenizer")
+        self.tokenizer = tokenizer if isinstance(tokenizer, str) else None
+
+    def merge_saved(self, path: Path) -> None:
+        """Adopt the manifest another process saved to `path`, keeping what this process recorded since then."""
+        saved = SkillExport()
+        saved.load(path)
+        if saved.stamp is None:
+            return
+        for name, touched in self._touched.items():
+            record = self.skills.get(name)
+            if touched is None or name not in saved.skills:
+                if record is None:
+                    saved.skills.pop(name, None)
+                else:
+                    saved.skills[name] = record
+                continue
+            entry = saved.skills[name]
+            for field in touched:
+                if isinstance(field, tuple):
+                    entry.setdefault("files", {})[field[1]] = record["files"][field[1]]
+                else:
+                    entry[field] = record[field]
+        if self._touched_docs is None:
+            saved.docs, saved.doc_sizes = self.docs, self.doc_sizes
+        else:
+            for doc in self._touched_docs:
+                saved.docs[doc] = self.docs[doc]
+                if doc in self.doc_sizes:
+                    saved.doc_sizes[doc] = self.doc_sizes[doc]
+        self.skills, self.docs, self.doc_sizes = saved.skills, saved.docs, saved.doc_sizes
+        if saved.tokenizer != self.tokenizer:
+            self.tokenizer = None  # metrics counted with two tokenizers; later runs must not trust them
+        self.stamp = saved.stamp
+
+    def save(self, path: Path) -> None:
+        """Write the JSON manifest.
+
+        If the file changed since it was loaded (or last saved), the saved copy is
+        merged in first (see `merge_saved()`), so other processes' records survive.
+        """
+        import json
+
+        try:
+            st = os.stat(path)
+        except OSError:
+            pass
+        else:
+            if (st.st_mtime_ns, st.st_size) != self.stamp:
+                self.merge_saved(path)
+        self._touched = {}
+        self._touched_docs = set()
+        data = self.as_dict()
+        content = json.dumps(data, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_text(path, content + "\n")
+
+
+def save_export(export: SkillExport) -> None:
+    """Save `export` to skills-manifest.json and bring the topic index up to date."""
+    from skill_topics import TOPIC_INDEX_PATH, update_topic_index
+
+    with file_lock(EXPORT_LOCK_PATH):
+        export.save(EXPORT_PATH)
+        update_topic_index(TOPIC_INDEX_PATH, EXPORT_PATH, export)
+
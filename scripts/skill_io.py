@@ -0,0 +1,307 @@
+"""
+File I/O helpers shared by the skill generator scripts.
+
+`write_text()` only touches disk when the content actually changes: it compares
+the size first, then a streamed hash of the existing file, and writes changed
+files atomically through a temp file in the same directory plus `os.replace`.
+`WriteBatch` plans several such writes and commits them as one unit.
+`file_lock()` serialises read-modify-write cycles on files shared between processes.
+"""
+from __future__ import annotations
+
+import hashlib
+import marshal
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Sequence, Tuple, TypeVar
+
+CHUNK_SIZE = 64 * 1024
+
+# Files whose mtime is this close to the time it was recorded may be edited again
+# within the same timestamp tick, so they are verified by content hash on the next run.
+RACY_MTIME_NS = 2_000_000_000
+
+_umask: int | None = None
+
+
+def marshal_header(name: str, version: int) -> Tuple[object, ...]:
+    """Header identifying a marshal snapshot.
+
+    marshal's format follows the interpreter, so the header carries the marshal
+    and Python versions and a snapshot is only read back by the version that wrote it.
+    """
+    return (name, version, marshal.version, tuple(sys.version_info[:2]))
+
+
+def is_racy_mtime(mtime_ns: int) -> bool:
+    return time.time_ns() - mtime_ns < RACY_MTIME_NS
+
+
+def trusted_mtime_ns(mtime_ns: int) -> int:
+    """`mtime_ns` to record for a cache entry: 0 (never trusted) when it is racy, so the entry is rehashed."""
+    return 0 if is_racy_mtime(mtime_ns) else mtime_ns
+
+
+class WriteStats:
+    __slots__ = ("written", "unchanged", "skipped", "bytes_written", "bytes_avoided")
+
+    def __init__(self) -> None:
+        self.written = 0
+        self.unchanged = 0
+        self.skipped = 0
+        self.bytes_written = 0
+        self.bytes_avoided = 0
+
+    def merge(self, other: "WriteStats") -> None:
+        for name in self.__slots__:
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+
+    def skip(self, count: int = 1) -> None:
+        self.skipped += count
+
+    def summary(self) -> str:
+        return (
+            f"written {self.written}, unchanged {self.unchanged}, skipped {self.skipped} files "
+            f"({self.bytes_written} bytes written, {self.bytes_avoided} bytes not rewritten)"
+        )
+
+
+def source_version(paths: Iterable[Path]) -> str:
+    """Short hash of generator source files, used to invalidate caches when the code changes."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def map_io(func: Callable[[T], R], items: Sequence[T], threads: int) -> List[R]:
+    """`[func(item) for item in items]`, spread over `threads` threads when it is above 0.
+
+    Meant for calls that mostly wait on the filesystem, where overlapping them
+    hides per-file latency; results keep the order of `items`.
+    """
+    if threads <= 0 or len(items) <= 1:
+        return [func(item) for item in items]
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=min(threads, len(items))) as pool:
+        return list(pool.map(func, items))
+
+
+def read_text(path: Path) -> str:
+    return path.read_text(encoding="utf-8")
+
+
+def iter_text_lines(path: Path, budget: int) -> Iterator[str]:
+    """Yield the lines of a UTF-8 file, reading at most `budget` bytes from disk."""
+    with open(path, "rb") as handle:
+        remaining = budget
+        while remaining > 0:
+            raw = handle.readline(remaining)
+            if not raw:
+                return
+            remaining -= len(raw)
+            if remaining <= 0 and not raw.endswith(b"\n"):
+                return  # line cut off by the budget
+            yield from raw.decode("utf-8").splitlines()
+
+
+def file_digest(path: Path) -> bytes:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def is_unchanged(path: Path, data: bytes) -> bool:
+    try:
+        if os.stat(path).st_size != len(data):
+            return False
+        return file_digest(path) == hashlib.sha256(data).digest()
+    except OSError:
+        return False
+
+
+def default_mode() -> int:
+    global _umask
+    if _umask is None:
+        _umask = os.umask(0)
+        os.umask(_umask)
+    return 0o666 & ~_umask
+
+
+def unlink_quietly(path: str | Path) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def write_temp(path: Path, data: bytes, sync: bool = False) -> str:
+    """Write `data` to a temp file next to `path` with the mode `path` has (or would get)."""
+    try:
+        mode = os.stat(path).st_mode & 0o7777
+    except OSError:
+        mode = default_mode()
+    import tempfile
+
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+            if sync:
+                handle.flush()
+                os.fsync(handle.fileno())
+        os.chmod(tmp_name, mode)
+    except BaseException:
+        unlink_quietly(tmp_name)
+        raise
+    return tmp_name
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    tmp_name = write_temp(path, data)
+    try:
+        os.replace(tmp_name, path)
+    except BaseException:
+        unlink_quietly(tmp_name)
+        raise
+
+
+def fsync_dir(path: Path) -> None:
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def file_lock(path: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock on `path`, created if needed; without fcntl (Windows) this does not lock."""
+    try:
+        import fcntl
+    except ImportError:
+        yield
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)  # releases the lock
+
+
+def write_text(path: Path, content: str, stats: WriteStats | None = None, dry_run: bool = False) -> bool:
+    """Write `content` unless identical; returns True when the file was (or would be) changed."""
+    return write_bytes(path, content.encode("utf-8"), stats, dry_run)
+
+
+def write_bytes(path: Path, data: bytes, stats: WriteStats | None = None, dry_run: bool = False) -> bool:
+    if is_unchanged(path, data):
+        if stats is not None:
+            stats.unchanged += 1
+            stats.bytes_avoided += len(data)
+        return False
+    if dry_run:
+        if stats is not None:
+            stats.skip()
+        return True
+    atomic_write_bytes(path, data)
+    if stats is not None:
+        stats.written += 1
+        stats.bytes_written += len(data)
+    return True
+
+
+class WriteBatch:
+    """File writes planned in memory and committed together.
+
+    `commit()` writes and fsyncs every pending file to a temp file beside its
+    target before renaming any of them into place, then fsyncs each touched
+    directory once. If anything fails or is interrupted, files already replaced
+    are restored to their previous contents (or removed if they are new), so a
+    run either lands completely or leaves the tree as it was.
+    """
+
+    def __init__(self) -> None:
+        self.changes: List[Tuple[Path, bytes, bytes | None]] = []  # path, new data, previous data
+
+    def __len__(self) -> int:
+        return len(self.changes)
+
+    def add(
+        self, path: Path, content: str | bytes, stats: WriteStats | None = None, current: bytes | None = None
+    ) -> bool:
+        """Plan a write of `content` unless the file already holds it; `current` skips re-reading it."""
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        if current is None:
+            try:
+                current = path.read_bytes()
+            except FileNotFoundError:
+                current = None
+        if current == data:
+            if stats is not None:
+                stats.unchanged += 1
+                stats.bytes_avoided += len(data)
+            return False
+        self.changes.append((path, data, current))
+        return True
+
+    def diff(self, base: Path | None = None) -> Iterator[str]:
+        """Unified diff of the pending changes, with paths relative to `base` when given."""
+        import difflib
+
+        for path, data, previous in self.changes:
+            name = path.relative_to(base).as_posix() if base is not None else str(path)
+            old = previous.decode("utf-8").splitlines(keepends=True) if previous is not None else []
+            yield from difflib.unified_diff(
+                old,
+                data.decode("utf-8").splitlines(keepends=True),
+                fromfile=f"a/{name}" if previous is not None else "/dev/null",
+                tofile=f"b/{name}",
+            )
+
+    def commit(self, stats: WriteStats | None = None) -> List[Tuple[Path, bytes]]:
+        """Apply the batch; returns the (path, data) pairs that were written."""
+        staged: List[Tuple[Path, str]] = []
+        replaced: List[Tuple[Path, bytes | None]] = []
+        try:
+            for path, data, _ in self.changes:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                staged.append((path, write_temp(path, data, sync=True)))
+            for (path, tmp_name), (_, _, previous) in zip(staged, self.changes):
+                os.replace(tmp_name, path)
+                replaced.append((path, previous))
+        except BaseException:
+            for path, tmp_name in staged[len(replaced) :]:
+                unlink_quietly(tmp_name)
+            for path, previous in reversed(replaced):
+                if previous is None:
+                    unlink_quietly(path)
+                else:
+                    atomic_write_bytes(path, previous)
+            raise
+        for directory in {path.parent for path, _, _ in self.changes}:
+            fsync_dir(directory)
+        written = [(path, data) for path, data, _ in self.changes]
+        if stats is not None:
+            for _, data in written:
+                stats.written += 1
+                stats.bytes_written += len(data)
+        self.changes.clear()
+        return written
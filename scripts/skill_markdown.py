@@ -0,0 +1,148 @@
+"""
+Single-pass Markdown tokenizer for SKILL.md and resource documents.
+
+`parse_markdown()` splits the text once, indexes headings, section boundaries
+and frontmatter keys, and serves every lookup the generators need from that
+index. `Frontmatter` is the shared, editable model of the YAML frontmatter.
+Lookups keep the exact results of the regexes they replace, e.g. `section()`
+behaves like `^##\\s+<title>\\n(.*?)(?=\\n##\\s|\\Z)` (re.S | re.M) followed
+by `strip()`, without rescanning or backtracking over the document.
+"""
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from itertools import chain
+from typing import Dict, List, Tuple
+
+KEY_PATTERN = re.compile(r"\w[\w-]*:")
+# A literal "\n#" prefix lets the regex engine skip ahead instead of testing `^` at every offset.
+HEADING_PATTERN = re.compile(r"\n(#+)(.*)")
+FIRST_HEADING_PATTERN = re.compile(r"(#+)(.*)")
+
+
+class Frontmatter:
+    """YAML frontmatter as top-level `key:` lines, editable in place.
+
+    Lines are split once and every key line is indexed, so lookups are dict
+    hits. `replace_lines()` is a single slice assignment, and `render()`
+    rebuilds the document around the original text, so everything outside the
+    edited lines is reproduced byte for byte.
+    """
+
+    __slots__ = ("text", "lines", "_end", "_keys")
+
+    def __init__(self, text: str) -> None:
+        lines: List[str] = []
+        end = -1
+        if text.startswith("---\n"):
+            end = text.find("\n---\n", 4)
+            if end != -1:
+                lines = text[4:end].split("\n")
+        keys: Dict[str, List[int]] = {}
+        for index, line in enumerate(lines):
+            match = KEY_PATTERN.match(line)
+            if match:
+                keys.setdefault(match.group(0)[:-1], []).append(index)
+        self.text = text
+        self.lines = lines
+        self._end = end
+        self._keys = keys
+
+    def __bool__(self) -> bool:
+        return self._end != -1
+
+    def field(self, key: str) -> str:
+        """Value of a `key: value` line, like `^key:\\s*(.+)$` (re.M) plus strip."""
+        lines = self.lines
+        for index in self._keys.get(key, ()):
+            value = lines[index][len(key) + 1 :].strip()
+            if value:
+                return value
+            for line in lines[index + 1 :]:
+                if line.strip():
+                    return line.strip()
+        return ""
+
+    def block(self, key: str) -> str:
+        """Body of a `key: |` block, like `^key:\\s*\\|\\n(.*?)(?=\\n\\w[\\w-]*:|\\n$)`."""
+        lines = self.lines
+        last = len(lines) - 1
+        for index in self._keys.get(key, ()):
+            if lines[index][len(key) + 1 :].lstrip() != "|" or index >= last:
+                continue
+            for end in range(index + 2, last + 1):
+                line = lines[end]
+                if not line or KEY_PATTERN.match(line):
+                    return "\n".join(lines[index + 1 : end]).rstrip()
+            return ""
+        return ""
+
+    def block_range(self, key: str, opener: str = "") -> Tuple[int, int] | None:
+        """Line range of the first line starting with `key:` + `opener` plus the indented or blank lines after it."""
+        lines = self.lines
+        prefix = f"{key}:{opener}"
+        start = next((index for index in self._keys.get(key, ()) if lines[index].startswith(prefix)), None)
+        if start is None:
+            return None
+        end = start + 1
+        while end < len(lines) and (not lines[end] or lines[end].startswith(" ")):
+            end += 1
+        return start, end
+
+    def replace_lines(self, start: int, end: int, new_lines: List[str]) -> None:
+        self.lines[start:end] = new_lines
+        shift = len(new_lines) - (end - start)
+        if shift:
+            for indexes in self._keys.values():
+                indexes[:] = [index + shift if index >= end else index for index in indexes]
+
+    def render(self) -> str:
+        """The whole document with the (possibly edited) frontmatter lines."""
+        if self._end == -1:
+            return self.text
+        return self.text[:4] + "\n".join(self.lines) + self.text[self._end :]
+
+
+class MarkdownDocument:
+    __slots__ = ("text", "frontmatter", "_headings", "_stops")
+
+    def __init__(self, text: str) -> None:
+        length = len(text)
+        headings: Dict[Tuple[int, str], int] = {}
+        stops: Dict[int, List[int]] = {}
+        first = FIRST_HEADING_PATTERN.match(text)
+        matches = HEADING_PATTERN.finditer(text)
+        for match in chain((first,), matches) if first else matches:
+            level = len(match.group(1))
+            rest = match.group(2)
+            line_start = match.start(1)
+            terminated = match.end() < length
+            if rest[:1].isspace():
+                stops.setdefault(level, []).append(line_start)
+                if terminated:
+                    headings.setdefault((level, rest.lstrip()), match.end() + 1)
+            elif not rest and terminated:
+                stops.setdefault(level, []).append(line_start)
+        self.text = text
+        self.frontmatter = Frontmatter(text)
+        self._headings = headings
+        self._stops = stops
+
+    def section(self, title: str, level: int = 2) -> str:
+        start = self._headings.get((level, title))
+        if start is None:
+            return ""
+        stops = self._stops[level]
+        # The regex needs at least one body line before the next heading can end it.
+        position = bisect_right(stops, start)
+        end = stops[position] - 1 if position < len(stops) else len(self.text)
+        return self.text[start:end].strip()
+
+
+def parse_markdown(text: str) -> MarkdownDocument:
+    return MarkdownDocument(text)
+
+
+def parse_frontmatter(text: str) -> Frontmatter:
+    return Frontmatter(text)
@@ -0,0 +1,152 @@
+"""
+Size metrics for progressive-disclosure loading.
+
+`measure()` reports the bytes, lines and approximate token count of a file,
+plus the same figures for every Markdown section (a heading up to the next
+heading of the same or a higher level), so agents can pick what to load within
+a token budget without opening the files first.
+
+Token counts come from a pluggable local tokenizer named by the
+`SKILL_TOKENIZER` environment variable: "approx" (the default) estimates four
+ASCII characters per token and one token per other character; "module:function"
+imports `function(text) -> int` from `module`, e.g. a wrapper around a BPE
+tokenizer. The variable is read from the environment so worker processes pick
+up the same tokenizer as the parent.
+
+`SizeCache` memoises metrics by the sha256 of the content. The metrics carry
+their digest and are persisted in skills-manifest.json, which seeds the cache
+on the next run, so unchanged content is never tokenized again.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List
+
+from skill_io import source_version
+
+TOKENIZER_ENV = "SKILL_TOKENIZER"
+APPROX_TOKENIZER = "approx"
+
+Metrics = List[object]  # [sha256 hex, bytes, lines, tokens, sections]
+Section = List[object]  # [depth, title, offset, bytes, lines, tokens]
+
+
+def approx_tokens(text: str) -> int:
+    """Four ASCII characters per token, one token per other character (CJK text runs close to that)."""
+    chars = len(text)
+    # Characters outside ASCII take 2-4 bytes in UTF-8; Japanese text is almost all 3-byte.
+    other = (len(text.encode("utf-8")) - chars + 1) // 2
+    return (chars - other + 3) // 4 + other
+
+
+def tokenizer_spec() -> str:
+    return os.environ.get(TOKENIZER_ENV) or APPROX_TOKENIZER
+
+
+def output_version(sources: Iterable[Path]) -> str:
+    """Hash of the code in `sources`; a tokenizer other than the default is part of the version."""
+    version = source_version(sources)
+    spec = tokenizer_spec()
+    return version if spec == APPROX_TOKENIZER else f"{version}+{spec}"
+
+
+def load_tokenizer(spec: str) -> Callable[[str], int]:
+    if spec == APPROX_TOKENIZER:
+        return approx_tokens
+    module_name, _, func_name = spec.partition(":")
+    if not module_name or not func_name:
+        raise ValueError(f"{TOKENIZER_ENV} must be {APPROX_TOKENIZER!r} or 'module:function', got {spec!r}")
+    import importlib
+
+    try:
+        return getattr(importlib.import_module(module_name), func_name)
+    except (ImportError, AttributeError) as exc:
+        raise ValueError(f"cannot load tokenizer {spec!r}: {exc}") from None
+
+
+def count_lines(data: bytes) -> int:
+    return data.count(b"\n") + (1 if data and not data.endswith(b"\n") else 0)
+
+
+def measure(data: bytes, count_tokens: Callable[[str], int], digest: str = "", markdown: bool = True) -> Metrics:
+    """Metrics for `data`; with `markdown`, also for each section.
+
+    Text is tokenized once per heading-delimited segment; file and section
+    totals are sums of segments.
+    """
+    # Segments start at offset 0 and at every heading line: (depth, title, offset).
+    starts: List[tuple] = [(0, "", 0)]
+    if markdown:
+        offset = 0
+        for line in data.split(b"\n"):
+            if line.startswith(b"#"):
+                title = line.lstrip(b"#")
+                if title.startswith(b" "):
+                    starts.append((len(line) - len(title), title.strip().decode("utf-8", "replace"), offset))
+            offset += len(line) + 1
+        if len(starts) > 1 and starts[1][2] == 0:
+            del starts[0]  # no text before the first heading
+    ends = [start[2] for start in starts[1:]] + [len(data)]
+    segments = []
+    for (depth, title, start), end in zip(starts, ends):
+        chunk = data[start:end]
+        tokens = count_tokens(chunk.decode("utf-8", "replace"))
+        segments.append((depth, title, start, end, count_lines(chunk), tokens))
+
+    sections: List[Section] = []
+    for index, (depth, title, start, end, lines, tokens) in enumerate(segments):
+        if not depth:
+            continue  # text before the first heading
+        for nested in segments[index + 1 :]:
+            if nested[0] <= depth:
+                break
+            end, lines, tokens = nested[3], lines + nested[4], tokens + nested[5]
+        sections.append([depth, title, start, end - start, lines, tokens])
+    total_tokens = sum(segment[5] for segment in segments)
+    return [digest, len(data), count_lines(data), total_tokens, sections]
+
+
+def format_size(metrics: Metrics) -> str:
+    return f"約{metrics[3]:,}トークン / {metrics[2]:,}行"
+
+
+class SizeCache:
+    """Metrics by content hash for one tokenizer."""
+
+    def __init__(self, spec: str | None = None) -> None:
+        self.spec = spec or tokenizer_spec()
+        self.count_tokens = load_tokenizer(self.spec)
+        self.known: Dict[str, Metrics] = {}
+
+    def seed(self, metrics: Iterable[object]) -> None:
+        """Remember previously computed metrics (as stored in the manifest)."""
+        for value in metrics:
+            if isinstance(value, list) and len(value) == 5 and isinstance(value[0], str) and value[0]:
+                self.known[value[0]] = value
+
+    def measure_bytes(self, data: bytes, markdown: bool = True, digest: str = "") -> Metrics:
+        digest = digest or hashlib.sha256(data).hexdigest()
+        metrics = self.known.get(digest)
+        if metrics is None:
+            metrics = self.known[digest] = measure(data, self.count_tokens, digest, markdown)
+        return metrics
+
+    def measure_file(self, path: Path) -> Metrics | None:
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        return self.measure_bytes(data, markdown=path.suffix == ".md")
+
+
+_cache: SizeCache | None = None
+
+
+def size_cache() -> SizeCache:
+    """The process-wide cache for the configured tokenizer."""
+    global _cache
+    if _cache is None or _cache.spec != tokenizer_spec():
+        _cache = SizeCache()
+    return _cache
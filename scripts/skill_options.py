@@ -0,0 +1,73 @@
+"""
+Command-line options shared by the skill generators.
+
+update_skill_levels.py, sync_requirements_to_skills.py and sync_all.py take the
+same streaming, artifact cache, timing and profiling options.
+`add_common_arguments()` defines them, `open_caches()` acts on them before a
+run and `finish_run()` evicts and reports once it is done.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from skill_artifacts import ARTIFACT_DIR_ENV, ARTIFACT_SIZE_ENV, ArtifactCache, open_artifact_cache
+from skill_metrics import size_cache
+from skill_timings import Timings
+
+
+def add_common_arguments(parser: argparse.ArgumentParser, stream_help: str, profiling: bool = True) -> None:
+    """Add the shared options; `stream_help` says what --stream does for this generator.
+
+    `profiling=False` leaves out --profile and --flamegraph.
+    """
+    parser.add_argument("--stream", action="store_true", help=stream_help)
+    parser.add_argument(
+        "--artifact-cache",
+        metavar="DIR",
+        help=f"Restore and publish generated files through a shared cache in DIR (default: ${ARTIFACT_DIR_ENV})",
+    )
+    parser.add_argument(
+        "--artifact-cache-size",
+        metavar="SIZE",
+        help=f"Evict least recently used artifacts beyond SIZE, e.g. 512M (default: ${ARTIFACT_SIZE_ENV} or 256M)",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Report wall time and call counts per stage, plus the slowest skills and files",
+    )
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest skills/files to report")
+    if profiling:
+        parser.add_argument("--profile", type=Path, metavar="FILE", help="Write cProfile stats (pstats format) to FILE")
+        parser.add_argument(
+            "--flamegraph",
+            type=Path,
+            metavar="FILE",
+            help="Write sampled collapsed stacks (flamegraph.pl input) to FILE",
+        )
+
+
+def open_caches(args: argparse.Namespace) -> ArtifactCache | None:
+    """Load the configured tokenizer and open the artifact cache `args` selects (None when there is none).
+
+    A tokenizer or cache size that cannot be used is reported on stderr and
+    exits with status 1.
+    """
+    try:
+        size_cache()
+        return open_artifact_cache(args.artifact_cache, args.artifact_cache_size)
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        raise SystemExit(1) from None
+
+
+def finish_run(args: argparse.Namespace, timings: Timings, artifacts: ArtifactCache | None) -> None:
+    """Evict what outgrew the artifact cache and print the cache summary and, with --timings, the report."""
+    if artifacts is not None:
+        with timings.stage("artifacts"):
+            artifacts.evict()
+        print(artifacts.stats.summary())
+    if args.timings:
+        print(timings.report(args.top))
@@ -0,0 +1,68 @@
+"""
+Precompiled line templates for generated Markdown documents.
+
+Template source is plain Markdown. A line consisting solely of `{{name}}`
+expands to the lines bound to `name` (a list, possibly empty, or a single
+string), and a `{{name}}` inside a line is replaced by a string value.
+`compile_template()` splits the source once into pre-encoded static chunks and
+slot references, so `Template.render()` only encodes the per-skill values and
+joins everything into a single bytes object.
+"""
+from __future__ import annotations
+
+import re
+from typing import List, Mapping, Sequence, Tuple
+
+SLOT_PATTERN = re.compile(r"\{\{(\w+)\}\}")
+BLOCK_SLOT_PATTERN = re.compile(r"\{\{(\w+)\}\}\Z")
+
+# Compiled op: static bytes emitted before the slot, slot name, whether it is a whole-line slot.
+Op = Tuple[bytes, str, bool]
+
+
+class Template:
+    __slots__ = ("ops", "tail", "slots")
+
+    def __init__(self, ops: List[Op], tail: bytes) -> None:
+        self.ops = ops
+        self.tail = tail
+        self.slots = frozenset(name for _, name, _ in ops)
+
+    def render(self, values: Mapping[str, str | Sequence[str]]) -> bytes:
+        chunks: List[bytes] = []
+        append = chunks.append
+        for static, name, block in self.ops:
+            append(static)
+            value = values[name]
+            if isinstance(value, str):
+                append(value.encode("utf-8"))
+                if block:
+                    append(b"\n")
+            elif value:
+                append("\n".join(value).encode("utf-8"))
+                append(b"\n")
+        append(self.tail)
+        return b"".join(chunks)
+
+
+def compile_template(source: str) -> Template:
+    """Compile template source; a leading newline (from a triple-quoted literal) is ignored."""
+    ops: List[Op] = []
+    static: List[str] = []
+
+    def add(name: str, block: bool) -> None:
+        ops.append(("".join(static).encode("utf-8"), name, block))
+        static.clear()
+
+    for line in source.removeprefix("\n").splitlines():
+        block = BLOCK_SLOT_PATTERN.match(line)
+        if block:
+            add(block.group(1), True)
+            continue
+        position = 0
+        for match in SLOT_PATTERN.finditer(line):
+            static.append(line[position : match.start()])
+            add(match.group(1), False)
+            position = match.end()
+        static.append(line[position:] + "\n")
+    return Template(ops, "".join(static).encode("utf-8"))
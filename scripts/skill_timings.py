@@ -0,0 +1,147 @@
+"""
+Opt-in timing and profiling instrumentation for the skill generator scripts.
+
+`Timings.stage()` records wall time and call counts per stage, and optionally
+per skill and per file, so `--timings` can report where a slow regeneration
+spends its time. A disabled `Timings` hands out a shared no-op span, keeping
+the uninstrumented path cheap. `StackSampler` writes flamegraph-compatible
+collapsed stacks (`frame;frame;frame count`).
+"""
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from types import FrameType
+from typing import Callable, Dict, List, Tuple
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc: object) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("timings", "name", "skill", "path", "start")
+
+    def __init__(self, timings: "Timings", name: str, skill: str | None, path: str | None) -> None:
+        self.timings = timings
+        self.name = name
+        self.skill = skill
+        self.path = path
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc: object) -> None:
+        self.timings.add(self.name, time.perf_counter() - self.start, self.skill, self.path)
+
+
+class Timings:
+    __slots__ = ("enabled", "stages", "skills", "files")
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.stages: Dict[str, List[float]] = {}  # stage -> [seconds, calls]
+        self.skills: Dict[str, float] = {}
+        self.files: Dict[str, float] = {}
+
+    def stage(self, name: str, skill: str | None = None, path: str | None = None) -> _Span | _NullSpan:
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, skill, path)
+
+    def add(self, name: str, seconds: float, skill: str | None = None, path: str | None = None) -> None:
+        entry = self.stages.setdefault(name, [0.0, 0])
+        entry[0] += seconds
+        entry[1] += 1
+        if skill is not None:
+            self.skills[skill] = self.skills.get(skill, 0.0) + seconds
+        if path is not None:
+            self.files[path] = self.files.get(path, 0.0) + seconds
+
+    def merge(self, other: "Timings") -> None:
+        for name, (seconds, calls) in other.stages.items():
+            entry = self.stages.setdefault(name, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += calls
+        for skill, seconds in other.skills.items():
+            self.skills[skill] = self.skills.get(skill, 0.0) + seconds
+        for path, seconds in other.files.items():
+            self.files[path] = self.files.get(path, 0.0) + seconds
+
+    def report(self, top: int = 10) -> str:
+        lines = ["timings:", f"  {'stage':<16} {'calls':>7} {'total ms':>10} {'mean ms':>9}"]
+        for name, (seconds, calls) in sorted(self.stages.items(), key=lambda item: -item[1][0]):
+            lines.append(f"  {name:<16} {calls:>7} {seconds * 1000:>10.2f} {seconds * 1000 / max(calls, 1):>9.3f}")
+        for title, values in (("slowest skills:", self.skills), ("slowest files:", self.files)):
+            if not values:
+                continue
+            lines.append(title)
+            for key, seconds in sorted(values.items(), key=lambda item: -item[1])[:top]:
+                lines.append(f"  {seconds * 1000:>9.2f} ms  {key}")
+        return "\n".join(lines)
+
+
+NO_TIMINGS = Timings(enabled=False)
+
+
+class StackSampler:
+    """Sample the main thread's stack on a CPU-time timer and count collapsed stacks."""
+
+    def __init__(self, interval: float = 0.001) -> None:
+        self.interval = interval
+        self.counts: Dict[str, int] = {}
+
+    def _sample(self, signum: int, frame: FrameType | None) -> None:
+        names: List[str] = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})")
+            frame = frame.f_back
+        key = ";".join(reversed(names))
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def __enter__(self) -> "StackSampler":
+        import signal
+
+        self._previous = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        import signal
+
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._previous)
+
+    def collapsed(self) -> List[Tuple[str, int]]:
+        return sorted(self.counts.items())
+
+    def write(self, path: Path) -> None:
+        path.write_text("".join(f"{stack} {count}\n" for stack, count in self.collapsed()), encoding="utf-8")
+
+
+def run_profiled(func: Callable[[], int], profile_path: Path | None, flamegraph_path: Path | None) -> int:
+    """Run `func()` under cProfile and/or the stack sampler and dump the results."""
+    if flamegraph_path is not None:
+        sampler = StackSampler()
+        with sampler:
+            status = run_profiled(func, profile_path, None)
+        sampler.write(flamegraph_path)
+        return status
+    if profile_path is None:
+        return func()
+    import cProfile
+
+    profiler = cProfile.Profile()
+    status = profiler.runcall(func)
+    profiler.dump_stats(str(profile_path))
+    return status
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Inverted topic index over every skill's resources and requirement docs.
+
+    python3 scripts/skill_cli.py query [--json] [--limit N] TERMS...
+
+The index is built from the records in skills-manifest.json (see skill_export):
+each skill's summary, the headings extracted from each of its resources, and
+the title and summary of each requirement doc it lists. Every such text is
+tokenized into terms, lowercase ASCII words plus character bigrams of other
+scripts, so Japanese headings match without a dictionary. Each term maps to its
+positions (document, text number, token number). The generators update the
+index for just the skills they recorded whenever they save the manifest, and
+`query` rebuilds it from the manifest if the two have drifted apart.
+"""
+from __future__ import annotations
+
+import argparse
+import marshal
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Set, Tuple
+
+from skill_export import EXPORT_NAME, EXPORT_PATH, ROOT, SkillExport, SkillRecord
+from skill_io import marshal_header, write_bytes
+
+TOPIC_INDEX_PATH = ROOT / ".cache/skills/topic-index.marshal"
+TOPIC_INDEX_HEADER = marshal_header("topic-index", 1)
+
+TOKEN_PATTERN = re.compile(r"[0-9a-z]+|[^\W\d_a-z]+")
+
+Posting = Tuple[str, int, int]  # (document key, text number, token number)
+
+
+class Hit(NamedTuple):
+    skill: str
+    path: str  # "SKILL.md", "resources/<name>" or a requirement doc path
+    text: str  # the heading, title or summary that matched
+    phrase: bool  # the terms appear next to each other, in order
+
+
+def tokenize(text: str) -> List[str]:
+    """ASCII words, plus overlapping character bigrams of runs in other scripts."""
+    tokens: List[str] = []
+    for run in TOKEN_PATTERN.findall(text.lower()):
+        if run.isascii() or len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i : i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+def skill_texts(name: str, record: SkillRecord, docs: Dict[str, List[str]]) -> Iterator[Tuple[str, List[str]]]:
+    """(document key, texts) for everything of a skill the index covers."""
+    summary = record.get("summary")
+    if summary:
+        yield f"{name}/SKILL.md", [summary]
+    for path, topics in sorted(record.get("resources", {}).items()):
+        yield f"{name}/{path}", [os.path.splitext(path.rpartition("/")[2])[0].replace("-", " "), *topics]
+    for path in record.get("requirements", ()):
+        if path in docs:
+            yield f"{name}/{path}", list(docs[path])
+
+
+class TopicIndex:
+    __slots__ = ("texts", "postings", "stamp")
+
+    def __init__(self) -> None:
+        self.texts: Dict[str, List[str]] = {}
+        self.postings: Dict[str, List[Posting]] = {}
+        self.stamp: Tuple[int, int] | None = None  # mtime_ns and size of the manifest it reflects
+
+    def add_skill(self, name: str, record: SkillRecord, docs: Dict[str, List[str]]) -> None:
+        postings = self.postings
+        for key, texts in skill_texts(name, record, docs):
+            self.texts[key] = texts
+            for text_no, text in enumerate(texts):
+                for token_no, token in enumerate(tokenize(text)):
+                    postings.setdefault(token, []).append((key, text_no, token_no))
+
+    def remove_skill(self, name: str) -> None:
+        prefix = f"{name}/"
+        keys = {key for key in self.texts if key.startswith(prefix)}
+        if not keys:
+            return
+        terms: Set[str] = set()
+        for key in keys:
+            for text in self.texts.pop(key):
+                terms.update(tokenize(text))
+        for term in terms:
+            remaining = [posting for posting in self.postings.get(term, ()) if posting[0] not in keys]
+            if remaining:
+                self.postings[term] = remaining
+            else:
+                self.postings.pop(term, None)
+
+    def rebuild(self, export: SkillExport) -> None:
+        self.texts.clear()
+        self.postings.clear()
+        for name, record in sorted(export.skills.items()):
+            self.add_skill(name, record, export.docs)
+
+    def query(self, text: str, limit: int = 0) -> List[Hit]:
+        """Texts containing every term of `text`, exact phrase matches first."""
+        tokens = tokenize(text)
+        if not tokens:
+            return []
+        terms = list(dict.fromkeys(tokens))
+        if not all(term in self.postings for term in terms):
+            return []
+        terms.sort(key=lambda term: len(self.postings[term]))
+        # (key, text number) -> token numbers of each term; only texts holding the rarest term are candidates.
+        found: Dict[Tuple[str, int], Dict[str, Set[int]]] = {}
+        for key, text_no, token_no in self.postings[terms[0]]:
+            found.setdefault((key, text_no), {}).setdefault(terms[0], set()).add(token_no)
+        for term in terms[1:]:
+            for key, text_no, token_no in self.postings[term]:
+                positions = found.get((key, text_no))
+                if positions is not None:
+                    positions.setdefault(term, set()).add(token_no)
+        # One hit per document: its first text with a phrase match, else its first matching text.
+        best: Dict[str, Tuple[bool, int]] = {}
+        for (key, text_no), positions in found.items():
+            if len(positions) < len(terms):
+                continue
+            phrase = any(
+                all(start + offset in positions[token] for offset, token in enumerate(tokens))
+                for start in positions[tokens[0]]
+            )
+            if key not in best or (not phrase, text_no) < (not best[key][0], best[key][1]):
+                best[key] = (phrase, text_no)
+        hits: List[Hit] = []
+        for key, (phrase, text_no) in best.items():
+            skill, _, path = key.partition("/")
+            hits.append(Hit(skill, path, self.texts[key][text_no], phrase))
+        hits.sort(key=lambda hit: (not hit.phrase, hit.skill, hit.path))
+        return hits[:limit] if limit > 0 else hits
+
+    @classmethod
+    def load(cls, path: Path) -> "TopicIndex | None":
+        try:
+            header, stamp, texts, postings = marshal.loads(path.read_bytes())
+        except (OSError, EOFError, TypeError, ValueError):
+            return None
+        if header != TOPIC_INDEX_HEADER:
+            return None
+        index = cls()
+        index.stamp, index.texts, index.postings = stamp, texts, postings
+        return index
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_bytes(path, marshal.dumps((TOPIC_INDEX_HEADER, self.stamp, self.texts, self.postings)))
+
+
+def file_stamp(path: Path) -> Tuple[int, int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def update_topic_index(index_path: Path, export_path: Path, export: SkillExport) -> None:
+    """Bring the index in line with `export` after it was saved to `export_path`.
+
+    Only the skills recorded or removed since the export was loaded are
+    re-indexed, unless the index does not match the manifest as it was loaded.
+    `export` is then marked as indexed, so a long-running process can save it again.
+    """
+    index = TopicIndex.load(index_path)
+    if index is None or index.stamp is None or index.stamp != export.stamp:
+        index = TopicIndex()
+        index.rebuild(export)
+    else:
+        for name in sorted(export.changed):
+            index.remove_skill(name)
+            if name in export.skills:
+                index.add_skill(name, export.skills[name], export.docs)
+    index.stamp = file_stamp(export_path)
+    index.save(index_path)
+    export.stamp = index.stamp
+    export.changed.clear()
+
+
+def load_topic_index(index_path: Path, export_path: Path) -> TopicIndex:
+    """The index for the manifest at `export_path`, rebuilt (and saved) when it is missing or stale."""
+    index = TopicIndex.load(index_path)
+    stamp = file_stamp(export_path)
+    if index is not None and index.stamp is not None and index.stamp == stamp:
+        return index
+    export = SkillExport()
+    export.load(export_path)
+    index = TopicIndex()
+    index.rebuild(export)
+    index.stamp = stamp
+    try:
+        index.save(index_path)
+    except OSError:
+        pass  # a read-only checkout still answers the query
+    return index
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Find the skills and resources that cover a topic")
+    parser.add_argument("terms", nargs="+", help="Words or phrase to look up")
+    parser.add_argument("--limit", type=int, default=20, help="Maximum number of results (0 = all)")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    if not EXPORT_PATH.exists():
+        print(f"{EXPORT_NAME} not found; run the skill generators first", file=sys.stderr)
+        return 1
+    hits = load_topic_index(TOPIC_INDEX_PATH, EXPORT_PATH).query(" ".join(args.terms), args.limit)
+    if args.json:
+        import json
+
+        print(json.dumps([hit._asdict() for hit in hits], ensure_ascii=False, indent=2))
+    else:
+        for hit in hits:
+            print(f"{hit.skill}\t{hit.path}\t{hit.text}")
+    return 0 if hits else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,90 @@
+"""
+Single-pass `os.scandir` walker for the `.claude/skills` tree.
+
+`scan_skill()` lists a skill directory and its resources/, scripts/ and
+templates/ subdirectories once, relying on the file type cached on each
+`DirEntry` instead of a stat per `is_dir()`/`is_file()` check. Each regular
+file is stat'ed exactly once and its mtime and size are kept, so incremental
+runs can recognise unchanged skills without reading them.
+"""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple
+
+SKILL_SUBDIRS = ("resources", "scripts", "templates")
+
+
+class FileMeta(NamedTuple):
+    name: str
+    mtime_ns: int
+    size: int
+
+
+class SkillFiles(NamedTuple):
+    path: Path
+    skill_md: FileMeta | None
+    dirs: Dict[str, List[FileMeta]]  # subdirectory -> regular files sorted by name
+
+    @property
+    def name(self) -> str:
+        return self.path.name
+
+    def names(self, sub: str, suffix: str | None = None) -> List[str]:
+        return [meta.name for meta in self.dirs[sub] if not suffix or meta.name.endswith(suffix)]
+
+    def find(self, sub: str, name: str) -> FileMeta | None:
+        return next((meta for meta in self.dirs[sub] if meta.name == name), None)
+
+    def has(self, sub: str, name: str) -> bool:
+        return self.find(sub, name) is not None
+
+
+def file_meta(entry: os.DirEntry) -> FileMeta | None:
+    """Metadata for a regular file (following symlinks, like `Path.is_file()`)."""
+    try:
+        if not entry.is_file():
+            return None
+        st = entry.stat()
+    except OSError:
+        return None
+    return FileMeta(entry.name, st.st_mtime_ns, st.st_size)
+
+
+def scan_files(dir_path: str | Path) -> List[FileMeta]:
+    try:
+        with os.scandir(dir_path) as entries:
+            metas = [meta for meta in map(file_meta, entries) if meta is not None]
+    except OSError:
+        return []
+    metas.sort()
+    return metas
+
+
+def scan_skill(skill_dir: Path) -> SkillFiles | None:
+    """List one skill directory; returns None when it is not a directory."""
+    skill_md: FileMeta | None = None
+    dirs: Dict[str, List[FileMeta]] = {sub: [] for sub in SKILL_SUBDIRS}
+    try:
+        with os.scandir(skill_dir) as entries:
+            for entry in entries:
+                if entry.name == "SKILL.md":
+                    skill_md = file_meta(entry)
+                elif entry.name in dirs and entry.is_dir():
+                    dirs[entry.name] = scan_files(entry.path)
+    except OSError:
+        return None
+    return SkillFiles(skill_dir, skill_md, dirs)
+
+
+def scan_skills(root: Path, names: Iterable[str] | None = None) -> List[SkillFiles]:
+    """Scan every skill directory under `root` (or only `names`), sorted by name."""
+    if names is None:
+        try:
+            with os.scandir(root) as entries:
+                names = [entry.name for entry in entries if entry.is_dir()]
+        except OSError:
+            return []
+    skills = [scan_skill(root / name) for name in sorted(names)]
+    return [skill for skill in skills if skill is not None]
@@ -0,0 +1,177 @@
+"""
+File watching for the skill generator `--watch` modes.
+
+Uses Linux inotify through ctypes when available and falls back to polling
+directory snapshots elsewhere. `watch_paths()` debounces bursts of events and
+hands the callback the set of changed paths once the tree has been quiet for
+`debounce` seconds.
+"""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+
+WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+)
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyWatcher:
+    def __init__(self, roots: Iterable[Path]) -> None:
+        libc_name = ctypes.util.find_library("c")
+        if not sys.platform.startswith("linux") or not libc_name:
+            raise OSError("inotify is not available")
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.fd = fd
+        self.roots = [Path(root) for root in roots]
+        self._dirs: Dict[int, Path] = {}
+        for root in self.roots:
+            self._add_tree(root)
+
+    def _add_dir(self, path: Path) -> None:
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd >= 0:
+            self._dirs[wd] = path
+
+    def _add_tree(self, root: Path) -> None:
+        if not root.is_dir():
+            return
+        self._add_dir(root)
+        for dirpath, dirnames, _ in os.walk(root):
+            for name in dirnames:
+                self._add_dir(Path(dirpath) / name)
+
+    def read(self, timeout: float | None) -> Set[Path]:
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+        changed: Set[Path] = set()
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped; report the roots so callers rescan everything.
+                changed.update(self.roots)
+                continue
+            if mask & IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+            base = self._dirs.get(wd)
+            if base is None:
+                continue
+            path = base / os.fsdecode(name) if name else base
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                self._add_tree(path)
+            changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    def __init__(self, roots: Iterable[Path], interval: float = 0.5) -> None:
+        self.roots = [Path(root) for root in roots]
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        snapshot: Dict[Path, Tuple[int, int]] = {}
+        stack = [root for root in self.roots if root.is_dir()]
+        while stack:
+            current = stack.pop()
+            try:
+                entries = list(os.scandir(current))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(Path(entry.path))
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                snapshot[Path(entry.path)] = (st.st_mtime_ns, st.st_size)
+        return snapshot
+
+    def read(self, timeout: float | None) -> Set[Path]:
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        snapshot = self._scan()
+        previous = self._snapshot
+        self._snapshot = snapshot
+        changed = {path for path, meta in snapshot.items() if previous.get(path) != meta}
+        changed.update(path for path in previous if path not in snapshot)
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+def open_watcher(roots: Iterable[Path], polling: bool = False) -> InotifyWatcher | PollingWatcher:
+    roots = list(roots)
+    if not polling:
+        try:
+            return InotifyWatcher(roots)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(roots)
+
+
+def watch_paths(
+    roots: Iterable[Path],
+    callback: Callable[[List[Path]], None],
+    debounce: float = 0.1,
+    polling: bool = False,
+) -> int:
+    """Call `callback` with batches of changed paths until interrupted."""
+    watcher = open_watcher(roots, polling)
+    mode = "polling" if isinstance(watcher, PollingWatcher) else "inotify"
+    print(f"watching {', '.join(str(root) for root in watcher.roots)} ({mode}, Ctrl+C to stop)")
+    pending: Set[Path] = set()
+    try:
+        while True:
+            changed = watcher.read(debounce if pending else None)
+            if changed:
+                pending.update(changed)
+                continue
+            if pending:
+                batch = sorted(pending)
+                pending.clear()
+                callback(batch)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        watcher.close()
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Long-lived worker serving the skill generators over newline-delimited JSON-RPC.
+
+    python3 scripts/skill_cli.py worker [--concurrency N]
+
+Hosts such as the Node/Electron apps keep one worker running instead of
+spawning a generator per call, so Python startup, imports and the first parse
+of the skills tree are paid once. Every line on stdin is a JSON-RPC 2.0
+request, and every response is one line on stdout, written when its request
+completes (possibly out of order; match responses by id). A "ready"
+notification is sent once the worker has loaded its state. Reports the
+generators print go to stderr, so they never interleave with responses.
+
+Methods (params):
+    list_skills ()              every skill's name, summary and whether its level files exist
+    update_skill (skill)        regenerate the skill's Level1-4 files
+    sync_skill (skill)          regenerate its requirements-index.md and SKILL.md reference
+    build_skill_index (skill)   render its requirements index in memory, without writing it
+    flush ()                    save skills-manifest.json, the catalog and the doc cache
+    shutdown ()                 finish the requests in flight, save and exit
+
+The catalog, the requirement mapping, the parsed docs and skills-manifest.json
+stay in memory between requests. Each request re-stats what it depends on,
+so edits made between requests are picked up without a restart: SKILL.md and
+resources through the catalog's mtime/size memos, the mapping through its
+snapshot, and each doc through the doc cache. State is saved on `flush`,
+`shutdown` and end of input; skills-manifest.json is merged with whatever
+other runs saved meanwhile, so only the skills this worker recorded change. Up to `--concurrency` requests run at once;
+requests that write files take turns. Every result (and every error's data)
+carries `meta`: the milliseconds the request waited and ran, and the
+concurrency limit and number of requests in flight.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import threading
+import time
+from typing import BinaryIO, Callable, Dict, List, Tuple
+
+import sync_requirements_to_skills as sync
+import update_skill_levels as levels
+from skill_catalog import CATALOG_PATH, SkillCatalog, SkillEntry, generator_version
+from skill_export import EXPORT_PATH, SkillExport, save_export
+from skill_io import WriteStats, is_racy_mtime
+from skill_metrics import size_cache
+from skill_topics import file_stamp
+
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+SKILL_NOT_FOUND = -32001
+MAPPING_ERROR = -32002
+GENERATOR_ERROR = -32003
+
+DEFAULT_CONCURRENCY = 4
+
+Result = Dict[str, object]
+
+
+class RequestError(Exception):
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+
+
+def skill_param(params: Dict[str, object]) -> str:
+    errors: List[str] = []
+    name = params.get("skill")
+    if not sync.check_name("params.skill", name, errors, skill=True):
+        raise RequestError(INVALID_PARAMS, errors[0])
+    return name
+
+
+def write_summary(stats: WriteStats) -> Result:
+    return {"written": stats.written, "unchanged": stats.unchanged, "bytes_written": stats.bytes_written}
+
+
+class WorkerState:
+    """What each generator run would otherwise rebuild from disk.
+
+    `lock` guards the catalog, the export and the mapping; `write_lock` lets
+    one request at a time write files.
+    """
+
+    def __init__(self) -> None:
+        self.version = generator_version()
+        self.doc_version = sync.doc_cache_version()
+        self.catalog = SkillCatalog(levels.SKILLS_ROOT)
+        self.catalog.load(CATALOG_PATH, self.version)
+        self.export = SkillExport()
+        self.export.load(EXPORT_PATH)
+        self.export.seed_sizes(size_cache())
+        self.docs = sync.load_doc_cache(sync.DOC_CACHE_PATH, self.doc_version)
+        self.requirements: List[sync.Requirement] = []
+        self.skill_docs: Dict[str, List[str]] = {}  # skill -> doc paths, in mapping order
+        self.mapping_stamp: Tuple[int, int] | None = None
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.dirty = False
+
+    def mapping(self) -> List[sync.Requirement]:
+        """The requirement mapping, reloaded when the file changed; call with `lock` held."""
+        stamp = file_stamp(sync.MAPPING_PATH)
+        if stamp is None:
+            raise RequestError(MAPPING_ERROR, f"{sync.MAPPING_PATH.name} not found")
+        # A stamp this recent may hide a same-tick edit; load_mapping() then checks the content hash.
+        if stamp != self.mapping_stamp or is_racy_mtime(stamp[0]):
+            try:
+                self.requirements = sync.load_mapping(sync.MAPPING_PATH, sync.MAPPING_CACHE_PATH)
+            except (OSError, ValueError) as exc:
+                raise RequestError(MAPPING_ERROR, f"cannot load {sync.MAPPING_PATH.name}: {exc}") from None
+            self.skill_docs = {}
+            for file_path, skills in self.requirements:
+                for skill in skills:
+                    self.skill_docs.setdefault(skill, []).append(file_path)
+            self.mapping_stamp = stamp
+        return self.requirements
+
+    def entry(self, name: str) -> SkillEntry:
+        """The skill's catalog entry, rescanned; call with `lock` held."""
+        entries = self.catalog.scan([name])
+        if not entries or entries[0].files.skill_md is None:
+            raise RequestError(SKILL_NOT_FOUND, f"unknown skill {name!r}")
+        return entries[0]
+
+    def list_skills(self, params: Dict[str, object]) -> Result:
+        skills = []
+        with self.lock:
+            for entry in self.catalog.scan():
+                source = levels.parse_skill(entry)
+                if source is None:
+                    continue
+                skills.append(
+                    {
+                        "name": entry.name,
+                        "summary": source.summary or source.fallback_summary,
+                        "has_levels": levels.has_levels(entry.files),
+                    }
+                )
+        return {"skills": skills}
+
+    def update_skill(self, params: Dict[str, object]) -> Result:
+        name = skill_param(params)
+        with self.write_lock:
+            # Regenerate on a copy, as a worker process would: list_skills() may refresh the catalog's entry meanwhile.
+            with self.lock:
+                entry = self.entry(name).copy()
+            _, error, stats, _, entry, artifact = levels.run_skill(entry)
+            if error is not None:
+                raise RequestError(GENERATOR_ERROR, f"failed to update {name}: {error}")
+            with self.lock:
+                self.catalog.update(entry)
+                if artifact is not None:
+                    self.export.update(name, artifact.record)
+                self.dirty = True
+        return {"skill": name, **write_summary(stats)}
+
+    def sync_skill(self, params: Dict[str, object]) -> Result:
+        name = skill_param(params)
+        with self.write_lock, self.lock:
+            requirements = self.mapping()
+            self.entry(name)
+            self.docs = sync.sync_skills(
+                requirements, {name}, self.docs, False, catalog=self.catalog, export=self.export
+            )
+            self.dirty = True
+            paths = list(self.skill_docs.get(name, ()))
+        return {"skill": name, "requirements": paths}
+
+    def build_skill_index(self, params: Dict[str, object]) -> Result:
+        name = skill_param(params)
+        with self.lock:
+            self.mapping()
+            paths = list(dict.fromkeys(self.skill_docs.get(name, ())))
+            cached = {path: self.docs[path] for path in paths if path in self.docs}
+        if not paths:
+            raise RequestError(SKILL_NOT_FOUND, f"{name!r} is not in {sync.MAPPING_PATH.name}")
+        # Docs are read into a dict of our own and merged below, so flush() and sync_skill() never see it change.
+        read: Dict[str, sync.DocCacheEntry] = {}
+        docs: List[sync.DocRecord] = []
+        doc_ids: List[int] = []
+        missing: List[str] = []
+        for path in paths:
+            doc_id = sync.read_doc(path, docs, cached, read)
+            if doc_id is None:
+                missing.append(path)
+            else:
+                doc_ids.append(doc_id)
+        with self.lock:
+            changed = {path: entry for path, entry in read.items() if self.docs.get(path) != entry}
+            if changed:
+                self.docs.update(changed)
+                self.dirty = True
+        return {
+            "skill": name,
+            "content": sync.build_skill_index(name, doc_ids, docs),
+            "requirements": [doc.file for doc in docs],
+            "missing": missing,
+        }
+
+    def flush(self, params: Dict[str, object] | None = None) -> Result:
+        with self.write_lock, self.lock:
+            saved = self.dirty
+            if saved:
+                save_export(self.export)
+                self.catalog.save(CATALOG_PATH, self.version)
+                sync.save_doc_cache(sync.DOC_CACHE_PATH, self.doc_version, self.docs)
+                self.dirty = False
+        return {"saved": saved}
+
+
+class Worker:
+    def __init__(self, state: WorkerState, out: BinaryIO, concurrency: int) -> None:
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.state = state
+        self.out = out
+        self.concurrency = concurrency
+        self.pool = ThreadPoolExecutor(max_workers=concurrency)
+        self.in_flight = 0
+        self.count_lock = threading.Lock()
+        self.out_lock = threading.Lock()
+        self.methods: Dict[str, Callable[[Dict[str, object]], Result]] = {
+            "list_skills": state.list_skills,
+            "update_skill": state.update_skill,
+            "sync_skill": state.sync_skill,
+            "build_skill_index": state.build_skill_index,
+            "flush": state.flush,
+        }
+
+    def send(self, message: Dict[str, object]) -> None:
+        data = json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+        with self.out_lock:
+            self.out.write(data)
+            self.out.flush()
+
+    def respond(
+        self, request_id: object, result: Result | None, error: Tuple[int, str] | None, received: float, started: float
+    ) -> None:
+        meta = {
+            "queued_ms": round((started - received) * 1000, 3),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+            "concurrency": {"limit": self.concurrency, "in_flight": self.in_flight},
+        }
+        if error is not None:
+            code, message = error
+            payload = {"code": code, "message": message, "data": {"meta": meta}}
+            self.send({"jsonrpc": "2.0", "id": request_id, "error": payload})
+        else:
+            self.send({"jsonrpc": "2.0", "id": request_id, "result": {**result, "meta": meta}})
+
+    def handle(self, request: Dict[str, object], received: float) -> None:
+        started = time.perf_counter()
+        result: Result | None = None
+        error: Tuple[int, str] | None = None
+        try:
+            params = request.get("params", {})
+            if not isinstance(params, dict):
+                raise RequestError(INVALID_PARAMS, "params must be an object")
+            method = self.methods.get(request["method"])
+            if method is None:
+                raise RequestError(METHOD_NOT_FOUND, f"unknown method {request['method']!r}")
+            result = method(params)
+        except RequestError as exc:
+            error = (exc.code, str(exc))
+        except Exception as exc:  # reported to the host; the worker keeps serving
+            error = (INTERNAL_ERROR, f"{type(exc).__name__}: {exc}")
+        try:
+            if "id" in request:  # requests without an id are notifications and get no response
+                self.respond(request.get("id"), result, error, received, started)
+        finally:
+            with self.count_lock:
+                self.in_flight -= 1
+
+    def submit(self, line: bytes) -> bool:
+        """Dispatch one request line; returns False once the host asked the worker to shut down."""
+        received = time.perf_counter()
+        try:
+            request = json.loads(line)
+        except ValueError as exc:
+            self.respond(None, None, (PARSE_ERROR, f"invalid JSON: {exc}"), received, received)
+            return True
+        valid = isinstance(request, dict) and request.get("jsonrpc") == "2.0"
+        if not valid or not isinstance(request.get("method"), str):
+            request_id = request.get("id") if isinstance(request, dict) else None
+            self.respond(request_id, None, (INVALID_REQUEST, "expected a JSON-RPC 2.0 request"), received, received)
+            return True
+        if request["method"] == "shutdown":
+            result = self.close()
+            if "id" in request:
+                self.respond(request.get("id"), result, None, received, received)
+            return False
+        with self.count_lock:
+            self.in_flight += 1
+        self.pool.submit(self.handle, request, received)
+        return True
+
+    def close(self) -> Result:
+        """Wait for the requests in flight, then save the state."""
+        self.pool.shutdown(wait=True)
+        return self.state.flush()
+
+    def serve(self, stdin: BinaryIO) -> None:
+        self.send({"jsonrpc": "2.0", "method": "ready", "params": {"concurrency": self.concurrency}})
+        for line in iter(stdin.readline, b""):
+            if line.strip() and not self.submit(line):
+                return
+        self.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve the skill generators over newline-delimited JSON-RPC")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        metavar="N",
+        help=f"Number of requests handled at once (default: {DEFAULT_CONCURRENCY})",
+    )
+    args = parser.parse_args()
+    try:
+        size_cache()
+    except ValueError as exc:
+        print(exc, file=sys.stderr)
+        return 1
+    protocol_in, protocol_out = sys.stdin.buffer, sys.stdout.buffer
+    sys.stdout = sys.stderr  # generator reports must not interleave with responses
+    Worker(WorkerState(), protocol_out, max(1, args.concurrency)).serve(protocol_in)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Run sync_requirements_to_skills.py and update_skill_levels.py in one process.
+
+Both generators share one `SkillCatalog`: the skills tree is scanned once,
+each SKILL.md is read and parsed once, and the SKILL.md descriptions written by
+the requirement sync are handed straight to the level generator instead of
+being read back from disk.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from typing import Dict, Set
+
+from skill_catalog import CATALOG_PATH, SkillCatalog, generator_version
+from skill_export import EXPORT_PATH, SkillExport, save_export
+from skill_metrics import size_cache
+from skill_options import add_common_arguments, finish_run, open_caches
+from skill_timings import Timings
+from sync_requirements_to_skills import (
+    DOC_CACHE_PATH,
+    MAPPING_CACHE_PATH,
+    MAPPING_PATH,
+    doc_cache_version,
+    load_doc_cache,
+    load_mapping,
+    save_doc_cache,
+    sync_skills,
+)
+from update_skill_levels import (
+    MANIFEST_PATH,
+    SKILLS_ROOT,
+    ManifestEntry,
+    load_manifest,
+    save_state,
+    update_skills,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Sync requirement docs and update skill levels in one pass")
+    parser.add_argument("--skill", help="Only update the specified skill")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Skip skills whose inputs are unchanged since the last run (see .cache/skills)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Reparse the mapping and every requirement doc instead of using .cache/skills",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of worker processes for the level generator (0 = one per CPU core)",
+    )
+    parser.add_argument(
+        "--io-threads",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Overlap level-file reads and writes on N threads per process (for high-latency filesystems)",
+    )
+    add_common_arguments(
+        parser,
+        "Write and release each skill as soon as it is done to keep memory bounded on very large trees",
+        profiling=False,
+    )
+    args = parser.parse_args()
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    timings = Timings(enabled=args.timings)
+    artifacts = open_caches(args)
+
+    version = generator_version()
+    catalog = SkillCatalog(SKILLS_ROOT)
+    manifest: Dict[str, ManifestEntry] | None = None
+    if args.incremental:
+        with timings.stage("manifest"):
+            manifest = load_manifest(MANIFEST_PATH, version)
+            catalog.load(CATALOG_PATH, version)
+    export = SkillExport()
+    with timings.stage("manifest"):
+        export.load(EXPORT_PATH)
+        export.seed_sizes(size_cache())
+    with timings.stage("walk"):
+        entries = catalog.scan([args.skill] if args.skill else None)
+
+    with timings.stage("mapping"):
+        try:
+            requirements = load_mapping(MAPPING_PATH, None if args.no_cache else MAPPING_CACHE_PATH)
+        except (OSError, ValueError) as exc:
+            print(f"cannot load {MAPPING_PATH.name}: {exc}", file=sys.stderr)
+            return 1
+    selected: Set[str] | None = {args.skill} if args.skill else None
+    cache_version = doc_cache_version()
+    with timings.stage("cache"):
+        doc_cache = {} if args.no_cache else load_doc_cache(DOC_CACHE_PATH, cache_version)
+    live_cache = sync_skills(
+        requirements,
+        selected,
+        doc_cache,
+        False,
+        timings,
+        catalog=catalog,
+        stream=args.stream,
+        export=export,
+        artifacts=artifacts,
+    )
+    if not args.no_cache:
+        with timings.stage("cache"):
+            save_doc_cache(DOC_CACHE_PATH, cache_version, live_cache)
+
+    entries = [catalog.entries[entry.name] for entry in entries if entry.name in catalog.entries]
+    if not args.skill:
+        # A full run drops entries for skills that no longer exist.
+        export.retain(entry.name for entry in entries)
+        if manifest is not None:
+            manifest = {entry.name: manifest[entry.name] for entry in entries if entry.name in manifest}
+    status = update_skills(entries, jobs, manifest, timings, catalog, args.io_threads, args.stream, export, artifacts)
+    with timings.stage("manifest"):
+        if manifest is not None:
+            save_state(catalog, manifest, version)
+        save_export(export)
+    finish_run(args, timings, artifacts)
+    return status
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
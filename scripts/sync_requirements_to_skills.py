@@ -4,34 +4,96 @@ Sync requirement documents into skill resources.
 
 Generates `.claude/skills/<skill>/resources/requirements-index.md` based on
 `docs/00-requirements/requirements-skill-map.json` and updates SKILL.md
-descriptions to reference the index.
+descriptions to reference the index. With `--stream`, each skill is written as
+soon as it is rendered, so memory stays bounded by the mapping's metadata
+rather than growing with the size of the skill tree.
 """
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import marshal
 import os
+import sys
 from pathlib import Path
-from typing import Dict, List, Tuple
-
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Sequence, Set, Tuple
+
+from skill_artifacts import Artifact, ArtifactCache, artifact_key
+from skill_catalog import CATALOG_PATH, SkillCatalog, generator_version
+from skill_export import EXPORT_PATH, SkillExport, file_layout, save_export
+from skill_io import (
+    CHUNK_SIZE,
+    WriteBatch,
+    WriteStats,
+    marshal_header,
+    read_text,
+    trusted_mtime_ns,
+    write_bytes,
+    write_text,
+)
+from skill_markdown import parse_frontmatter
+from skill_metrics import Metrics, format_size, output_version, size_cache
+from skill_options import add_common_arguments, finish_run, open_caches
+from skill_timings import NO_TIMINGS, Timings, run_profiled
 
 ROOT = Path(__file__).resolve().parents[1]
 MAPPING_PATH = ROOT / "docs/00-requirements/requirements-skill-map.json"
 SKILLS_ROOT = ROOT / ".claude/skills"
+DOC_CACHE_PATH = ROOT / ".cache/skills/requirement-docs.json"
+MAPPING_CACHE_PATH = ROOT / ".cache/skills/requirements-skill-map.marshal"
+INDEX_FILE = "resources/requirements-index.md"
+# Modules whose code shapes the cached doc entries and the rendered index files; editing any of them
+# invalidates the doc cache and the artifacts rendered by this generator.
+DOC_CACHE_SOURCES = (Path(__file__).resolve(),) + tuple(
+    Path(__file__).resolve().with_name(name)
+    for name in ("skill_export.py", "skill_io.py", "skill_markdown.py", "skill_metrics.py")
+)
+MAPPING_CACHE_HEADER = marshal_header("requirements-skill-map", 1)
 
+DocCacheEntry = List[object]  # [mtime_ns, size, sha256 hex, title, summary, metrics]
 
-def read_text(path: Path) -> str:
-    return path.read_text(encoding="utf-8")
 
+class DocRecord(NamedTuple):
+    """A requirement doc as listed in the index; stored once and referenced by id from each skill."""
 
-def write_text(path: Path, content: str) -> None:
-    path.write_text(content, encoding="utf-8")
+    file: str
+    title: str
+    summary: str
+    metrics: Metrics | None = None
 
 
 def extract_title_and_summary(path: Path) -> Tuple[str, str]:
-    title = path.name
+    return parse_title_and_summary(read_text(path).splitlines(), path.name)
+
+
+def read_title_and_summary(path: Path) -> Tuple[str, str, str, Metrics]:
+    """(sha256 hex, title, summary, size metrics) of a doc, hashed in chunks and parsed up to its summary line.
+
+    The doc is only read whole when no metrics are known for its hash yet.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+
+        def lines() -> Iterator[str]:
+            for raw in handle:
+                digest.update(raw)
+                yield from raw.decode("utf-8").splitlines()
+
+        title, summary = parse_title_and_summary(lines(), path.name)
+        for chunk in iter(lambda: handle.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    cache = size_cache()
+    metrics = cache.known.get(digest.hexdigest())
+    if metrics is None:
+        # Hashed again with the content, so the digest returned (metrics[0]) always matches the metrics.
+        metrics = cache.measure_bytes(path.read_bytes())
+    return metrics[0], title, summary, metrics
+
+
+def parse_title_and_summary(lines: Iterable[str], title: str) -> Tuple[str, str]:
     summary = ""
-    for line in read_text(path).splitlines():
+    for line in lines:
         stripped = line.strip()
         if stripped.startswith("# "):
             title = stripped[2:].strip()
@@ -49,17 +111,193 @@ def extract_title_and_summary(path: Path) -> Tuple[str, str]:
     return title, summary
 
 
-def load_mapping(path: Path) -> List[Dict[str, object]]:
-    data = json.loads(read_text(path))
-    if not isinstance(data, dict) or "requirements" not in data:
-        raise ValueError("mapping file must include requirements array")
-    requirements = data["requirements"]
-    if not isinstance(requirements, list):
-        raise ValueError("requirements must be a list")
+def doc_cache_version() -> str:
+    return output_version(DOC_CACHE_SOURCES)
+
+
+def load_doc_cache(path: Path, version: str) -> Dict[str, DocCacheEntry]:
+    try:
+        data = json.loads(read_text(path))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != version:
+        return {}
+    docs = data.get("docs")
+    return docs if isinstance(docs, dict) else {}
+
+
+def save_doc_cache(path: Path, version: str, docs: Dict[str, DocCacheEntry]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    content = json.dumps(
+        {"version": version, "docs": docs}, ensure_ascii=False, separators=(",", ":"), sort_keys=True
+    )
+    write_text(path, content + "\n")
+
+
+def cached_title_and_summary(
+    doc_path: Path, st: os.stat_result, cached: DocCacheEntry | None
+) -> Tuple[str, str, DocCacheEntry]:
+    """Return (title, summary) from the cache when the doc is unchanged, else parse it."""
+    if cached and len(cached) == 6 and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return str(cached[3]), str(cached[4]), cached
+    digest, title, summary, metrics = read_title_and_summary(doc_path)
+    if cached and len(cached) == 6 and cached[2] == digest:
+        title, summary = str(cached[3]), str(cached[4])
+    return title, summary, [trusted_mtime_ns(st.st_mtime_ns), st.st_size, digest, title, summary, metrics]
+
+
+class Requirement(NamedTuple):
+    file: str
+    skills: Tuple[str, ...]  # mapping order, duplicates removed
+
+
+JSON_TYPES = {dict: "object", list: "array", str: "string", bool: "boolean", int: "number", float: "number"}
+
+
+def json_type(value: object) -> str:
+    return "null" if value is None else JSON_TYPES.get(type(value), type(value).__name__)
+
+
+def check_name(where: str, value: object, errors: List[str], skill: bool = False) -> bool:
+    if not isinstance(value, str) or not value:
+        found = "an empty string" if value == "" else json_type(value)
+        errors.append(f"{where}: expected a non-empty string, got {found}")
+        return False
+    if skill and (value in (".", "..") or "/" in value or "\\" in value):
+        errors.append(f"{where}: {value!r} is not a skill directory name")
+        return False
+    return True
+
+
+def plain_skill_names(skills: List[object]) -> bool:
+    """Fast check that every entry is a usable skill name; failures are re-checked one by one."""
+    try:
+        joined = "\0".join(skills)  # TypeError unless every entry is a string
+    except TypeError:
+        return False
+    return not ("/" in joined or "\\" in joined or "" in skills or "." in skills or ".." in skills)
+
+
+def parse_mapping(data: bytes) -> List[Requirement]:
+    """Decode and validate the whole mapping, reporting every schema error with its JSON path."""
+    try:
+        root = json.loads(data)
+    except ValueError as exc:  # JSONDecodeError carries the line and column
+        raise ValueError(f"not valid JSON: {exc}") from None
+    if not isinstance(root, dict) or not isinstance(root.get("requirements"), list):
+        raise ValueError('expected an object with a "requirements" array')
+    errors: List[str] = []
+    requirements: List[Requirement] = []
+    for index, item in enumerate(root["requirements"]):
+        where = f"requirements[{index}]"
+        if not isinstance(item, dict):
+            errors.append(f"{where}: expected an object, got {json_type(item)}")
+            continue
+        valid = True
+        for key in ("file", "skills"):
+            if key not in item:
+                errors.append(f'{where}: missing "{key}"')
+                valid = False
+        if not valid:
+            continue
+        valid = check_name(f"{where}.file", item["file"], errors)
+        skills = item["skills"]
+        if not isinstance(skills, list):
+            errors.append(f"{where}.skills: expected an array, got {json_type(skills)}")
+            continue
+        if not plain_skill_names(skills):
+            for position, skill in enumerate(skills):
+                valid = check_name(f"{where}.skills[{position}]", skill, errors, skill=True) and valid
+        if valid:
+            requirements.append(Requirement(item["file"], tuple(dict.fromkeys(skills))))
+    if errors:
+        raise ValueError(f"{len(errors)} schema error(s):\n" + "\n".join(f"  {error}" for error in errors))
     return requirements
 
 
-def build_skill_index(skill: str, entries: List[Dict[str, str]]) -> str:
+def read_mapping_cache(path: Path) -> Tuple[int, int, str, List[Requirement]] | None:
+    try:
+        header, mtime_ns, size, digest, entries = marshal.loads(path.read_bytes())
+    except (OSError, EOFError, TypeError, ValueError):
+        return None
+    if header != MAPPING_CACHE_HEADER:
+        return None
+    return mtime_ns, size, digest, [Requirement(file_path, skills) for file_path, skills in entries]
+
+
+def load_mapping(path: Path, cache_path: Path | None = None, save: bool = True) -> List[Requirement]:
+    """Load and validate the mapping.
+
+    With `cache_path`, the validated mapping is snapshotted there with marshal and
+    reused, without JSON parsing or validation, while the file's mtime and size (or
+    failing those, its sha256) are unchanged. `save=False` reuses a snapshot but
+    never writes one.
+    """
+    if cache_path is None:
+        return parse_mapping(path.read_bytes())
+    st = path.stat()
+    cached = read_mapping_cache(cache_path)
+    if cached is not None and cached[0] and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[3]
+    data = path.read_bytes()
+    digest = hashlib.sha256(data).hexdigest()
+    if cached is not None and cached[2] == digest:
+        requirements = cached[3]
+    else:
+        requirements = parse_mapping(data)
+    if not save:
+        return requirements
+    entries = [tuple(item) for item in requirements]
+    snapshot = (MAPPING_CACHE_HEADER, trusted_mtime_ns(st.st_mtime_ns), st.st_size, digest, entries)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    write_bytes(cache_path, marshal.dumps(snapshot))
+    return requirements
+
+
+def build_reverse_index(requirements: List[Requirement]) -> Dict[str, List[str]]:
+    reverse: Dict[str, List[str]] = {}
+    for file_path, skills in requirements:
+        reverse.setdefault(file_path, []).extend(skills)
+    return reverse
+
+
+def normalize_repo_path(path: str) -> str:
+    candidate = Path(path)
+    if not candidate.is_absolute():
+        candidate = Path.cwd() / candidate
+    try:
+        return candidate.resolve().relative_to(ROOT).as_posix()
+    except ValueError:
+        return Path(path).as_posix()
+
+
+def git_changed_paths(ref: str) -> List[str]:
+    import subprocess
+
+    result = subprocess.run(
+        ["git", "-C", str(ROOT), "diff", "--name-only", "--relative", ref, "--"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return [line for line in result.stdout.splitlines() if line]
+
+
+def affected_skills(reverse: Dict[str, List[str]], changed: Iterable[str]) -> Set[str] | None:
+    """Skills whose requirements index depends on `changed`; None means every skill."""
+    mapping_rel = MAPPING_PATH.relative_to(ROOT).as_posix()
+    skills_rel = SKILLS_ROOT.relative_to(ROOT).as_posix() + "/"
+    affected: Set[str] = set()
+    for path in changed:
+        if path == mapping_rel:
+            return None
+        affected.update(reverse.get(path, ()))
+        if path.startswith(skills_rel) and path.endswith("/SKILL.md"):
+            affected.add(path[len(skills_rel) : -len("/SKILL.md")])
+    return affected
+
+
+def build_skill_index(skill: str, doc_ids: Iterable[int], docs: Sequence[DocRecord]) -> str:
     lines = [
         "# Requirements Index",
         "",
@@ -71,19 +309,12 @@ def build_skill_index(skill: str, entries: List[Dict[str, str]]) -> str:
         "## 対象ドキュメント",
         "",
     ]
-    for entry in entries:
-        doc = entry["file"]
-        title = entry["title"]
-        summary = entry["summary"]
-        lines.extend(
-            [
-                f"### {title}",
-                f"- パス: `{doc}`",
-                f"- 目的/範囲: {summary}",
-                "- 読み取り指示: 本文を必ず全文確認",
-                "",
-            ]
-        )
+    for doc_id in doc_ids:
+        doc, title, summary, metrics = docs[doc_id]
+        lines.extend([f"### {title}", f"- パス: `{doc}`", f"- 目的/範囲: {summary}"])
+        if metrics:
+            lines.append(f"- 分量: {format_size(metrics)}")
+        lines.extend(["- 読み取り指示: 本文を必ず全文確認", ""])
     lines.extend(
         [
             "## 更新ルール",
@@ -96,131 +327,205 @@ def build_skill_index(skill: str, entries: List[Dict[str, str]]) -> str:
     return "\n".join(lines).rstrip() + "\n"
 
 
-def ensure_skill_description(skill_path: Path) -> bool:
-    text = read_text(skill_path)
-    if "`resources/requirements-index.md`" in text:
-        return False
+INDEX_REFERENCE_LINE = "  - `resources/requirements-index.md`: 要求仕様の索引（docs/00-requirements と同期）"
+RESOURCE_HEADING = "📚 リソース参照:"
 
-    lines = text.splitlines()
-    if not lines or lines[0] != "---":
-        return False
-
-    try:
-        end_index = lines[1:].index("---") + 1
-    except ValueError:
-        return False
-
-    frontmatter = lines[: end_index + 1]
-    body = lines[end_index + 1 :]
-
-    try:
-        desc_index = next(
-            i for i, line in enumerate(frontmatter) if line.startswith("description: |")
-        )
-    except StopIteration:
-        return False
 
-    desc_lines: List[str] = []
-    desc_end = desc_index + 1
-    for i in range(desc_index + 1, len(frontmatter)):
-        line = frontmatter[i]
-        if line and not line.startswith(" "):
-            desc_end = i
-            break
-        desc_lines.append(line)
-    else:
-        desc_end = len(frontmatter)
-
-    desc_text = "\n".join(desc_lines)
-    insert_line = "  - `resources/requirements-index.md`: 要求仕様の索引（docs/00-requirements と同期）"
-    if "📚 リソース参照:" in desc_text:
-        updated_desc: List[str] = []
+def add_index_reference(text: str) -> str | None:
+    """SKILL.md text with requirements-index.md listed in its description, or None if no edit applies."""
+    if "`resources/requirements-index.md`" in text:
+        return None
+    if "\r" in text:
+        # CRLF and CR files are edited (and written back) with LF line endings, as before.
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    if not text.endswith("\n"):
+        text += "\n"  # an edited file always ends with a newline, as before
+    # As before, the first `description: |` line is edited and the frontmatter ends at the first
+    # `---` line, so an empty `---`/`---` block has nothing to edit. Unlike the old line-based
+    # rewrite, lines outside the description keep Unicode line separators such as U+2028.
+    frontmatter = parse_frontmatter(text)
+    block = frontmatter.block_range("description", " |")
+    if block is None or "---" in frontmatter.lines[: block[0]]:
+        return None
+    start, end = block[0] + 1, block[1]
+    desc_lines = frontmatter.lines[start:end]
+
+    updated_desc: List[str] = []
+    inserted = False
+    if any(RESOURCE_HEADING in line for line in desc_lines):
+        # Append to the end of the first resource list.
         in_resource = False
-        inserted = False
         for line in desc_lines:
-            updated_desc.append(line)
-            if "📚 リソース参照:" in line:
+            if RESOURCE_HEADING in line:
                 in_resource = True
-                continue
-            if in_resource and line.startswith("  - "):
-                continue
-            if in_resource and not line.startswith("  - "):
+            elif in_resource and not line.startswith("  - "):
                 if not inserted:
-                    updated_desc.insert(len(updated_desc) - 1, insert_line)
+                    updated_desc.append(INDEX_REFERENCE_LINE)
                     inserted = True
                 in_resource = False
+            updated_desc.append(line)
         if not inserted:
-            updated_desc.append(insert_line)
-        desc_lines = updated_desc
+            updated_desc.append(INDEX_REFERENCE_LINE)
     else:
-        updated_desc = []
-        inserted = False
+        # Add a resource list in front of the "Use proactively" trigger line.
         for line in desc_lines:
             if not inserted and "Use proactively" in line:
-                updated_desc.append("  📚 リソース参照:")
-                updated_desc.append(insert_line)
-                updated_desc.append("")
+                updated_desc.extend([f"  {RESOURCE_HEADING}", INDEX_REFERENCE_LINE, ""])
                 inserted = True
             updated_desc.append(line)
         if not inserted:
-            updated_desc.extend(["", "  📚 リソース参照:", insert_line])
-        desc_lines = updated_desc
+            updated_desc.extend(["", f"  {RESOURCE_HEADING}", INDEX_REFERENCE_LINE])
 
-    new_frontmatter = frontmatter[: desc_index + 1] + desc_lines + frontmatter[desc_end:]
-    new_text = "\n".join(new_frontmatter + body) + "\n"
-    write_text(skill_path, new_text)
-    return True
+    frontmatter.replace_lines(start, end, updated_desc)
+    return frontmatter.render()
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser(description="Sync requirement docs to skills")
-    parser.add_argument("--dry-run", action="store_true", help="Show changes only")
-    parser.add_argument("--skill", help="Only update the specified skill")
-    args = parser.parse_args()
+def ensure_skill_description(skill_path: Path, stats: WriteStats | None = None) -> bool:
+    new_text = add_index_reference(read_text(skill_path))
+    if new_text is None:
+        return False
+    write_text(skill_path, new_text, stats)
+    return True
+
 
-    requirements = load_mapping(MAPPING_PATH)
-    skill_map: Dict[str, List[Dict[str, str]]] = {}
+def read_doc(
+    file_path: str,
+    docs: List[DocRecord],
+    doc_cache: Dict[str, DocCacheEntry],
+    live_cache: Dict[str, DocCacheEntry],
+    timings: Timings = NO_TIMINGS,
+) -> int | None:
+    """Parse a mapped doc (or take it from the cache) into `docs`; returns its id, or None if it is missing."""
+    doc_path = ROOT / file_path
+    try:
+        st = doc_path.stat()
+    except FileNotFoundError:
+        return None
+    with timings.stage("doc_parse", path=file_path):
+        title, summary, live_cache[file_path] = cached_title_and_summary(doc_path, st, doc_cache.get(file_path))
+    docs.append(DocRecord(file_path, title, summary, live_cache[file_path][5]))
+    return len(docs) - 1
+
+
+def sync_skills(
+    requirements: List[Requirement],
+    selected: Set[str] | None,
+    doc_cache: Dict[str, DocCacheEntry],
+    dry_run: bool,
+    timings: Timings = NO_TIMINGS,
+    show_diff: bool = False,
+    catalog: SkillCatalog | None = None,
+    stream: bool = False,
+    export: SkillExport | None = None,
+    artifacts: ArtifactCache | None = None,
+) -> Dict[str, DocCacheEntry]:
+    """Regenerate the requirement indexes of `selected` skills (None = all) and print a report.
+
+    Index files and SKILL.md description edits are planned as one WriteBatch and
+    committed together unless `dry_run`; `show_diff` prints the batch as a diff.
+    With `stream`, every skill gets a batch of its own that is committed (and
+    dropped, along with the SKILL.md it read) before the next skill is rendered.
+    Skills are looked up in `catalog`, which is kept current with the writes.
+    Each skill's doc paths and index layout are recorded into `export`, along
+    with the docs they list (a full run replaces its doc table). With
+    `artifacts`, an index whose docs (by path and content hash) are cached there
+    is restored instead of rendered, and new ones are published unless `dry_run`.
+    Returns the doc cache entries for every doc still listed in the mapping.
+    """
+    if catalog is None:
+        catalog = SkillCatalog(SKILLS_ROOT)
+    # Each doc is parsed and stored once in `docs`; skills list it by id, however many map to it.
+    docs: List[DocRecord] = []
+    doc_ids: Dict[str, int | None] = {}  # None: the doc does not exist
+    skill_map: Dict[str, List[int]] = {}
     missing_docs = []
+    live_cache: Dict[str, DocCacheEntry] = {}
 
-    for item in requirements:
-        file_path = item.get("file")
-        skills = item.get("skills")
-        if not isinstance(file_path, str) or not isinstance(skills, list):
+    for file_path, skills in requirements:
+        if selected is not None and selected.isdisjoint(skills):
+            if file_path in doc_cache:
+                live_cache[file_path] = doc_cache[file_path]
             continue
-        doc_path = ROOT / file_path
-        if not doc_path.exists():
+        if file_path in doc_ids:
+            doc_id = doc_ids[file_path]
+        else:
+            doc_id = doc_ids[file_path] = read_doc(file_path, docs, doc_cache, live_cache, timings)
+        if doc_id is None:
             missing_docs.append(file_path)
             continue
-        title, summary = extract_title_and_summary(doc_path)
         for skill in skills:
-            if args.skill and skill != args.skill:
+            if selected is not None and skill not in selected:
                 continue
-            skill_map.setdefault(skill, []).append(
-                {"file": file_path, "title": title, "summary": summary}
-            )
+            skill_map.setdefault(skill, []).append(doc_id)
 
-    updated = []
+    updated = 0
     missing_skills = []
-    for skill, entries in sorted(skill_map.items()):
-        skill_dir = SKILLS_ROOT / skill
-        if not skill_dir.exists():
-            missing_skills.append(skill)
-            continue
-        resources_dir = skill_dir / "resources"
-        resources_dir.mkdir(parents=True, exist_ok=True)
-        index_path = resources_dir / "requirements-index.md"
-        content = build_skill_index(skill, entries)
-        if args.dry_run:
-            updated.append(str(index_path))
+    stats = WriteStats()
+    batch = WriteBatch()
+    version = doc_cache_version() if artifacts is not None else ""
+
+    def flush(batch: WriteBatch) -> None:
+        if show_diff:
+            sys.stdout.writelines(batch.diff(ROOT))
+        if dry_run:
+            stats.skip(len(batch))
         else:
-            write_text(index_path, content)
-            updated.append(str(index_path))
+            with timings.stage("commit"):
+                catalog.record_writes(batch.commit(stats))
 
-        skill_md = skill_dir / "SKILL.md"
-        if skill_md.exists() and not args.dry_run:
-            ensure_skill_description(skill_md)
+    for skill, skill_doc_ids in sorted(skill_map.items()):
+        catalog_entry = catalog.get(skill)
+        if catalog_entry is None:
+            missing_skills.append(skill)
+            continue
+        skill_dir = catalog_entry.files.path
+        with timings.stage("skill", skill=skill):
+            index_path = skill_dir / INDEX_FILE
+            artifact: Artifact | None = None
+            if artifacts is not None:
+                # The index depends only on the listed docs, so skills that list the same docs share an artifact.
+                inputs = [f"{docs[doc_id].file}\0{live_cache[docs[doc_id].file][2]}" for doc_id in skill_doc_ids]
+                key = artifact_key("requirements-index", version, *inputs)
+                with timings.stage("artifacts"):
+                    artifact = artifacts.get(key)
+            if artifact is None or INDEX_FILE not in artifact.files:
+                with timings.stage("render"):
+                    content = build_skill_index(skill, skill_doc_ids, docs).encode("utf-8")
+                record = {
+                    "requirements": [docs[doc_id].file for doc_id in skill_doc_ids],
+                    "files": {INDEX_FILE: file_layout(content)},
+                }
+                if artifacts is not None and not dry_run:
+                    with timings.stage("artifacts"):
+                        artifacts.put(key, Artifact({INDEX_FILE: content}, record))
+            else:
+                content, record = artifact.files[INDEX_FILE], artifact.record
+            with timings.stage("plan", path=f"{skill}/{INDEX_FILE}"):
+                batch.add(index_path, content, stats)
+            updated += 1
+            if export is not None:
+                export.update(skill, record)
+
+            if catalog_entry.files.skill_md is not None:
+                with timings.stage("describe", path=f"{skill}/SKILL.md"):
+                    current = catalog_entry.skill_md_bytes()
+                    new_text = add_index_reference(current.decode("utf-8"))
+                    if new_text is not None:
+                        batch.add(skill_dir / "SKILL.md", new_text, stats, current=current)
+            if stream:
+                flush(batch)
+                batch = WriteBatch()
+                catalog_entry.release()
+    flush(batch)
+    if export is not None:
+        export.update_docs(
+            {doc.file: [doc.title, doc.summary] for doc in docs},
+            {doc.file: doc.metrics for doc in docs if doc.metrics},
+            replace=selected is None,
+        )
 
-    print(f"updated {len(updated)} requirement index files")
+    print(f"updated {updated} requirement index files")
+    print(stats.summary())
     if missing_docs:
         print("missing docs:")
         for doc in missing_docs:
@@ -229,7 +534,173 @@ def main() -> int:
         print("missing skills:")
         for skill in missing_skills:
             print(f"- {skill}")
-    return 0
+    return live_cache
+
+
+def watch_requirements(
+    requirements: List[Requirement],
+    only: str | None,
+    doc_cache: Dict[str, DocCacheEntry],
+    args: argparse.Namespace,
+    cache_version: str,
+    export: SkillExport,
+    catalog: SkillCatalog,
+    artifacts: ArtifactCache | None = None,
+) -> int:
+    """Keep the mapping, parsed docs and skill catalog in memory and resync skills as their inputs change.
+
+    The skills a change affects are rescanned in `catalog` before they are
+    resynced, so SKILL.md edits made between passes are picked up.
+    """
+    from skill_watch import watch_paths
+
+    state = {"requirements": requirements, "reverse": build_reverse_index(requirements), "docs": doc_cache}
+
+    def on_change(paths: List[Path]) -> None:
+        changed = []
+        for path in paths:
+            try:
+                changed.append(path.relative_to(ROOT).as_posix())
+            except ValueError:
+                continue
+        if any(path in (MAPPING_PATH, MAPPING_PATH.parent, SKILLS_ROOT) for path in paths):
+            try:
+                state["requirements"] = load_mapping(
+                    MAPPING_PATH, None if args.no_cache else MAPPING_CACHE_PATH, save=not args.dry_run
+                )
+            except (OSError, ValueError) as exc:
+                print(f"cannot reload {MAPPING_PATH.name}: {exc}", file=sys.stderr)
+                return
+            state["reverse"] = build_reverse_index(state["requirements"])
+            selected = None
+        else:
+            selected = affected_skills(state["reverse"], changed)
+        if only:
+            selected = {only} if selected is None or only in selected else set()
+        if selected is not None and not selected:
+            return
+        timings = Timings(enabled=args.timings)
+        with timings.stage("walk"):
+            catalog.scan(selected)
+        state["docs"] = sync_skills(
+            state["requirements"],
+            selected,
+            state["docs"],
+            args.dry_run,
+            timings,
+            args.diff,
+            catalog=catalog,
+            stream=args.stream,
+            export=export,
+            artifacts=artifacts,
+        )
+        if not args.dry_run:
+            with timings.stage("cache"):
+                save_export(export)
+                if not args.no_cache:
+                    save_doc_cache(DOC_CACHE_PATH, cache_version, state["docs"])
+                    catalog.save(CATALOG_PATH, generator_version())
+        finish_run(args, timings, artifacts)
+
+    return watch_paths([MAPPING_PATH.parent, SKILLS_ROOT], on_change, polling=args.poll)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Sync requirement docs to skills")
+    parser.add_argument("--dry-run", action="store_true", help="Show changes only")
+    parser.add_argument(
+        "--diff", action="store_true", help="Print a unified diff of the pending changes (implies --dry-run)"
+    )
+    parser.add_argument("--skill", help="Only update the specified skill")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Reparse the mapping and every requirement doc instead of using .cache/skills",
+    )
+    targets = parser.add_mutually_exclusive_group()
+    targets.add_argument(
+        "--changed",
+        nargs="+",
+        metavar="PATH",
+        help="Only resync skills that depend on these requirement docs (or SKILL.md files)",
+    )
+    targets.add_argument("--since", metavar="REF", help="Like --changed, using files changed since a git ref")
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and resync affected skills when requirement docs or SKILL.md change",
+    )
+    parser.add_argument("--poll", action="store_true", help="With --watch, poll instead of using inotify")
+    add_common_arguments(
+        parser,
+        "Commit each skill as soon as it is rendered to keep memory bounded on very large trees",
+    )
+    args = parser.parse_args()
+    args.dry_run = args.dry_run or args.diff
+    timings = Timings(enabled=args.timings)
+
+    def run() -> int:
+        artifacts = open_caches(args)
+        with timings.stage("mapping"):
+            try:
+                requirements = load_mapping(
+                    MAPPING_PATH, None if args.no_cache else MAPPING_CACHE_PATH, save=not args.dry_run
+                )
+            except (OSError, ValueError) as exc:
+                print(f"cannot load {MAPPING_PATH.name}: {exc}", file=sys.stderr)
+                return 1
+        selected: Set[str] | None = None
+        if args.changed is not None or args.since:
+            if args.since:
+                import subprocess
+
+                try:
+                    changed = git_changed_paths(args.since)
+                except (OSError, subprocess.CalledProcessError) as exc:
+                    detail = (getattr(exc, "stderr", "") or str(exc)).strip()
+                    parser.error(f"cannot list files changed since {args.since}: {detail}")
+            else:
+                changed = [normalize_repo_path(path) for path in args.changed]
+            selected = affected_skills(build_reverse_index(requirements), changed)
+        if args.skill:
+            selected = {args.skill} if selected is None or args.skill in selected else set()
+        cache_version = doc_cache_version()
+        catalog = SkillCatalog(SKILLS_ROOT)
+        with timings.stage("cache"):
+            doc_cache = {} if args.no_cache else load_doc_cache(DOC_CACHE_PATH, cache_version)
+            if not args.no_cache:
+                catalog.load(CATALOG_PATH, generator_version())
+            export = SkillExport()
+            export.load(EXPORT_PATH)
+            export.seed_sizes(size_cache())
+
+        live_cache = sync_skills(
+            requirements,
+            selected,
+            doc_cache,
+            args.dry_run,
+            timings,
+            args.diff,
+            catalog=catalog,
+            stream=args.stream,
+            export=export,
+            artifacts=artifacts,
+        )
+        if not args.dry_run:
+            with timings.stage("cache"):
+                save_export(export)
+                if not args.no_cache:
+                    # Only docs still listed in the mapping are kept, so removed docs are evicted.
+                    save_doc_cache(DOC_CACHE_PATH, cache_version, live_cache)
+                    catalog.save(CATALOG_PATH, generator_version())
+        finish_run(args, timings, artifacts)
+        if args.watch:
+            return watch_requirements(
+                requirements, args.skill, live_cache, args, cache_version, export, catalog, artifacts
+            )
+        return 0
+
+    return run_profiled(run, args.profile, args.flamegraph)
 
 
 if __name__ == "__main__":
@@ -5,14 +5,49 @@ Update Level1-4 resources for skills based on current SKILL.md and assets.
 from __future__ import annotations
 
 import argparse
+import hashlib
 import os
 import re
+import sys
+import time
+from collections import deque
+from functools import partial
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import TYPE_CHECKING, Callable, Deque, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from skill_artifacts import Artifact, ArtifactCache, artifact_key
+from skill_catalog import CATALOG_PATH, SkillCatalog, SkillEntry, generator_version
+from skill_export import EXPORT_NAME, EXPORT_PATH, SkillExport, SkillRecord, file_layout, save_export
+from skill_io import (
+    RACY_MTIME_NS,
+    WriteStats,
+    iter_text_lines,
+    map_io,
+    read_text,
+    write_bytes,
+    write_text,
+)
+from skill_markdown import MarkdownDocument, parse_markdown
+from skill_metrics import Metrics, format_size, size_cache
+from skill_options import add_common_arguments, finish_run, open_caches
+from skill_templates import compile_template
+from skill_timings import NO_TIMINGS, Timings, run_profiled
+from skill_tree import SKILL_SUBDIRS, SkillFiles
 
+if TYPE_CHECKING:
+    from concurrent.futures import Future, ThreadPoolExecutor
 
 ROOT = Path(__file__).resolve().parents[1]
 SKILLS_ROOT = ROOT / ".claude/skills"
+MANIFEST_PATH = ROOT / ".cache/skills/level-manifest.json"
+
+LEVEL_FILES = (
+    "Level1_basics.md",
+    "Level2_intermediate.md",
+    "Level3_advanced.md",
+    "Level4_expert.md",
+)
 
 READ_VERBS = (
     "check",
@@ -77,32 +112,20 @@ EXCLUDED_TOPIC_KEYWORDS = (
     "更新ルール",
 )
 
+# Topics come from the first headings of a resource, so large reference dumps are
+# only read up to this many bytes.
+TOPIC_READ_BUDGET = 64 * 1024
+DESC_REF_PATTERN = re.compile(r"-\s+`([^`]+)`\s*:\s*(.+)")
+# With --io-threads, skills read ahead of (and level writes left in flight behind) the one being rendered.
+IO_WINDOW_PER_THREAD = 4
 
-def read_text(path: Path) -> str:
-    return path.read_text(encoding="utf-8")
-
-
-def write_text(path: Path, content: str) -> None:
-    path.write_text(content, encoding="utf-8")
-
-
-def extract_frontmatter(text: str) -> str:
-    match = re.match(r"^---\n(.*?)\n---\n", text, re.S)
-    return match.group(1) if match else ""
 
-
-def extract_description(frontmatter: str) -> str:
-    match = re.search(
-        r"^description:\s*\|\n(.*?)(?=\n\w[\w-]*:|\n$)",
-        frontmatter,
-        re.S | re.M,
-    )
-    return match.group(1).rstrip() if match else ""
+def extract_description(doc: MarkdownDocument) -> str:
+    return doc.frontmatter.block("description")
 
 
-def extract_name(frontmatter: str) -> str:
-    match = re.search(r"^name:\s*(.+)$", frontmatter, re.M)
-    return match.group(1).strip().strip('"') if match else ""
+def extract_name(doc: MarkdownDocument) -> str:
+    return doc.frontmatter.field("name").strip('"')
 
 
 def parse_description_lists(desc_text: str) -> Tuple[Dict[str, str], List[str], str]:
@@ -133,17 +156,15 @@ def parse_description_lists(desc_text: str) -> Tuple[Dict[str, str], List[str],
             continue
         if in_refs:
             if stripped.startswith("- "):
-                match = re.match(r"-\s+`([^`]+)`\s*:\s*(.+)", stripped)
+                match = DESC_REF_PATTERN.match(stripped)
                 if match:
                     desc_map[match.group(1)] = match.group(2).strip()
             continue
     return desc_map, books, use_line
 
 
-def extract_section(text: str, heading: str) -> str:
-    pattern = rf"^##\s+{re.escape(heading)}\n(.*?)(?=\n##\s|\Z)"
-    match = re.search(pattern, text, re.S | re.M)
-    return match.group(1).strip() if match else ""
+def extract_section(doc: MarkdownDocument, heading: str, level: int = 2) -> str:
+    return doc.section(heading, level)
 
 
 def normalize_summary(summary: str) -> str:
@@ -153,8 +174,8 @@ def normalize_summary(summary: str) -> str:
     return cleaned
 
 
-def extract_summary(text: str) -> str:
-    section = extract_section(text, "概要")
+def extract_summary(doc: MarkdownDocument) -> str:
+    section = extract_section(doc, "概要")
     if not section:
         return ""
     lines = []
@@ -165,24 +186,17 @@ def extract_summary(text: str) -> str:
     return normalize_summary(" ".join(lines))
 
 
-def extract_best_practices(text: str) -> Tuple[List[str], List[str]]:
-    section = extract_section(text, "ベストプラクティス")
-    best_do: List[str] = []
-    best_avoid: List[str] = []
+def extract_list_items(section: str) -> List[str]:
+    return [line.strip()[2:] for line in section.splitlines() if line.strip().startswith("- ")]
+
+
+def extract_best_practices(doc: MarkdownDocument) -> Tuple[List[str], List[str]]:
+    section = extract_section(doc, "ベストプラクティス")
     if not section:
-        return best_do, best_avoid
-    match_do = re.search(r"^###\s+すべきこと\n(.*?)(?=\n###\s|\Z)", section, re.S | re.M)
-    if match_do:
-        for line in match_do.group(1).splitlines():
-            if line.strip().startswith("- "):
-                best_do.append(line.strip()[2:])
-    match_avoid = re.search(
-        r"^###\s+避けるべきこと\n(.*?)(?=\n###\s|\Z)", section, re.S | re.M
-    )
-    if match_avoid:
-        for line in match_avoid.group(1).splitlines():
-            if line.strip().startswith("- "):
-                best_avoid.append(line.strip()[2:])
+        return [], []
+    subsections = parse_markdown(section)
+    best_do = extract_list_items(extract_section(subsections, "すべきこと", 3))
+    best_avoid = extract_list_items(extract_section(subsections, "避けるべきこと", 3))
     return best_do, best_avoid
 
 
@@ -190,20 +204,6 @@ def filter_generic(items: List[str]) -> List[str]:
     return [item for item in items if not any(pat in item for pat in GENERIC_BEST_PRACTICE_PATTERNS)]
 
 
-def list_files(dir_path: Path, suffix: str | None = None) -> List[str]:
-    if not dir_path.is_dir():
-        return []
-    items: List[str] = []
-    for name in sorted(os.listdir(dir_path)):
-        path = dir_path / name
-        if not path.is_file():
-            continue
-        if suffix and not name.endswith(suffix):
-            continue
-        items.append(name)
-    return items
-
-
 def prioritize_resources(resources: List[str]) -> List[str]:
     return sorted(resources, key=lambda name: (1 if "legacy" in name else 0, name))
 
@@ -233,17 +233,20 @@ def fallback_desc(path: str) -> str:
     return f"{name} の補助ガイド"
 
 
-def format_entries(paths: List[str], desc_map: Dict[str, str], topics: Dict[str, List[str]] | None = None) -> List[str]:
+def format_entries(paths: List[str], desc_map: Dict[str, str], topics: Dict[str, List[str]] | None = None,
+                   sizes: Dict[str, Metrics] | None = None) -> List[str]:
     lines = []
     topics = topics or {}
+    sizes = sizes or {}
     for path in paths:
         desc = desc_map.get(path) or fallback_desc(path)
         topic_list = topics.get(path, [])
+        size = f"（目安: {format_size(sizes[path])}）" if path in sizes else ""
         if topic_list:
             topic_text = " / ".join(topic_list)
-            lines.append(f"- `{path}`: {desc}（把握する知識: {topic_text}）")
+            lines.append(f"- `{path}`: {desc}（把握する知識: {topic_text}）{size}")
         else:
-            lines.append(f"- `{path}`: {desc}")
+            lines.append(f"- `{path}`: {desc}{size}")
     return lines
 
 
@@ -261,10 +264,10 @@ def is_excluded_topic(topic: str) -> bool:
     return any(keyword in topic for keyword in EXCLUDED_TOPIC_KEYWORDS)
 
 
-def extract_resource_topics(path: Path) -> List[str]:
+def extract_resource_topics(path: Path, budget: int = TOPIC_READ_BUDGET) -> List[str]:
     topics: List[str] = []
     try:
-        for line in read_text(path).splitlines():
+        for line in iter_text_lines(path, budget):
             stripped = line.strip()
             if not stripped:
                 continue
@@ -309,162 +312,242 @@ def collect_topic_keywords(resources: List[str], topics_map: Dict[str, List[str]
     return keywords
 
 
+LEVEL1_TEMPLATE = compile_template(
+    """
+# Level 1: Basics
+
+## 概要
+
+{{overview}}
+
+SKILL.md の内容だけで完結する基本運用を扱います。
+
+## 前提条件
+
+- SKILL.md の概要とワークフローを読了している
+- 対象タスクの目的と成果物を把握している
+
+## 詳細ガイド
+
+### 使用タイミング
+- {{use_line}}
+
+### 必要な知識
+- 対象領域: {{overview}}
+{{knowledge}}
+
+### 判断基準
+{{criteria}}
+
+### 成果物の最小要件
+{{deliverables}}
+
+### 参照書籍
+{{books}}
+
+### 主要リソース
+- `SKILL.md`: スキルの目的・前提・判断基準の基礎
+
+### 主要テンプレート
+{{templates}}
+
+## 実践手順
+
+1. SKILL.md の概要と目的を確認する
+2. 適用タイミングと成果物の期待値を言語化する
+3. 作業の冒頭で前提条件が満たされているか確認する
+
+## チェックリスト
+
+- [ ] スキルの適用タイミングを説明できる
+- [ ] 必要な知識と判断基準を整理できた
+- [ ] {{check_deliverables}}
+"""
+)
+
+LEVEL2_TEMPLATE = compile_template(
+    """
+# Level 2: Intermediate
+
+## 概要
+
+{{overview}}
+
+resources/・scripts/・templates/ の活用を前提とした運用を整理します。
+
+## 前提条件
+
+- Level 1 の内容を理解している
+- SKILL.md の適用範囲を説明できる
+
+## 詳細ガイド
+
+### 必要な知識・情報
+- {{topic_line}}
+{{practice}}
+
+### 判断基準と検証観点
+{{criteria}}
+
+### リソース運用
+{{resources}}
+
+### スクリプト運用
+{{scripts}}
+
+### テンプレート運用
+{{templates}}
+
+### 成果物要件
+- {{deliverables}}
+
+## 実践手順
+
+{{steps}}
+
+## チェックリスト
+
+- [ ] {{check_resources}}
+- [ ] {{check_scripts}}
+- [ ] {{check_templates}}
+"""
+)
+
+LEVEL3_TEMPLATE = compile_template(
+    """
+# Level 3: Advanced
+
+## 概要
+
+{{overview}}
+
+Progressive Disclosure 設計とトークン最適化の実践方法を整理します。
+
+## 前提条件
+
+- Level 2 の運用を完了している
+- リソース/スクリプト/テンプレートの位置を把握している
+
+## 詳細ガイド
+
+### Progressive Disclosure 設計
+- まず Level1/Level2 で要点だけを確認し、必要に応じて詳細リソースへ拡張する
+- 説明量が過剰な場合は要約を作り、必要な箇所のみを参照する
+
+### トークン最適化
+- 目的に直結しない情報は後回しにし、必須項目を優先して読み込む
+- 参照回数が多い資料は要点メモを作って再利用する
+{{budget}}
+
+### 高度知識の扱い
+{{advanced}}
+
+### 判断基準
+{{criteria}}
+- 検証が必要な場合は参照系スクリプトを優先する
+
+### スクリプト分類
+{{script_classes}}
+- {{template_usage}}
+
+## 実践手順
+
+{{steps}}
+
+## チェックリスト
+
+- [ ] 参照範囲を段階的に広げる設計ができた
+- [ ] {{check_scripts}}
+- [ ] {{check_templates}}
+- [ ] トークン消費を抑えるため要約や分割を行った
+"""
+)
+
+LEVEL4_TEMPLATE = compile_template(
+    """
+# Level 4: Expert
+
+## 概要
+
+{{overview}}
+
+フィードバックループを回しながらスキルを改善する方法を整理します。
+
+## 前提条件
+
+- Level 3 の運用を完了している
+- スクリプトの実行とログ更新ができる
+
+## 詳細ガイド
+
+### フィードバックループ
+- `EVALS.json`: 評価観点の定義
+- `CHANGELOG.md`: 変更履歴の記録
+- `LOGS.md`: 運用ログの蓄積
+{{scripts}}
+
+### 改善に必要な知識
+- 評価結果とログを照合し、改善ポイントを特定する
+- 変更が必要な resources/・templates/・scripts/ を特定する
+
+### 評価と記録
+- 実行結果を LOGS.md に残し、評価観点を EVALS.json に反映する
+
+## 実践手順
+
+1. 運用ログを確認し、改善対象を洗い出す
+2. 必要な変更を resources/・templates/・scripts/ に反映する
+{{steps}}
+
+## チェックリスト
+
+- [ ] フィードバックループの各要素が更新されている
+- [ ] {{check_scripts}}
+- [ ] 変更内容を CHANGELOG.md に記録した
+"""
+)
+
+
+def bullet_lines(items: List[str], label: str, empty: str) -> List[str]:
+    """`- <label><item>` per item, or the single `empty` line when there are none."""
+    return [f"- {label}{item}" for item in items] or [empty]
+
+
+def numbered_lines(steps: List[str], start: int = 1) -> List[str]:
+    return [f"{i}. {step}" for i, step in enumerate(steps, start)]
+
+
 def build_level1(summary: str, use_line: str, books: List[str], best_do: List[str], best_avoid: List[str],
-                 templates: List[str], fallback_summary: str, topics: List[str]) -> str:
-    overview = summary or fallback_summary
-    content = [
-        "# Level 1: Basics",
-        "",
-        "## 概要",
-        "",
-        overview,
-        "",
-        "SKILL.md の内容だけで完結する基本運用を扱います。",
-        "",
-        "## 前提条件",
-        "",
-        "- SKILL.md の概要とワークフローを読了している",
-        "- 対象タスクの目的と成果物を把握している",
-        "",
-        "## 詳細ガイド",
-        "",
-        "### 使用タイミング",
-    ]
-    content.append(f"- {use_line}" if use_line else "- 基本方針の共有や初回の適用時に使用する")
-    content.extend(
-        [
-            "",
-            "### 必要な知識",
-            f"- 対象領域: {overview}",
-        ]
-    )
-    if topics:
-        content.append("- 主要概念: " + " / ".join(topics[:5]))
-    if best_do:
-        for item in best_do[:3]:
-            content.append(f"- 実務指針: {item}")
-    else:
-        content.append("- 実務指針: SKILL.md のベストプラクティスを守る")
-    content.extend(
-        [
-            "",
-            "### 判断基準",
-        ]
-    )
-    if best_avoid:
-        for item in best_avoid[:3]:
-            content.append(f"- 避けるべき判断: {item}")
-    else:
-        content.append("- 目的・前提・成果物要件が揃っているかを確認する")
-    content.extend(
-        [
-            "",
-            "### 成果物の最小要件",
-        ]
-    )
+                 templates: List[str], fallback_summary: str, topics: List[str]) -> bytes:
+    knowledge = ["- 主要概念: " + " / ".join(topics[:5])] if topics else []
+    knowledge += bullet_lines(best_do[:3], "実務指針: ", "- 実務指針: SKILL.md のベストプラクティスを守る")
     if templates:
-        content.append("- テンプレートの必須項目を満たしている")
-        content.append(f"- 主要テンプレート: `templates/{templates[0]}`")
+        deliverables = ["- テンプレートの必須項目を満たしている", f"- 主要テンプレート: `templates/{templates[0]}`"]
         if len(templates) > 1:
-            content.append(f"- 参照テンプレート: `templates/{templates[1]}`")
-    else:
-        content.append("- 目的・前提・判断根拠・次のアクションが明記されている")
-    content.extend(["", "### 参照書籍"])
-    if books:
-        content.extend([f"- {book}" for book in books])
-    else:
-        content.append("- 参照書籍はありません")
-    content.extend(
-        [
-            "",
-            "### 主要リソース",
-            "- `SKILL.md`: スキルの目的・前提・判断基準の基礎",
-            "",
-            "### 主要テンプレート",
-        ]
-    )
-    if templates:
-        for tpl in templates[:2]:
-            content.append(f"- `templates/{tpl}`: このレベルでは参照のみ")
+            deliverables.append(f"- 参照テンプレート: `templates/{templates[1]}`")
     else:
-        content.append("- テンプレートはありません")
-    content.extend(
-        [
-            "",
-            "## 実践手順",
-            "",
-            "1. SKILL.md の概要と目的を確認する",
-            "2. 適用タイミングと成果物の期待値を言語化する",
-            "3. 作業の冒頭で前提条件が満たされているか確認する",
-            "",
-            "## チェックリスト",
-            "",
-            "- [ ] スキルの適用タイミングを説明できる",
-            "- [ ] 必要な知識と判断基準を整理できた",
-        ]
+        deliverables = ["- 目的・前提・判断根拠・次のアクションが明記されている"]
+    return LEVEL1_TEMPLATE.render(
+        {
+            "overview": summary or fallback_summary,
+            "use_line": use_line or "基本方針の共有や初回の適用時に使用する",
+            "knowledge": knowledge,
+            "criteria": bullet_lines(
+                best_avoid[:3], "避けるべき判断: ", "- 目的・前提・成果物要件が揃っているかを確認する"
+            ),
+            "deliverables": deliverables,
+            "books": bullet_lines(books, "", "- 参照書籍はありません"),
+            "templates": [f"- `templates/{tpl}`: このレベルでは参照のみ" for tpl in templates[:2]]
+            or ["- テンプレートはありません"],
+            "check_deliverables": "テンプレートの必須項目を把握している" if templates else "成果物の最小要件を満たしている",
+        }
     )
-    if templates:
-        content.append("- [ ] テンプレートの必須項目を把握している")
-    else:
-        content.append("- [ ] 成果物の最小要件を満たしている")
-    return "\n".join(content) + "\n"
 
 
 def build_level2(summary: str, resources: List[str], scripts: List[str], templates: List[str],
                  desc_map: Dict[str, str], topics_map: Dict[str, List[str]], best_do: List[str],
-                 best_avoid: List[str], fallback_summary: str, topics: List[str]) -> str:
-    overview = summary or fallback_summary
-    content = [
-        "# Level 2: Intermediate",
-        "",
-        "## 概要",
-        "",
-        overview,
-        "",
-        "resources/・scripts/・templates/ の活用を前提とした運用を整理します。",
-        "",
-        "## 前提条件",
-        "",
-        "- Level 1 の内容を理解している",
-        "- SKILL.md の適用範囲を説明できる",
-        "",
-        "## 詳細ガイド",
-        "",
-        "### 必要な知識・情報",
-    ]
-    if topics:
-        content.append("- 主要トピック: " + " / ".join(topics[:6]))
-    else:
-        content.append("- SKILL.md の内容を前提に運用する")
-    if best_do:
-        content.append("- 実務指針: " + " / ".join(best_do[:3]))
-    content.extend(["", "### 判断基準と検証観点"])
-    if best_avoid:
-        for item in best_avoid[:3]:
-            content.append(f"- 回避事項: {item}")
-    else:
-        content.append("- 検証に使う指標やチェック項目を明確にする")
-    content.extend(["", "### リソース運用"])
-    if resources:
-        content.extend(format_entries([f"resources/{r}" for r in resources], desc_map, topics_map))
-    else:
-        content.append("- 追加リソースはありません")
-    content.extend(["", "### スクリプト運用"])
-    if scripts:
-        content.extend(format_entries([f"scripts/{s}" for s in scripts], desc_map))
-    else:
-        content.append("- スクリプトはありません")
-    content.extend(["", "### テンプレート運用"])
-    if templates:
-        content.extend(format_entries([f"templates/{t}" for t in templates], desc_map))
-    else:
-        content.append("- テンプレートはありません")
-    content.extend(["", "### 成果物要件"])
-    if templates:
-        content.append("- テンプレートの構成・必須項目を反映する")
-    else:
-        content.append("- 判断根拠と次のアクションが明確な成果物を作る")
-    content.extend(["", "## 実践手順", ""])
+                 best_avoid: List[str], fallback_summary: str, topics: List[str],
+                 sizes_map: Dict[str, Metrics] | None = None) -> bytes:
     steps: List[str] = []
     if resources:
         steps.append("利用するリソースを選定し、適用順を決める")
@@ -476,87 +559,43 @@ def build_level2(summary: str, resources: List[str], scripts: List[str], templat
         steps.append("テンプレートを使い成果物の形式を統一する")
     if "log_usage.mjs" in scripts:
         steps.append("`scripts/log_usage.mjs` で実行記録を残す")
-    if not steps:
-        steps.append("作業内容を簡潔にメモしておく")
-    for i, step in enumerate(steps, 1):
-        content.append(f"{i}. {step}")
-    content.extend(
-        [
-            "",
-            "## チェックリスト",
-            "",
-        ]
+    return LEVEL2_TEMPLATE.render(
+        {
+            "overview": summary or fallback_summary,
+            "topic_line": "主要トピック: " + " / ".join(topics[:6]) if topics else "SKILL.md の内容を前提に運用する",
+            "practice": ["- 実務指針: " + " / ".join(best_do[:3])] if best_do else [],
+            "criteria": bullet_lines(best_avoid[:3], "回避事項: ", "- 検証に使う指標やチェック項目を明確にする"),
+            "resources": format_entries([f"resources/{r}" for r in resources], desc_map, topics_map, sizes_map)
+            or ["- 追加リソースはありません"],
+            "scripts": format_entries([f"scripts/{s}" for s in scripts], desc_map) or ["- スクリプトはありません"],
+            "templates": format_entries([f"templates/{t}" for t in templates], desc_map, sizes=sizes_map)
+            or ["- テンプレートはありません"],
+            "deliverables": "テンプレートの構成・必須項目を反映する"
+            if templates
+            else "判断根拠と次のアクションが明確な成果物を作る",
+            "steps": numbered_lines(steps),
+            "check_resources": "リソースから必要な知識を抽出できた"
+            if resources
+            else "Level1 の指針のみで作業を完結できる",
+            "check_scripts": "スクリプトの役割と実行順を把握している" if scripts else "スクリプト不要であることを確認した",
+            "check_templates": "テンプレートで成果物の形式を揃えた" if templates else "成果物要件を満たしている",
+        }
     )
-    if resources:
-        content.append("- [ ] リソースから必要な知識を抽出できた")
-    else:
-        content.append("- [ ] Level1 の指針のみで作業を完結できる")
-    if scripts:
-        content.append("- [ ] スクリプトの役割と実行順を把握している")
-    else:
-        content.append("- [ ] スクリプト不要であることを確認した")
-    if templates:
-        content.append("- [ ] テンプレートで成果物の形式を揃えた")
-    else:
-        content.append("- [ ] 成果物要件を満たしている")
-    return "\n".join(content) + "\n"
 
 
 def build_level3(summary: str, resources: List[str], scripts: List[str], templates: List[str],
-                 desc_map: Dict[str, str], topics_map: Dict[str, List[str]], fallback_summary: str) -> str:
-    overview = summary or fallback_summary
-    content = [
-        "# Level 3: Advanced",
-        "",
-        "## 概要",
-        "",
-        overview,
-        "",
-        "Progressive Disclosure 設計とトークン最適化の実践方法を整理します。",
-        "",
-        "## 前提条件",
-        "",
-        "- Level 2 の運用を完了している",
-        "- リソース/スクリプト/テンプレートの位置を把握している",
-        "",
-        "## 詳細ガイド",
-        "",
-        "### Progressive Disclosure 設計",
-        "- まず Level1/Level2 で要点だけを確認し、必要に応じて詳細リソースへ拡張する",
-        "- 説明量が過剰な場合は要約を作り、必要な箇所のみを参照する",
-        "",
-        "### トークン最適化",
-        "- 目的に直結しない情報は後回しにし、必須項目を優先して読み込む",
-        "- 参照回数が多い資料は要点メモを作って再利用する",
-        "",
-        "### 高度知識の扱い",
-    ]
+                 desc_map: Dict[str, str], topics_map: Dict[str, List[str]], fallback_summary: str,
+                 sizes_map: Dict[str, Metrics] | None = None) -> bytes:
     advanced_resources = [
         r for r in resources if any(key in r for key in ["pattern", "reference", "troubleshooting"])
     ]
-    if advanced_resources:
-        content.extend(format_entries([f"resources/{r}" for r in advanced_resources], desc_map, topics_map))
-    else:
-        content.append("- 専用の高度リソースはありません")
-    content.extend(["", "### 判断基準"])
-    if advanced_resources:
-        content.append("- 詳細な判断が必要なときのみ高度リソースを読み込む")
-    content.append("- 検証が必要な場合は参照系スクリプトを優先する")
-    content.extend(["", "### スクリプト分類"])
-    read_scripts, write_scripts, other_scripts = classify_scripts(scripts)
-    if read_scripts:
-        content.append("- 参照系: " + ", ".join(f"`scripts/{s}`" for s in read_scripts))
-    if write_scripts:
-        content.append("- 更新系: " + ", ".join(f"`scripts/{s}`" for s in write_scripts))
-    if other_scripts:
-        content.append("- その他: " + ", ".join(f"`scripts/{s}`" for s in other_scripts))
+    script_classes = [
+        f"- {label}: " + ", ".join(f"`scripts/{s}`" for s in group)
+        for label, group in zip(("参照系", "更新系", "その他"), classify_scripts(scripts))
+        if group
+    ]
     if not scripts:
-        content.append("- スクリプトはありません")
-    if templates:
-        content.append("- テンプレートは出力一貫性の維持に活用する")
-    else:
-        content.append("- テンプレートはありません")
-    content.extend(["", "## 実践手順", ""])
+        script_classes.append("- スクリプトはありません")
     steps = [
         "必要最低限の情報に絞って参照範囲を決める",
         "不足が見えたら高度リソースを追加で読み込む",
@@ -566,149 +605,702 @@ def build_level3(summary: str, resources: List[str], scripts: List[str], templat
     if templates:
         steps.append("テンプレートで表現の差異を最小化する")
     steps.append("情報量が多い場合は要約を作成して再利用する")
-    for i, step in enumerate(steps, 1):
-        content.append(f"{i}. {step}")
-    content.extend(
-        [
-            "",
-            "## チェックリスト",
-            "",
-            "- [ ] 参照範囲を段階的に広げる設計ができた",
-        ]
-    )
-    if scripts:
-        content.append("- [ ] スクリプトの種類に応じて実行順を調整した")
-    else:
-        content.append("- [ ] スクリプトが不要であることを確認した")
-    if templates:
-        content.append("- [ ] テンプレートで成果物の一貫性を保った")
-    else:
-        content.append("- [ ] 成果物要件を満たしている")
-    content.append("- [ ] トークン消費を抑えるため要約や分割を行った")
-    return "\n".join(content) + "\n"
-
-
-def build_level4(summary: str, scripts: List[str], desc_map: Dict[str, str], fallback_summary: str) -> str:
-    overview = summary or fallback_summary
-    content = [
-        "# Level 4: Expert",
-        "",
-        "## 概要",
-        "",
-        overview,
-        "",
-        "フィードバックループを回しながらスキルを改善する方法を整理します。",
-        "",
-        "## 前提条件",
-        "",
-        "- Level 3 の運用を完了している",
-        "- スクリプトの実行とログ更新ができる",
-        "",
-        "## 詳細ガイド",
-        "",
-        "### フィードバックループ",
-        "- `EVALS.json`: 評価観点の定義",
-        "- `CHANGELOG.md`: 変更履歴の記録",
-        "- `LOGS.md`: 運用ログの蓄積",
-    ]
-    if scripts:
-        content.extend(format_entries([f"scripts/{s}" for s in scripts], desc_map))
-    else:
-        content.append("- スクリプトはありません")
-    content.extend(
-        [
-            "",
-            "### 改善に必要な知識",
-            "- 評価結果とログを照合し、改善ポイントを特定する",
-            "- 変更が必要な resources/・templates/・scripts/ を特定する",
-            "",
-            "### 評価と記録",
-            "- 実行結果を LOGS.md に残し、評価観点を EVALS.json に反映する",
-            "",
-            "## 実践手順",
-            "",
-            "1. 運用ログを確認し、改善対象を洗い出す",
-            "2. 必要な変更を resources/・templates/・scripts/ に反映する",
-        ]
+    sizes_map = sizes_map or {}
+    resource_sizes = [sizes_map[f"resources/{r}"] for r in resources if f"resources/{r}" in sizes_map]
+    budget = []
+    if resource_sizes:
+        tokens = sum(size[3] for size in resource_sizes)
+        budget.append(f"- リソース全体の目安は約{tokens:,}トークン。Level2 の各リソースの目安を見て読み込む範囲を決める")
+    return LEVEL3_TEMPLATE.render(
+        {
+            "overview": summary or fallback_summary,
+            "budget": budget,
+            "advanced": format_entries(
+                [f"resources/{r}" for r in advanced_resources], desc_map, topics_map, sizes_map
+            )
+            or ["- 専用の高度リソースはありません"],
+            "criteria": ["- 詳細な判断が必要なときのみ高度リソースを読み込む"] if advanced_resources else [],
+            "script_classes": script_classes,
+            "template_usage": "テンプレートは出力一貫性の維持に活用する" if templates else "テンプレートはありません",
+            "steps": numbered_lines(steps),
+            "check_scripts": "スクリプトの種類に応じて実行順を調整した"
+            if scripts
+            else "スクリプトが不要であることを確認した",
+            "check_templates": "テンプレートで成果物の一貫性を保った" if templates else "成果物要件を満たしている",
+        }
     )
+
+
+def build_level4(summary: str, scripts: List[str], desc_map: Dict[str, str], fallback_summary: str) -> bytes:
     if scripts:
-        content.append("3. スクリプトで検証し、変更内容を記録する")
-        content.append("4. CHANGELOG.md に更新内容を記載し、EVALS.json を調整する")
+        steps = ["スクリプトで検証し、変更内容を記録する", "CHANGELOG.md に更新内容を記載し、EVALS.json を調整する"]
     else:
-        content.append("3. CHANGELOG.md に更新内容を記載し、EVALS.json を調整する")
-    content.extend(
-        [
-            "",
-            "## チェックリスト",
-            "",
-            "- [ ] フィードバックループの各要素が更新されている",
-        ]
+        steps = ["CHANGELOG.md に更新内容を記載し、EVALS.json を調整する"]
+    return LEVEL4_TEMPLATE.render(
+        {
+            "overview": summary or fallback_summary,
+            "scripts": format_entries([f"scripts/{s}" for s in scripts], desc_map) or ["- スクリプトはありません"],
+            "steps": numbered_lines(steps, start=3),
+            "check_scripts": "スクリプトで検証を実施した" if scripts else "スクリプトが不要であることを確認した",
+        }
     )
-    if scripts:
-        content.append("- [ ] スクリプトで検証を実施した")
-    else:
-        content.append("- [ ] スクリプトが不要であることを確認した")
-    content.append("- [ ] 変更内容を CHANGELOG.md に記録した")
-    return "\n".join(content) + "\n"
 
 
-def update_skill(skill_dir: Path) -> None:
-    skill_path = skill_dir / "SKILL.md"
-    if not skill_path.exists():
-        return
-    text = read_text(skill_path)
-    frontmatter = extract_frontmatter(text)
-    desc_text = extract_description(frontmatter)
+class SkillMarkdown(NamedTuple):
+    """The SkillSource fields that come from SKILL.md itself (everything but the listings)."""
+
+    summary: str
+    fallback_summary: str
+    use_line: str
+    books: List[str]
+    desc_map: Dict[str, str]
+    best_do: List[str]
+    best_avoid: List[str]
+
+
+class SkillSource(NamedTuple):
+    """Everything update_skill() reads from SKILL.md and the skill's directory listing."""
+
+    summary: str
+    fallback_summary: str
+    use_line: str
+    books: List[str]
+    desc_map: Dict[str, str]
+    best_do: List[str]
+    best_avoid: List[str]
+    resources: List[str]
+    scripts: List[str]
+    templates: List[str]
+
+
+def parse_skill_md(doc: MarkdownDocument, default_name: str) -> SkillMarkdown:
+    desc_text = extract_description(doc)
     desc_map, books, use_line = parse_description_lists(desc_text)
-    summary = extract_summary(text)
-    skill_name = extract_name(frontmatter) or skill_dir.name
+    summary = extract_summary(doc)
+    skill_name = extract_name(doc) or default_name
     fallback_summary = skill_fallback_summary(skill_name)
-    best_do, best_avoid = extract_best_practices(text)
+    best_do, best_avoid = extract_best_practices(doc)
     best_do = filter_generic(best_do)
     best_avoid = filter_generic(best_avoid)
+    return SkillMarkdown(summary, fallback_summary, use_line, books, desc_map, best_do, best_avoid)
 
-    resources_dir = skill_dir / "resources"
-    scripts_dir = skill_dir / "scripts"
-    templates_dir = skill_dir / "templates"
 
-    resources = [f for f in list_files(resources_dir, ".md") if not f.startswith("Level")]
-    resources = prioritize_resources(resources)
-    scripts = list_files(scripts_dir, ".mjs")
-    templates = list_files(templates_dir)
+def parse_skill(entry: SkillEntry, timings: Timings = NO_TIMINGS) -> SkillSource | None:
+    skill = entry.files
+    if skill.skill_md is None:
+        return None
+    with timings.stage("parse", path=f"{skill.name}/SKILL.md"):
+        # The catalog stores the memo as JSON, so a reused value comes back as a list.
+        fields = SkillMarkdown(*entry.derived_source(partial(parse_skill_md, default_name=skill.name)))
+
+    scripts = skill.names("scripts", ".mjs")
+    templates = skill.names("templates")
+    return SkillSource(*fields, topic_resources(skill), scripts, templates)
+
 
+def topic_resources(skill: SkillFiles) -> List[str]:
+    resources = [f for f in skill.names("resources", ".md") if not f.startswith("Level")]
+    return prioritize_resources(resources)
+
+
+def extract_topics(entry: SkillEntry, resources: List[str], timings: Timings = NO_TIMINGS) -> Dict[str, List[str]]:
     topics_map: Dict[str, List[str]] = {}
     for res in resources:
         rel_path = f"resources/{res}"
-        topics_map[rel_path] = extract_resource_topics(resources_dir / res)
-
+        with timings.stage("topics", path=f"{entry.name}/{rel_path}"):
+            topics_map[rel_path] = entry.resource_topics(res, extract_resource_topics)
+    return topics_map
+
+
+def measure_files(entry: SkillEntry, source: SkillSource, timings: Timings = NO_TIMINGS) -> Dict[str, Metrics]:
+    """Size metrics of the resources and templates listed in the Level files."""
+    sizes_map: Dict[str, Metrics] = {}
+    for rel_path in [f"resources/{res}" for res in source.resources] + [f"templates/{tpl}" for tpl in source.templates]:
+        with timings.stage("sizes", path=f"{entry.name}/{rel_path}"):
+            metrics = entry.file_metrics(rel_path, size_cache().measure_file)
+        if metrics is not None:
+            sizes_map[rel_path] = metrics
+    return sizes_map
+
+
+def render_levels(
+    source: SkillSource, topics_map: Dict[str, List[str]], sizes_map: Dict[str, Metrics] | None = None
+) -> List[bytes]:
+    summary, fallback_summary = source.summary, source.fallback_summary
+    resources, scripts, templates, desc_map = source.resources, source.scripts, source.templates, source.desc_map
+    best_do, best_avoid = source.best_do, source.best_avoid
     topic_keywords = collect_topic_keywords(resources, topics_map)
 
-    level1 = build_level1(summary, use_line, books, best_do, best_avoid, templates, fallback_summary, topic_keywords)
+    level1 = build_level1(
+        summary, source.use_line, source.books, best_do, best_avoid, templates, fallback_summary, topic_keywords
+    )
     level2 = build_level2(
-        summary, resources, scripts, templates, desc_map, topics_map, best_do, best_avoid, fallback_summary, topic_keywords
+        summary,
+        resources,
+        scripts,
+        templates,
+        desc_map,
+        topics_map,
+        best_do,
+        best_avoid,
+        fallback_summary,
+        topic_keywords,
+        sizes_map,
     )
-    level3 = build_level3(summary, resources, scripts, templates, desc_map, topics_map, fallback_summary)
+    level3 = build_level3(summary, resources, scripts, templates, desc_map, topics_map, fallback_summary, sizes_map)
     level4 = build_level4(summary, scripts, desc_map, fallback_summary)
+    return [level1, level2, level3, level4]
+
+
+def levels_record(
+    source: SkillSource, topics_map: Dict[str, List[str]], sizes_map: Dict[str, Metrics], contents: List[bytes]
+) -> SkillRecord:
+    """The skill's entry in the exported manifest, as far as the level generator knows it."""
+    read, write, other = classify_scripts(source.scripts)
+    return {
+        "summary": source.summary or source.fallback_summary,
+        "topics": collect_topic_keywords(source.resources, topics_map),
+        "scripts": {"read": read, "write": write, "other": other},
+        "templates": source.templates,
+        "resources": {path: topics_map.get(path, []) for path in (f"resources/{res}" for res in source.resources)},
+        "sizes": sizes_map,
+        "files": {f"resources/{name}": file_layout(content) for name, content in zip(LEVEL_FILES, contents)},
+    }
 
+
+def levels_artifact(contents: List[bytes], record: SkillRecord) -> Artifact:
+    return Artifact({f"resources/{name}": content for name, content in zip(LEVEL_FILES, contents)}, record)
+
+
+def restore_levels(entry: SkillEntry, artifact: Artifact, stats: WriteStats, timings: Timings = NO_TIMINGS) -> bool:
+    """Write the level files of a cached artifact; False if it lacks any of them."""
+    contents = [artifact.files.get(f"resources/{name}") for name in LEVEL_FILES]
+    if any(content is None for content in contents):
+        return False
+    write_levels(entry.files.path, contents, stats, timings)
+    return True
+
+
+def write_levels(
+    skill_dir: Path, contents: List[bytes], stats: WriteStats | None = None, timings: Timings = NO_TIMINGS
+) -> None:
+    resources_dir = skill_dir / "resources"
     resources_dir.mkdir(parents=True, exist_ok=True)
-    write_text(resources_dir / "Level1_basics.md", level1)
-    write_text(resources_dir / "Level2_intermediate.md", level2)
-    write_text(resources_dir / "Level3_advanced.md", level3)
-    write_text(resources_dir / "Level4_expert.md", level4)
+    for name, content in zip(LEVEL_FILES, contents):
+        with timings.stage("write", path=f"{skill_dir.name}/resources/{name}"):
+            write_bytes(resources_dir / name, content, stats)
+
+
+def update_skill(
+    entry: SkillEntry, stats: WriteStats | None = None, timings: Timings = NO_TIMINGS
+) -> Artifact | None:
+    """Render and write the skill's level files; returns them with the skill's manifest record."""
+    source = parse_skill(entry, timings)
+    if source is None:
+        return None
+    topics_map = extract_topics(entry, source.resources, timings)
+    sizes_map = measure_files(entry, source, timings)
+    with timings.stage("render"):
+        contents = render_levels(source, topics_map, sizes_map)
+    write_levels(entry.files.path, contents, stats, timings)
+    return levels_artifact(contents, levels_record(source, topics_map, sizes_map, contents))
+
+
+def skill_fingerprint(entry: SkillEntry, keep: bool = True) -> str:
+    """Hash every input update_skill() reads, so unchanged skills can be skipped.
+
+    With `keep=False` the SKILL.md content is not cached on the entry, so
+    fingerprinting many skills does not hold all of them in memory.
+    """
+    skill = entry.files
+    digest = hashlib.sha256()
+    digest.update(entry.skill_md_bytes(keep))
+    for sub in SKILL_SUBDIRS:
+        digest.update(f"\0{sub}\0".encode("utf-8"))
+        for name in skill.names(sub):
+            if sub == "resources" and name in LEVEL_FILES:
+                continue
+            digest.update(name.encode("utf-8") + b"\0")
+            if sub == "templates" or (sub == "resources" and name.endswith(".md")):
+                digest.update(hashlib.sha256((skill.path / sub / name).read_bytes()).digest())
+    return digest.hexdigest()
+
+
+def skill_signature(skill: SkillFiles, now_ns: int) -> str:
+    """Hash of the scanned names, mtimes and sizes of a skill's inputs.
+
+    Matching the manifest lets a run skip the skill without reading any file.
+    Returns "" when a file changed too recently for its mtime to be trusted.
+    """
+    digest = hashlib.sha256()
+    for sub, metas in (("", [skill.skill_md]), *skill.dirs.items()):
+        for meta in metas:
+            if sub == "resources" and meta.name in LEVEL_FILES:
+                continue
+            if now_ns - meta.mtime_ns < RACY_MTIME_NS:
+                return ""
+            digest.update(f"{sub}/{meta.name}\0{meta.mtime_ns}\0{meta.size}\0".encode("utf-8"))
+    return digest.hexdigest()
+
+
+ManifestEntry = List[str]  # [signature, fingerprint]
+
+
+def load_manifest(path: Path, version: str) -> Dict[str, ManifestEntry]:
+    import json
+
+    try:
+        data = json.loads(read_text(path))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("generator") != version:
+        return {}
+    skills = data.get("skills")
+    if not isinstance(skills, dict):
+        return {}
+    return {name: entry for name, entry in skills.items() if isinstance(entry, list) and len(entry) == 2}
+
+
+def save_manifest(path: Path, version: str, skills: Dict[str, ManifestEntry]) -> None:
+    import json
+
+    content = json.dumps({"generator": version, "skills": skills}, indent=2, sort_keys=True) + "\n"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    write_text(path, content)
+
+
+def has_levels(skill: SkillFiles) -> bool:
+    return all(skill.has("resources", name) for name in LEVEL_FILES)
+
+
+# Workers send their entry back so the catalog keeps what they parsed, along with the rendered level files
+# and the skill's manifest record.
+SkillResult = Tuple[str, Optional[str], WriteStats, Timings, SkillEntry, Optional[Artifact]]
+
+
+def run_skill(entry: SkillEntry, timed: bool = False) -> SkillResult:
+    stats = WriteStats()
+    timings = Timings() if timed else NO_TIMINGS
+    try:
+        with timings.stage("skill", skill=entry.name):
+            artifact = update_skill(entry, stats, timings)
+    except Exception as exc:  # collected per skill and reported by main()
+        return entry.name, f"{type(exc).__name__}: {exc}", stats, timings, entry, None
+    return entry.name, None, stats, timings, entry, artifact
+
+
+def timed_io(timed: bool, stage: str, path: str, func: Callable[..., object], *args: object) -> Tuple[object, Timings]:
+    """Run one file operation on an I/O thread, timed into a Timings of its own."""
+    timings = Timings() if timed else NO_TIMINGS
+    with timings.stage(stage, path=path):
+        value = func(*args)
+    return value, timings
+
+
+PendingRead = Tuple[str, str, "Future"]  # (stage, path in the skill, result)
+PendingWrite = Tuple[WriteStats, "Future"]
+
+
+def prefetch_skill(pool: ThreadPoolExecutor, entry: SkillEntry, timed: bool) -> List[PendingRead]:
+    """Start the reads update_skill() needs: SKILL.md unless its parse is memoised, every resource's
+    topics, and the size metrics of the resources and templates."""
+    skill = entry.files
+    if skill.skill_md is None:
+        return []
+    reads: List[PendingRead] = []
+    if not entry.source_is_fresh():
+        reads.append(
+            ("read", "SKILL.md", pool.submit(timed_io, timed, "read", f"{skill.name}/SKILL.md", entry.skill_md_bytes))
+        )
+    resources = topic_resources(skill)
+    for res in resources:
+        rel_path = f"resources/{res}"
+        future = pool.submit(
+            timed_io, timed, "topics", f"{skill.name}/{rel_path}", entry.resource_topics, res, extract_resource_topics
+        )
+        reads.append(("topics", rel_path, future))
+    measure = size_cache().measure_file
+    sized = [f"resources/{res}" for res in resources] + [f"templates/{tpl}" for tpl in skill.names("templates")]
+    for rel_path in sized:
+        future = pool.submit(
+            timed_io, timed, "sizes", f"{skill.name}/{rel_path}", entry.file_metrics, rel_path, measure
+        )
+        reads.append(("sizes", rel_path, future))
+    return reads
+
+
+def render_prefetched(
+    pool: ThreadPoolExecutor, entry: SkillEntry, reads: List[PendingRead], timings: Timings
+) -> Tuple[List[PendingWrite], Artifact | None]:
+    """update_skill() on prefetched inputs; the level files are handed to `pool` to write."""
+    topics_map: Dict[str, List[str]] = {}
+    sizes_map: Dict[str, Metrics] = {}
+    for stage, rel_path, future in reads:
+        value, read_timings = future.result()
+        timings.merge(read_timings)
+        if stage == "topics":
+            topics_map[rel_path] = value
+        elif stage == "sizes" and value is not None:
+            sizes_map[rel_path] = value
+    source = parse_skill(entry, timings)
+    if source is None:
+        return [], None
+    with timings.stage("render"):
+        contents = render_levels(source, topics_map, sizes_map)
+    resources_dir = entry.files.path / "resources"
+    if not entry.files.dirs["resources"]:
+        resources_dir.mkdir(parents=True, exist_ok=True)
+    writes: List[PendingWrite] = []
+    for name, content in zip(LEVEL_FILES, contents):
+        stats = WriteStats()
+        path = f"{entry.name}/resources/{name}"
+        future = pool.submit(timed_io, timings.enabled, "write", path, write_bytes, resources_dir / name, content, stats)
+        writes.append((stats, future))
+    return writes, levels_artifact(contents, levels_record(source, topics_map, sizes_map, contents))
+
+
+def run_skills_pipelined(entries: List[SkillEntry], io_threads: int, timed: bool = False) -> Iterator[SkillResult]:
+    """Run update_skill() for each skill with its file I/O on `io_threads` threads.
+
+    Reads run a bounded number of skills ahead of the skill being parsed and
+    rendered here, and level files are written while later skills are rendered,
+    so on a high-latency filesystem the run is no longer a sum of per-file waits.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    window = io_threads * IO_WINDOW_PER_THREAD
+    reading: Deque[Tuple[SkillEntry, List[PendingRead]]] = deque()
+    writing: Deque[Tuple[SkillEntry, Optional[str], Timings, List[PendingWrite], Optional[Artifact]]] = deque()
+
+    def finish_oldest() -> SkillResult:
+        entry, error, timings, writes, artifact = writing.popleft()
+        stats = WriteStats()
+        for write_stats, future in writes:
+            try:
+                timings.merge(future.result()[1])
+            except Exception as exc:  # reported with the skill, like run_skill()
+                error = error or f"{type(exc).__name__}: {exc}"
+            stats.merge(write_stats)
+        return entry.name, error, stats, timings, entry, None if error else artifact
+
+    with ThreadPoolExecutor(max_workers=io_threads) as pool:
+        upcoming = iter(entries)
+
+        def read_ahead() -> None:
+            for entry in islice(upcoming, window - len(reading)):
+                reading.append((entry, prefetch_skill(pool, entry, timed)))
+
+        read_ahead()
+        while reading:
+            entry, reads = reading.popleft()
+            read_ahead()
+            timings = Timings() if timed else NO_TIMINGS
+            error: str | None = None
+            writes: List[PendingWrite] = []
+            artifact: Artifact | None = None
+            try:
+                with timings.stage("skill", skill=entry.name):
+                    writes, artifact = render_prefetched(pool, entry, reads, timings)
+            except Exception as exc:  # collected per skill and reported by main()
+                error = f"{type(exc).__name__}: {exc}"
+            writing.append((entry, error, timings, writes, artifact))
+            if len(writing) > window:
+                yield finish_oldest()
+        while writing:
+            yield finish_oldest()
+
+
+def run_chunk(entries: List[SkillEntry], io_threads: int, timed: bool) -> List[SkillResult]:
+    return list(run_skills_pipelined(entries, io_threads, timed))
+
+
+def run_skills(entries: List[SkillEntry], jobs: int, timed: bool = False, io_threads: int = 0) -> Iterator[SkillResult]:
+    """Run update_skill() for each skill, optionally on a process pool; results arrive in input order
+    as they complete. With `io_threads`, each process runs its share through run_skills_pipelined()."""
+    if jobs <= 1 or len(entries) <= 1:
+        if io_threads > 0:
+            yield from run_skills_pipelined(entries, io_threads, timed)
+        else:
+            yield from (run_skill(entry, timed) for entry in entries)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+
+    workers = min(jobs, len(entries))
+    chunksize = max(1, len(entries) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        if io_threads > 0:
+            chunks = [entries[start : start + chunksize] for start in range(0, len(entries), chunksize)]
+            for chunk in pool.map(partial(run_chunk, io_threads=io_threads, timed=timed), chunks):
+                yield from chunk
+        else:
+            yield from pool.map(partial(run_skill, timed=timed), entries, chunksize=chunksize)
+
+
+def update_skills(
+    entries: List[SkillEntry],
+    jobs: int,
+    manifest: Dict[str, ManifestEntry] | None,
+    timings: Timings = NO_TIMINGS,
+    catalog: SkillCatalog | None = None,
+    io_threads: int = 0,
+    stream: bool = False,
+    export: SkillExport | None = None,
+    artifacts: ArtifactCache | None = None,
+) -> int:
+    """Regenerate the scanned skills. With a manifest, unchanged skills are skipped and
+    the manifest is updated in place with the new signatures and fingerprints.
+    With `stream`, each entry drops its SKILL.md content once it has been used.
+    Every regenerated skill's record is merged into `export`; skills it has no
+    record for are regenerated even when they are unchanged. With `artifacts`,
+    skills whose fingerprint is cached there are restored instead of rendered,
+    and the rest are published to it."""
+    if manifest is None:
+        pending = entries
+        skipped = 0
+    else:
+        pending = []
+        skipped = 0
+        now_ns = time.time_ns()
+        changed: List[Tuple[SkillEntry, str, ManifestEntry | None]] = []
+        for entry in entries:
+            skill = entry.files
+            if skill.skill_md is None:
+                manifest.pop(skill.name, None)
+                continue
+            recorded = manifest.get(skill.name)
+            if export is not None and not export.has(skill.name, "summary"):
+                recorded = None
+            signature = skill_signature(skill, now_ns)
+            if recorded and signature and recorded[0] == signature and has_levels(skill):
+                skipped += 1
+                continue
+            changed.append((entry, signature, recorded))
+        with timings.stage("fingerprint"):
+            fingerprints = map_io(
+                partial(skill_fingerprint, keep=not stream), [entry for entry, _, _ in changed], io_threads
+            )
+        for (entry, signature, recorded), fingerprint in zip(changed, fingerprints):
+            if stream:
+                entry.release()
+            manifest[entry.name] = [signature, fingerprint]
+            if recorded and recorded[1] == fingerprint and has_levels(entry.files):
+                skipped += 1
+                continue
+            pending.append(entry)
+
+    stats = WriteStats()
+    stats.skip(skipped * len(LEVEL_FILES))
+    failed: List[Tuple[str, str]] = []
+    updated = 0
+    keys: Dict[str, str] = {}
+    if artifacts is not None:
+        keyed = [entry for entry in pending if entry.files.skill_md is not None]
+        if manifest is None:
+            with timings.stage("fingerprint"):
+                fingerprints = map_io(partial(skill_fingerprint, keep=not stream), keyed, io_threads)
+        else:
+            fingerprints = [manifest[entry.name][1] for entry in keyed]
+        version = generator_version()
+        for entry, fingerprint in zip(keyed, fingerprints):
+            keys[entry.name] = artifact_key("levels", version, entry.name, fingerprint)
+        # Looked up and restored a window at a time, so only one window of artifacts is in memory at once.
+        window = max(io_threads, 1) * IO_WINDOW_PER_THREAD
+        restored = set()
+        for start in range(0, len(keyed), window):
+            chunk = keyed[start : start + window]
+            with timings.stage("artifacts"):
+                found = artifacts.lookup([keys[entry.name] for entry in chunk], io_threads)
+            for entry, artifact in zip(chunk, found):
+                if artifact is None or not restore_levels(entry, artifact, stats, timings):
+                    continue
+                restored.add(entry.name)
+                updated += 1
+                if stream:
+                    entry.release()
+                if export is not None:
+                    export.update(entry.name, artifact.record)
+        pending = [entry for entry in pending if entry.name not in restored]
+    results = run_skills(pending, jobs, timings.enabled, io_threads)
+    for name, error, skill_stats, skill_timings, entry, artifact in results:
+        updated += 1
+        stats.merge(skill_stats)
+        timings.merge(skill_timings)
+        if stream:
+            entry.release()
+        if catalog is not None:
+            catalog.update(entry)
+        if artifact is not None:
+            if export is not None:
+                export.update(name, artifact.record)
+            if artifacts is not None and name in keys:
+                with timings.stage("artifacts"):
+                    artifacts.put(keys[name], artifact)
+        if error is not None:
+            failed.append((name, error))
+    for name, error in failed:
+        print(f"failed to update {name}: {error}", file=sys.stderr)
+        if manifest is not None:
+            manifest.pop(name, None)
+
+    if manifest is not None:
+        print(f"updated {updated - len(failed)} skills, skipped {skipped} unchanged skills")
+    print(stats.summary())
+    return 1 if failed else 0
+
+
+def skill_for_path(path: Path) -> str | None:
+    """Skill affected by a changed path; "" means the whole tree, None means no skill."""
+    try:
+        parts = path.relative_to(SKILLS_ROOT).parts
+    except ValueError:
+        return None
+    if not parts:
+        return ""
+    if parts[0].startswith("."):
+        return None
+    # Our own outputs and atomic-write temp files must not retrigger generation.
+    if parts == (EXPORT_NAME,):
+        return None
+    if len(parts) == 3 and parts[1] == "resources" and (parts[2] in LEVEL_FILES or parts[2].startswith(".")):
+        return None
+    return parts[0]
+
+
+def save_state(catalog: SkillCatalog, manifest: Dict[str, ManifestEntry], version: str) -> None:
+    save_manifest(MANIFEST_PATH, version, manifest)
+    catalog.save(CATALOG_PATH, version)
+
+
+def watch_skills(
+    only: str | None,
+    jobs: int,
+    catalog: SkillCatalog,
+    manifest: Dict[str, ManifestEntry],
+    version: str,
+    polling: bool,
+    io_threads: int = 0,
+    stream: bool = False,
+    export: SkillExport | None = None,
+    artifacts: ArtifactCache | None = None,
+) -> int:
+    from skill_watch import watch_paths
+
+    def on_change(paths: List[Path]) -> None:
+        names = {skill_for_path(path) for path in paths}
+        names.discard(None)
+        if only:
+            names = {only} if "" in names or only in names else set()
+        if not names:
+            return
+        rescan = "" in names
+        entries = catalog.scan(None if rescan else names)
+        # Skills whose directory disappeared are dropped from the manifest.
+        for name in (set(manifest) if rescan else names) - {entry.name for entry in entries}:
+            manifest.pop(name, None)
+            if export is not None:
+                export.remove(name)
+        update_skills(
+            entries,
+            jobs,
+            manifest,
+            catalog=catalog,
+            io_threads=io_threads,
+            stream=stream,
+            export=export,
+            artifacts=artifacts,
+        )
+        save_state(catalog, manifest, version)
+        if export is not None:
+            save_export(export)
+        if artifacts is not None:
+            artifacts.evict()
+
+    return watch_paths([SKILLS_ROOT], on_change, polling=polling)
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Update skill level resources")
     parser.add_argument("--skill", help="Only update the specified skill")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Skip skills whose inputs are unchanged since the last run (see .cache/skills)",
+    )
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of worker processes (0 = one per CPU core)",
+    )
+    parser.add_argument(
+        "--io-threads",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Overlap file reads and writes on N threads per process (for high-latency filesystems)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and regenerate skills as their files change (implies --incremental)",
+    )
+    parser.add_argument("--poll", action="store_true", help="With --watch, poll instead of using inotify")
+    add_common_arguments(
+        parser,
+        "Drop each skill's SKILL.md content once it is done to keep memory bounded on very large trees",
+    )
     args = parser.parse_args()
-
-    for name in sorted(os.listdir(SKILLS_ROOT)):
-        if args.skill and name != args.skill:
-            continue
-        skill_dir = SKILLS_ROOT / name
-        if skill_dir.is_dir():
-            update_skill(skill_dir)
-    return 0
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    if (args.profile or args.flamegraph) and jobs > 1:
+        print("profiling runs in a single process; ignoring --jobs", file=sys.stderr)
+        jobs = 1
+    timings = Timings(enabled=args.timings)
+
+    def run() -> int:
+        artifacts = open_caches(args)
+        version = generator_version()
+        catalog = SkillCatalog(SKILLS_ROOT)
+        manifest: Dict[str, ManifestEntry] | None = None
+        if args.incremental or args.watch:
+            with timings.stage("manifest"):
+                manifest = load_manifest(MANIFEST_PATH, version)
+                catalog.load(CATALOG_PATH, version)
+        export = SkillExport()
+        with timings.stage("manifest"):
+            export.load(EXPORT_PATH)
+            export.seed_sizes(size_cache())
+        with timings.stage("walk"):
+            entries = catalog.scan([args.skill] if args.skill else None)
+        if not args.skill:
+            # A full run drops entries for skills that no longer exist.
+            export.retain(entry.name for entry in entries)
+            if manifest is not None:
+                manifest = {entry.name: manifest[entry.name] for entry in entries if entry.name in manifest}
+        status = update_skills(
+            entries, jobs, manifest, timings, catalog, args.io_threads, args.stream, export, artifacts
+        )
+        with timings.stage("manifest"):
+            if manifest is not None:
+                save_state(catalog, manifest, version)
+            save_export(export)
+        finish_run(args, timings, artifacts)
+        if args.watch:
+            return watch_skills(
+                args.skill,
+                jobs,
+                catalog,
+                manifest,
+                version,
+                args.poll,
+                args.io_threads,
+                args.stream,
+                export,
+                artifacts,
+            )
+        return status
+
+    return run_profiled(run, args.profile, args.flamegraph)
 
 
 if __name__ == "__main__":